@@ -0,0 +1,56 @@
+"""
+Compares the per item export path against the batched UNWIND export path.
+Without a server address the queries are sent to a fake stream simulating a round trip per statement and a
+planning cost per distinct query text.
+
+python -m Benchmarks.ExportBenchmark --nodes 2000
+"""
+import argparse
+import time
+
+from Benchmarks.FakeNeo4j import FakeNeo4jStream
+from DatabaseGenerator import create_graph_map
+from DbInterface import Neo4jStream
+from GraphModeler import export_database_neo4j, delete_database_neo4j
+
+
+def create_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", "-n", help="the amount of nodes in the exported graph", default=2000, type=int)
+    parser.add_argument("--commit_size", "-c", help="the size of each commit", default=1000, type=int)
+    parser.add_argument("--round_trip", help="simulated seconds per statement", default=0.0005, type=float)
+    parser.add_argument("--plan_cost", help="simulated seconds per new query text", default=0.002, type=float)
+    parser.add_argument("--address", "-a", help="benchmark against a real neo4j server instead", required=False)
+    parser.add_argument("--username", "-u", default="neo4j")
+    parser.add_argument("--password", "-p", default="neo4j")
+    return parser
+
+
+def run_export(args, database, batched: bool) -> None:
+    if args.address:
+        with Neo4jStream(args.address, args.username, args.password) as stream:
+            delete_database_neo4j(stream)
+            start = time.perf_counter()
+            export_database_neo4j(database, stream, args.commit_size, batched)
+            elapsed = time.perf_counter() - start
+        statements = "-"
+    else:
+        stream = FakeNeo4jStream(args.round_trip, args.plan_cost)
+        start = time.perf_counter()
+        export_database_neo4j(database, stream, args.commit_size, batched)
+        elapsed = time.perf_counter() - start
+        statements = stream.statements
+    items = len(database.graph.nodes) + len(database.graph.relationships)
+    mode = "batched" if batched else "per item"
+    print(f"{mode:>9}: {items} items in {elapsed:.2f}s, {items / elapsed:,.0f} items/s, statements: {statements}")
+
+
+def main():
+    args = create_arg_parser().parse_args()
+    database = create_graph_map([f"name{index}" for index in range(args.nodes)], 2)
+    run_export(args, database, batched=False)
+    run_export(args, database, batched=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from typing import AnyStr, Dict
+
+
+class FakeResult:
+    def records(self):
+        return iter(())
+
+    def consume(self):
+        pass
+
+
+class FakeTransaction:
+    def __init__(self, latency: float):
+        self._latency = latency
+
+    def run(self, query: AnyStr, parameters: Dict = None):
+        if self._latency:
+            time.sleep(self._latency)
+        return FakeResult()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakeSession(FakeTransaction):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def begin_transaction(self):
+        return FakeTransaction(self._latency)
+
+    def close(self):
+        pass
+
+
+class FakeDriver:
+    def __init__(self, latency: float):
+        """
+        A blocking driver stand in where every statement blocks for the latency
+        :param latency: the seconds each statement takes
+        """
+        self._latency = latency
+
+    def session(self, **config):
+        return FakeSession(self._latency)
+
+    def close(self):
+        pass
+
+
+class FakeGraphDatabase:
+    latency = 0.0
+
+    @classmethod
+    def driver(cls, *args, **kwargs):
+        return FakeDriver(cls.latency)
+
+
+class FakeAsyncResult:
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+    async def consume(self):
+        pass
+
+
+class FakeAsyncTransaction:
+    def __init__(self, latency: float):
+        self._latency = latency
+
+    async def run(self, query: AnyStr, parameters: Dict = None):
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        return FakeAsyncResult()
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+class FakeAsyncSession(FakeAsyncTransaction):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def begin_transaction(self):
+        return FakeAsyncTransaction(self._latency)
+
+
+class FakeAsyncDriver:
+    def __init__(self, latency: float):
+        """
+        An async driver stand in where every statement awaits the latency
+        :param latency: the seconds each statement takes
+        """
+        self._latency = latency
+
+    def session(self, **config):
+        return FakeAsyncSession(self._latency)
+
+    async def close(self):
+        pass
+
+
+class FakeAsyncGraphDatabase:
+    latency = 0.0
+
+    @classmethod
+    def driver(cls, *args, **kwargs):
+        return FakeAsyncDriver(cls.latency)
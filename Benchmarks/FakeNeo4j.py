@@ -0,0 +1,39 @@
+import time
+from contextlib import contextmanager
+from typing import AnyStr, Dict, Set
+
+
+class FakeNeo4jStream:
+    def __init__(self, round_trip: float = 0.0005, plan_cost: float = 0.002):
+        """
+        A stand in for Neo4jStream that simulates the server costs of running queries without a server
+        :param round_trip: the seconds each statement waits for the server
+        :param plan_cost: the seconds the server spends planning a query text it hasn't seen before
+        """
+        self._round_trip = round_trip
+        self._plan_cost = plan_cost
+        self.planned_queries: Set[AnyStr] = set()
+        self.statements = 0
+        self.transactions = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def run(self, query: AnyStr, parameters: Dict = None) -> None:
+        self.statements += 1
+        delay = self._round_trip
+        if query not in self.planned_queries:
+            self.planned_queries.add(query)
+            delay += self._plan_cost
+        time.sleep(delay)
+
+    def write(self, query: AnyStr, parameters: Dict = None) -> None:
+        self.run(query, parameters)
+
+    @contextmanager
+    def transaction(self):
+        self.transactions += 1
+        yield self
@@ -0,0 +1,68 @@
+"""
+Measures set and dict operations on relationships hashed from the cached node hashes
+against the legacy hashing that rebuilt a frozenset of the labels and compared full properties on every call.
+
+python -m Benchmarks.HashBenchmark --relationships 1000000
+"""
+import argparse
+import time
+
+from GraphModeler.Models import Node, Relationship
+
+
+class LegacyNode(Node):
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return self.node_types == other.node_types and self.properties == other.properties
+
+    def __hash__(self):
+        return hash((frozenset(self.node_types), self.node_id))
+
+
+class LegacyRelationship(Relationship):
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return self.relationship_type == other.relationship_type \
+               and self.node_a == other.node_a \
+               and self.node_b == other.node_b
+
+    def __hash__(self):
+        return hash((self.relationship_type, self.node_a, self.node_b))
+
+
+def create_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--relationships", "-r", default=1000000, type=int)
+    parser.add_argument("--nodes", "-n", default=100000, type=int)
+    return parser
+
+
+def timed(description, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"  {description}: {time.perf_counter() - start:.2f}s")
+    return result
+
+
+def run(name, node_class, relationship_class, args):
+    print(name)
+    nodes = [node_class("Person", {"name": f"name{index}"}) for index in range(args.nodes)]
+    relationships = [relationship_class(nodes[index % args.nodes], "Knows", nodes[(index * 7 + 1) % args.nodes])
+                     for index in range(args.relationships)]
+    removed = relationships[::10]
+    relationships_set = timed("build set", lambda: set(relationships))
+    timed("set difference", lambda: relationships_set - set(removed))
+    index = timed("build dict", lambda: {rel: position for position, rel in enumerate(relationships)})
+    timed("dict lookups", lambda: [index[rel] for rel in removed])
+
+
+def main():
+    args = create_arg_parser().parse_args()
+    run("legacy hashing", LegacyNode, LegacyRelationship, args)
+    run("cached hashing", Node, Relationship, args)
+
+
+if __name__ == '__main__':
+    main()
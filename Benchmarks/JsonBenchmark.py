@@ -0,0 +1,91 @@
+"""
+Measures loading and saving a database json with the json module against orjson and msgspec.
+the database is generated from numbered names, from a names data set or loaded from a database file.
+backends that are not installed are skipped.
+
+python -m Benchmarks.JsonBenchmark --nodes 100000
+python -m Benchmarks.JsonBenchmark --names DataSets/names-big.json
+python -m Benchmarks.JsonBenchmark --database example_graph.json
+"""
+import argparse
+import io
+import json
+import time
+
+from DatabaseGenerator.DatabaseGenerator import create_graph_map
+from GraphGenerator import load_names_data_set
+from GraphModeler.DbTranformations import FastJson, DatabaseStructs
+from GraphModeler.DbTranformations.DbLoader import import_database_json, import_database_struct
+from GraphModeler.DbTranformations.DbSaver import save_database_json, export_database_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def create_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", "-n", default=100000, type=int)
+    parser.add_argument("--connection_chance", "-c", default=5, type=int)
+    parser.add_argument("--names", help="a names data set to generate the database from instead of numbered names")
+    parser.add_argument("--database", "-d", help="a database json file to benchmark instead of a generated one")
+    return parser
+
+
+def load_document(args) -> bytes:
+    """
+    Reads the database file or generates a database and encodes it
+    :param args: the args from the command line
+    :return: the database json document
+    """
+    if args.database:
+        with open(args.database, "rb") as database_file:
+            return database_file.read()
+    names = load_names_data_set(args.names) if args.names else [f"name{index}" for index in range(args.nodes)]
+    database = create_graph_map(names, args.connection_chance, seed=0)
+    return json.dumps(export_database_json(database)).encode("UTF-8")
+
+
+def backends():
+    yield "json", json.dumps, json.loads
+    if orjson is not None:
+        yield "orjson", lambda value: orjson.dumps(value).decode("UTF-8"), orjson.loads
+    if msgspec is not None:
+        yield "msgspec", lambda value: msgspec.json.encode(value).decode("UTF-8"), msgspec.json.decode
+
+
+def timed(description, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"  {description}: {time.perf_counter() - start:.2f}s")
+    return result
+
+
+def main():
+    args = create_arg_parser().parse_args()
+    encoded = load_document(args)
+    document_json = json.loads(encoded)
+    database = import_database_json(document_json)
+    print(f"{len(database.graph.nodes)} nodes, {len(database.graph.relationships)} relationships, "
+          f"{len(encoded) / 1024 / 1024:.1f}MB. the cli uses {FastJson.BACKEND}")
+    for name, dumps, loads in backends():
+        print(name)
+        timed("encode", lambda: dumps(document_json))
+        timed("decode", lambda: loads(encoded))
+        if name == FastJson.BACKEND:
+            timed("decode without gc", lambda: FastJson.load(io.BytesIO(encoded)))
+        timed("load", lambda: import_database_json(loads(encoded)))
+        if name == "msgspec" and DatabaseStructs.msgspec is not None:
+            timed("load structs", lambda: import_database_struct(DatabaseStructs.decode_database(encoded)))
+    print(f"streaming save with {FastJson.BACKEND}")
+    timed("save", lambda: save_database_json(database, io.StringIO()))
+
+
+if __name__ == '__main__':
+    main()
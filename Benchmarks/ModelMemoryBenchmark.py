@@ -0,0 +1,78 @@
+"""
+Measures the memory taken by the node and relationship models of a graph generated from the names data set.
+The legacy dataclass models, a dict of properties and a list of labels per node, are measured on the same graph
+for comparison.
+
+python -m Benchmarks.ModelMemoryBenchmark --names DataSets/names-big.json --repeat 5
+"""
+import argparse
+import gc
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from GraphGenerator import load_names_data_set
+from GraphModeler.Models import Node, Relationship
+
+
+@dataclass
+class LegacyNode:
+    node_types: List[str]
+    properties: Dict[str, str]
+
+
+@dataclass
+class LegacyRelationship:
+    node_a: LegacyNode
+    relationship_type: str
+    node_b: LegacyNode
+    properties: Dict[str, str] = field(default_factory=dict)
+
+
+def create_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--names", "-n", default="DataSets/names-big.json")
+    parser.add_argument("--repeat", "-r", help="how many times to repeat the names", default=5, type=int)
+    parser.add_argument("--degree", "-d", help="relationships per node", default=3, type=int)
+    return parser
+
+
+def build_graph(names, degree, node_factory, relationship_factory):
+    nodes = [node_factory(name) for name in names]
+    relationships = [relationship_factory(nodes[index], nodes[(index * 7 + offset) % len(nodes)])
+                     for index in range(len(nodes)) for offset in range(1, degree + 1)]
+    return nodes, relationships
+
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    graph = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del graph
+    return size
+
+
+def main():
+    args = create_arg_parser().parse_args()
+    names = [f"{name} {index}" for index in range(args.repeat) for name in load_names_data_set(args.names)]
+    ids = [str(uuid.uuid4()) for _ in names]
+    id_of = dict(zip(names, ids))
+    legacy = measure(lambda: build_graph(
+        names, args.degree,
+        lambda name: LegacyNode(["Person"], {"name": name, "node_id": id_of[name]}),
+        lambda node_a, node_b: LegacyRelationship(node_a, "Knows", node_b)))
+    compact = measure(lambda: build_graph(
+        names, args.degree,
+        lambda name: Node("Person", {"name": name, "node_id": id_of[name]}),
+        lambda node_a, node_b: Relationship(node_a, "Knows", node_b)))
+    items = len(names) * (args.degree + 1)
+    print(f"{len(names)} nodes, {len(names) * args.degree} relationships")
+    print(f" legacy: {legacy / 2 ** 20:.1f}MB ({legacy / items:.0f} bytes per item)")
+    print(f"compact: {compact / 2 ** 20:.1f}MB ({compact / items:.0f} bytes per item)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Measures the perturbation throughput with the adjacency index and swap with last removal
+against the legacy perturber that filtered the whole relationship list on every node deletion.
+
+python -m Benchmarks.PerturbBenchmark --nodes 1000000 --iterations 1000
+"""
+import argparse
+import random
+import time
+
+from Config import GlobalSettings
+from GraphModeler.DbTranformations.DbPerturber import perturb_graph_reference
+from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models.Database import Database
+from GraphModeler.Models.Graph import Graph
+
+
+def create_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", "-n", default=1000000, type=int)
+    parser.add_argument("--degree", "-d", default=4, type=int)
+    parser.add_argument("--iterations", "-i", default=1000, type=int)
+    parser.add_argument("--legacy_iterations", "-l", default=10, type=int)
+    return parser
+
+
+def create_database(nodes: int, degree: int) -> Database:
+    graph_nodes = [Node(GlobalSettings.TEST_GRAPH_TYPE, given_id=str(index)) for index in range(nodes)]
+    relationships = [Relationship(graph_nodes[index % nodes], GlobalSettings.TEST_GRAPH_RELATIONSHIP,
+                                  graph_nodes[random.randrange(nodes)]) for index in range(nodes * degree)]
+    return Database(Graph(graph_nodes, relationships), "benchmark")
+
+
+def legacy_perturb(database: Database, iterations: int) -> int:
+    graph = database.graph
+    for _ in range(iterations):
+        node = random.choice(graph.nodes)
+        node_relationships = filter(lambda rel: rel.node_a == node or rel.node_b == node, graph.relationships)
+        graph.relationships = list(set(graph.relationships) - set(node_relationships))
+        graph.nodes.remove(node)
+        graph.relationships.append(Relationship(random.choice(graph.nodes), GlobalSettings.TEST_GRAPH_RELATIONSHIP,
+                                                random.choice(graph.nodes)))
+        graph.relationships.remove(random.choice(graph.relationships))
+    return iterations * 3
+
+
+def timed(description, function):
+    start = time.perf_counter()
+    mutations = function()
+    elapsed = time.perf_counter() - start
+    print(f"  {description}: {mutations} mutations in {elapsed:.2f}s ({mutations / max(elapsed, 1e-9):.0f}/s)")
+
+
+def main():
+    args = create_arg_parser().parse_args()
+    random.seed(0)
+    print(f"{args.nodes} nodes, {args.nodes * args.degree} relationships")
+    database = create_database(args.nodes, args.degree)
+    timed("legacy", lambda: legacy_perturb(database, args.legacy_iterations))
+    database = create_database(args.nodes, args.degree)
+    start = time.perf_counter()
+    database.graph.index_adjacency()
+    print(f"  index build: {time.perf_counter() - start:.2f}s")
+    timed("indexed", lambda: perturb_graph_reference(database, 1, args.iterations))
+
+
+if __name__ == '__main__':
+    main()
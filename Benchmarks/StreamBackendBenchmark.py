@@ -0,0 +1,64 @@
+"""
+Compares the per statement overhead of the thread pool backend against the native async backend.
+Both backends run against mock drivers so only the client side overhead is measured,
+with --latency the mock statements also wait to simulate the server.
+
+python -m Benchmarks.StreamBackendBenchmark --statements 20000 --concurrency 8
+"""
+import argparse
+import asyncio
+import time
+
+from Benchmarks.FakeDrivers import FakeGraphDatabase, FakeAsyncGraphDatabase
+from DbInterface import Neo4jStreamAsync as executor_module, Neo4jStreamNativeAsync as native_module
+from DbInterface.TransactionPipeline import run_transactions_async
+
+
+def create_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statements", "-s", help="the amount of statements to run", default=20000, type=int)
+    parser.add_argument("--statements_per_transaction", "-t", default=100, type=int)
+    parser.add_argument("--concurrency", "-c", help="transactions in flight", default=8, type=int)
+    parser.add_argument("--latency", "-l", help="simulated seconds per statement", default=0.0, type=float)
+    return parser
+
+
+def statement_works(args):
+    for _ in range(args.statements // args.statements_per_transaction):
+        async def work(transaction):
+            for _ in range(args.statements_per_transaction):
+                await transaction.run("RETURN 1")
+
+        yield args.statements_per_transaction, work
+
+
+def create_stream(args, backend: str):
+    if backend == "native":
+        return native_module.Neo4jStreamNativeAsync("bolt://fake", "", "")
+    return executor_module.Neo4jStreamAsync("bolt://fake", "", "", asyncio.get_event_loop(),
+                                            max_workers=args.concurrency)
+
+
+async def run_backend(args, backend: str) -> float:
+    async with create_stream(args, backend) as stream:
+        start = time.perf_counter()
+        await run_transactions_async(stream, statement_works(args), args.concurrency)
+        elapsed = time.perf_counter() - start
+        if backend == "executor":
+            print(f"session pool: {stream.metrics}")
+        return elapsed
+
+
+def main():
+    args = create_arg_parser().parse_args()
+    FakeGraphDatabase.latency = FakeAsyncGraphDatabase.latency = args.latency
+    executor_module.GraphDatabase = FakeGraphDatabase
+    native_module.AsyncGraphDatabase = FakeAsyncGraphDatabase
+    for backend in ("executor", "native"):
+        elapsed = asyncio.run(run_backend(args, backend))
+        print(f"{backend:>8}: {args.statements} statements in {elapsed:.3f}s, "
+              f"{elapsed / args.statements * 1e6:.1f}us per statement")
+
+
+if __name__ == '__main__':
+    main()
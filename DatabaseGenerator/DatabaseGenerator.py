@@ -1,26 +1,221 @@
+import hashlib
 import random
-from typing import List, AnyStr
+import uuid
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List, AnyStr, Optional, Tuple, Callable, Iterable, Iterator, Union, Dict
 
 from Config import GlobalSettings
 from GraphModeler.Models import Node, Relationship
 from GraphModeler.Models.Database import Database
 from GraphModeler.Models.Graph import Graph
 
+DEFAULT_CHUNK_SIZE = 10000
+DEFAULT_DATABASE_NAME = "TestDatabase"
+POWER_LAW_ALPHA = 2.0
+DegreeModel = Callable[[random.Random, int, int, int], Iterable[int]]
 
-def create_graph_map(names: List[AnyStr], connection_chance: int) -> Database:
+
+def uniform_targets(generator: random.Random, index: int, node_count: int, connection_chance: int) -> Iterable[int]:
+    """
+    Connects a node to up to connection_chance nodes picked uniformly
+    :param generator: the random generator of the chunk
+    :param index: the index of the node
+    :param node_count: the amount of nodes in the graph
+    :param connection_chance: the max amount of relationships starting at the node
+    :return: the indexes of the nodes to connect to
+    """
+    return [generator.randrange(node_count) for _ in range(generator.randint(0, connection_chance))]
+
+
+def barabasi_albert_targets(generator: random.Random, index: int, node_count: int,
+                            connection_chance: int) -> Iterable[int]:
+    """
+    Connects a node to earlier nodes with preferential attachment.
+    uses the mean field form of the Barabási–Albert model where node j is picked with a chance of 1 / sqrt(j),
+    so every node is generated on its own instead of following the degrees of the whole graph
+    :param generator: the random generator of the chunk
+    :param index: the index of the node
+    :param node_count: the amount of nodes in the graph
+    :param connection_chance: twice the amount of relationships each node attaches, the mean of the uniform model
+    :return: the indexes of the nodes to connect to
+    """
+    return [int(index * generator.random() ** 2) for _ in range(min(index, max(1, connection_chance // 2)))]
+
+
+def power_law_targets(generator: random.Random, index: int, node_count: int, connection_chance: int) -> Iterable[int]:
+    """
+    Connects a node to nodes picked uniformly with an out degree drawn from a pareto distribution
+    :param generator: the random generator of the chunk
+    :param index: the index of the node
+    :param node_count: the amount of nodes in the graph
+    :param connection_chance: twice the mean out degree, the mean of the uniform model
+    :return: the indexes of the nodes to connect to
+    """
+    degree = min(node_count, int(connection_chance / 2 * (generator.paretovariate(POWER_LAW_ALPHA) - 1)))
+    return [generator.randrange(node_count) for _ in range(degree)]
+
+
+DEGREE_MODELS = {
+    "uniform": uniform_targets,
+    "barabasi-albert": barabasi_albert_targets,
+    "power-law": power_law_targets,
+}
+
+
+def create_graph_map(names: List[AnyStr], connection_chance: int, seed: Optional[int] = None, workers: int = 1,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, node_count: Optional[int] = None,
+                     degree_model: Union[AnyStr, DegreeModel] = "uniform") -> Database:
     """
     Creates a randomly generated graph in neo4j and saves it to a json representation for use in testing the differ
     loads names for generating from a file.
+    the node range is split to fixed chunks each with its own random generator seeded by the seed and the chunk start,
+    so the graph is the same for a seed no matter how many workers generated it
     :param connection_chance: the chance for a node to connect to another higher is a bigger change
     :param names: the path to save the graph to.
+    :param seed: the seed of the graph, a random seed is used if not given
+    :param workers: the amount of processes to generate the chunks in
+    :param chunk_size: the amount of nodes in each chunk
+    :param node_count: the amount of nodes to generate, the names are cycled with a suffix if there are fewer names
+    :param degree_model: the name of a model in DEGREE_MODELS or a function picking the targets of a node
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    node_count = len(names) if node_count is None else node_count
+    names_nodes = list(iter_generated_nodes(names, node_count, seed))
+    relationships = [Relationship(names_nodes[source], GlobalSettings.TEST_GRAPH_RELATIONSHIP, names_nodes[target])
+                     for sources, targets in generate_chunks(node_count, connection_chance, seed, degree_model,
+                                                             workers, chunk_size)
+                     for source, target in zip(sources, targets)]
+    return Database(Graph(names_nodes, relationships), DEFAULT_DATABASE_NAME)
+
+
+def node_name(names: List[AnyStr], index: int) -> AnyStr:
+    """
+    Picks the name of a node cycling through the names and suffixing the name on every cycle after the first
+    :param names: the names to pick from
+    :param index: the index of the node
+    :return: the name of the node
+    """
+    cycle, position = divmod(index, len(names))
+    return f"{names[position]}_{cycle}" if cycle else names[position]
+
+
+def generated_node_id(seed: int, index: int) -> AnyStr:
+    """
+    Derives the id of a node from the seed of the graph so any chunk can know the id of any node
+    :param seed: the seed of the graph
+    :param index: the index of the node
+    :return: a uuid4 shaped id
+    """
+    digest = hashlib.blake2b(f"{seed}:{index}".encode(), digest_size=16).digest()
+    return str(uuid.UUID(bytes=digest, version=4))
+
+
+def iter_generated_nodes(names: List[AnyStr], node_count: int, seed: int) -> Iterator[Node]:
+    """
+    Generates the nodes of a graph one at a time
+    :param names: the names to pick from
+    :param node_count: the amount of nodes to generate
+    :param seed: the seed of the graph
+    :return: an iterator of the nodes in order
+    """
+    for index in range(node_count):
+        yield Node(GlobalSettings.TEST_GRAPH_TYPE, properties={"name": node_name(names, index)},
+                   given_id=generated_node_id(seed, index))
+
+
+def iter_generated_relationships(node_count: int, connection_chance: int, seed: int,
+                                 degree_model: Union[AnyStr, DegreeModel] = "uniform", workers: int = 1,
+                                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Relationship]:
+    """
+    Generates the relationships of a graph keeping only a few chunks in memory
+    IMPORTANT! the nodes of the relationships only hold their type and id
+    :param node_count: the amount of nodes in the graph
+    :param connection_chance: the connection parameter of the degree model
+    :param seed: the seed of the graph
+    :param degree_model: the name of a model in DEGREE_MODELS or a function picking the targets of a node
+    :param workers: the amount of processes to generate the chunks in
+    :param chunk_size: the amount of nodes in each chunk
+    :return: an iterator of the relationships in order
+    """
+    for sources, targets in generate_chunks(node_count, connection_chance, seed, degree_model, workers, chunk_size):
+        endpoints = {}
+        for source, target in zip(sources, targets):
+            for index in (source, target):
+                if index not in endpoints:
+                    endpoints[index] = Node(GlobalSettings.TEST_GRAPH_TYPE, given_id=generated_node_id(seed, index))
+            yield Relationship(endpoints[source], GlobalSettings.TEST_GRAPH_RELATIONSHIP, endpoints[target])
+
+
+def iter_generated_relationship_rows(node_count: int, connection_chance: int, seed: int,
+                                     degree_model: Union[AnyStr, DegreeModel] = "uniform", workers: int = 1,
+                                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[int, AnyStr, int, Dict]]:
+    """
+    Generates the relationships of a graph as rows pointing to their nodes by index, the nodes are never built
+    :param node_count: the amount of nodes in the graph
+    :param connection_chance: the connection parameter of the degree model
+    :param seed: the seed of the graph
+    :param degree_model: the name of a model in DEGREE_MODELS or a function picking the targets of a node
+    :param workers: the amount of processes to generate the chunks in
+    :param chunk_size: the amount of nodes in each chunk
+    :return: an iterator of the source index, type, target index and properties of the relationships in order
+    """
+    for sources, targets in generate_chunks(node_count, connection_chance, seed, degree_model, workers, chunk_size):
+        for source, target in zip(sources, targets):
+            yield source, GlobalSettings.TEST_GRAPH_RELATIONSHIP, target, {}
+
+
+def generate_chunks(node_count: int, connection_chance: int, seed: int, degree_model: Union[AnyStr, DegreeModel],
+                    workers: int, chunk_size: int) -> Iterator[Tuple[array, array]]:
+    """
+    Generates the relationships of every chunk in order. at most twice the workers chunks are in flight
+    :param node_count: the amount of nodes in the graph
+    :param connection_chance: the connection parameter of the degree model
+    :param seed: the seed of the graph
+    :param degree_model: the name of a model in DEGREE_MODELS or a function picking the targets of a node
+    :param workers: the amount of processes to generate the chunks in
+    :param chunk_size: the amount of nodes in each chunk
+    :return: an iterator of the source and target node indexes of every chunk
+    """
+    if isinstance(degree_model, str):
+        degree_model = DEGREE_MODELS[degree_model]
+    generate = partial(generate_chunk, seed, node_count=node_count, connection_chance=connection_chance,
+                       degree_model=degree_model)
+    ranges = ((start, min(start + chunk_size, node_count)) for start in range(0, node_count, chunk_size))
+    if workers <= 1:
+        yield from (generate(start, stop) for start, stop in ranges)
+        return
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for start, stop in ranges:
+            pending.append(executor.submit(generate, start, stop))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def generate_chunk(seed: int, start: int, stop: int, node_count: int, connection_chance: int,
+                   degree_model: DegreeModel = uniform_targets) -> Tuple[array, array]:
+    """
+    Generates the relationships starting at a range of nodes
+    :param seed: the seed of the graph
+    :param start: the index of the first node in the chunk
+    :param stop: the index after the last node in the chunk
+    :param node_count: the amount of nodes in the whole graph
+    :param connection_chance: the connection parameter of the degree model
+    :param degree_model: a function picking the targets of a node
+    :return: the source and target node indexes of the relationships
     """
-    names = names
-    relationships = []
-    names_nodes = [Node(GlobalSettings.TEST_GRAPH_TYPE, properties={"name": name}) for name in names]
-    for current_node in names_nodes:
-        for i in range(random.randint(0, connection_chance)):
-            selected_node = random.choice(names_nodes)
-            if selected_node is not current_node:
-                new_relationship = Relationship(current_node, GlobalSettings.TEST_GRAPH_RELATIONSHIP, selected_node)
-                relationships.append(new_relationship)
-    return Database(Graph(names_nodes, relationships), "TestDatabase")
+    generator = random.Random(f"{seed}:{start}")
+    sources = array("q")
+    targets = array("q")
+    for index in range(start, stop):
+        for target in degree_model(generator, index, node_count, connection_chance):
+            if target != index:
+                sources.append(index)
+                targets.append(target)
+    return sources, targets
@@ -1,8 +1,11 @@
 from contextlib import contextmanager
-from typing import AnyStr
+from itertools import islice
+from typing import AnyStr, Dict, Iterator, List
 
 from neo4j import GraphDatabase
 
+DEFAULT_BATCH_SIZE = 1000
+
 
 class Neo4jStream:
     def __init__(self, address: AnyStr, username: AnyStr, password: AnyStr, encrypted: bool = False):
@@ -42,23 +45,47 @@ class Neo4jStream:
         self._session.close()
         self._driver.close()
 
-    def write(self, query: AnyStr) -> None:
+    def write(self, query: AnyStr, parameters: Dict = None):
         """
         Executes a query in neo4j database. Use this function only for creating data not for reading
         :param query: the query to run
+        :param parameters: the values of the $param placeholders in the query
+        :return: the query result from neo4j, for writes that return a summary such as a count
         """
-        self._session.run(query)
+        return self._session.run(query, parameters)
 
-    def read(self, query: AnyStr):
+    def read(self, query: AnyStr, parameters: Dict = None):
         """
         Reads data from neo4j. use this function only for retrieving data from neo4j
         :param query: the query to run
+        :param parameters: the values of the $param placeholders in the query
         :return: the query result from neo4j
         """
-        return self._session.run(query)
+        return self._session.run(query, parameters)
+
+    def read_stream(self, query: AnyStr, parameters: Dict = None, batch_size: int = DEFAULT_BATCH_SIZE) -> \
+            Iterator[List]:
+        """
+        Reads data from neo4j in batches while the records are still being fetched from the server
+        so the whole result never has to be held in memory
+        :param query: the query to run
+        :param parameters: the values of the $param placeholders in the query
+        :param batch_size: the amount of records in each batch
+        :return: an iterator of record batches
+        """
+        records = iter(self._session.run(query, parameters))
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                return
+            yield batch
 
     @contextmanager
     def transaction(self):
+        """
+        Opens a transaction that is committed on exit. queries are run with transaction.run(query, parameters)
+        :return: the transaction
+        """
         tx = None
         try:
             tx = self._session.begin_transaction()
@@ -1,21 +1,33 @@
 import asyncio
 from concurrent import futures
 from contextlib import asynccontextmanager
-from typing import AnyStr
+from functools import partial
+from itertools import islice
+from typing import AnyStr, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 
 from neo4j import GraphDatabase
 
+from DbInterface.Neo4jStream import DEFAULT_BATCH_SIZE
+from DbInterface.SessionPool import SessionPool, SessionPoolMetrics, DEFAULT_ACQUIRE_TIMEOUT, \
+    DEFAULT_HEALTH_CHECK_INTERVAL
+
 
 class Neo4jStreamAsync:
     def __init__(self, address: AnyStr, username: AnyStr, password: AnyStr, loop, encrypted: bool = False,
-                 max_workers: int = 30):
+                 max_workers: int = 30, pool_size: Optional[int] = None,
+                 acquire_timeout: Optional[float] = DEFAULT_ACQUIRE_TIMEOUT,
+                 health_check_interval: Optional[float] = DEFAULT_HEALTH_CHECK_INTERVAL):
         """
         Neo4j async interface as a stream
+        every operation borrows a session from a pool shared by all of the concurrent operations on the stream
         :param address: the db address
         :param username: the db username
         :param password: the db password
         :param encrypted: whether encrypt the neo4j connection. must be false with neo4j 4.0
         :param max_workers: the max workers in the thread pool for running the queries
+        :param pool_size: the max amount of sessions, defaults to max_workers
+        :param acquire_timeout: the max seconds to wait for a free session, waits forever if None
+        :param health_check_interval: the seconds a session can be idle before it is checked when borrowed
         """
         self._address = address
         self._username = username
@@ -24,10 +36,16 @@ class Neo4jStreamAsync:
         self._executor = futures.ThreadPoolExecutor(max_workers=max_workers)
         self._loop = loop
         self._driver = None
+        self._pool_size = pool_size or max_workers
+        self._acquire_timeout = acquire_timeout
+        self._health_check_interval = health_check_interval
+        self._pool = None
 
     def connect(self):
         self._driver = GraphDatabase.driver(self._address, auth=(self._username, self._password),
                                             encrypted=self._encrypted)
+        self._pool = SessionPool(self._driver.session, self._run_blocking, self._pool_size, self._acquire_timeout,
+                                 self._health_check_interval)
 
     def close(self):
         self._driver.close()
@@ -37,68 +55,128 @@ class Neo4jStreamAsync:
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._pool.close()
         self.close()
 
-    async def read_async(self, query: AnyStr):
+    @property
+    def metrics(self) -> SessionPoolMetrics:
+        return self._pool.metrics
+
+    def session(self):
+        """
+        Borrows a session from the pool of the stream
+        :return: an async context manager of the session
+        """
+        return self._pool.session()
+
+    def _run_blocking(self, function, *args):
+        return self._loop.run_in_executor(self._executor, function, *args)
+
+    async def read_async(self, query: AnyStr, parameters: Dict = None):
         """
         Reads results from the database in an async manner
         :param query: the query to run
+        :param parameters: the values of the $param placeholders in the query
         :return: the results
         """
-        return await self._loop.run_in_executor(self._executor, self.__run, query)
+        async with self._pool.session() as session:
+            return await self._pool.run(session, self.__run, session, query, parameters)
 
-    async def write_async(self, query: AnyStr):
+    async def write_async(self, query: AnyStr, parameters: Dict = None):
         """
         Writes to a neo4j database in an async manner
         :param query: the query to write
+        :param parameters: the values of the $param placeholders in the query
+        :return: the results, for writes that return a summary such as a count
         """
-        await self._loop.run_in_executor(self._executor, self.__run, query)
-
-    def __run(self, query: AnyStr):
-        with self._driver.session() as session:
-            result = session.run(query)
-        return result.records()
+        async with self._pool.session() as session:
+            return await self._pool.run(session, self.__run, session, query, parameters)
 
-    async def get_session(self):
-        def get(driver):
-            return driver.session()
-
-        return await self._loop.run_in_executor(self._executor, get, self._driver)
+    async def read_stream_async(self, query: AnyStr, parameters: Dict = None,
+                                batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[List]:
+        """
+        Reads results from the database in batches while the records are still being fetched from the server
+        the session is kept until the iteration is done, a session of an iteration that was stopped early is closed
+        once its last fetch returns
+        :param query: the query to run
+        :param parameters: the values of the $param placeholders in the query
+        :param batch_size: the amount of records in each batch
+        :return: an async iterator of record batches
+        """
+        def start(stream_session):
+            return iter(stream_session.run(query, parameters))
+
+        def next_batch(records):
+            return list(islice(records, batch_size))
+
+        session = await self._pool.acquire()
+        exhausted = False
+        try:
+            records = await self._pool.run(session, start, session)
+            while True:
+                batch = await self._pool.run(session, next_batch, records)
+                if not batch:
+                    exhausted = True
+                    return
+                yield batch
+        finally:
+            if exhausted:
+                await self._pool.release(session)
+            else:
+                self._pool.discard_later(session)
+
+    @staticmethod
+    def __run(session, query: AnyStr, parameters: Dict = None) -> List:
+        return list(session.run(query, parameters))
 
     @asynccontextmanager
     async def transaction(self):
-        with await self.get_session() as session:
-            transaction = None
+        """
+        Opens a transaction that is committed on exit or rolled back if an error was raised.
+        a cancelled transaction isn't rolled back while its call may still run, its session is closed instead
+        :return: the transaction
+        """
+        async with self._pool.session() as session:
+            transaction = Neo4jAsyncTransaction(session, partial(self._pool.run, session))
+            await transaction.begin_transaction()
             try:
-                transaction = Neo4jAsyncTransaction(session, self._loop, self._executor)
-                await transaction.begin_transaction()
                 yield transaction
-            finally:
-                if transaction:
-                    await transaction.commit()
+            except Exception:
+                await transaction.rollback()
+                raise
+            await transaction.commit()
 
 
 class Neo4jAsyncTransaction:
-    def __init__(self, session, loop, executor):
+    def __init__(self, session, run_blocking: Callable[..., Awaitable]):
+        """
+        :param session: the session the transaction is opened on
+        :param run_blocking: runs a blocking call of the session off the event loop
+        """
         self._session = session
-        self._loop = loop
-        self._executor = executor
+        self._run_blocking = run_blocking
         self._transaction = None
 
-    async def run(self, query):
-        def run_blocking(transaction, data):
-            transaction.run(data)
+    async def run(self, query, parameters: Dict = None):
+        def run_blocking(transaction, data, data_parameters):
+            transaction.run(data, data_parameters)
 
-        await self._loop.run_in_executor(self._executor, run_blocking, self._transaction, query)
+        await self._run_blocking(run_blocking, self._transaction, query, parameters)
 
     async def commit(self):
         def commit_blocking(transaction):
             transaction.commit()
 
-        await self._loop.run_in_executor(self._executor, commit_blocking, self._transaction)
+        await self._run_blocking(commit_blocking, self._transaction)
+
+    async def rollback(self):
+        def rollback_blocking(transaction):
+            transaction.rollback()
+
+        await self._run_blocking(rollback_blocking, self._transaction)
 
     async def begin_transaction(self):
         def begin_blocking(session):
             return session.begin_transaction()
 
-        self._transaction = await self._loop.run_in_executor(self._executor, begin_blocking, self._session)
+        self._transaction = await self._run_blocking(begin_blocking, self._session)
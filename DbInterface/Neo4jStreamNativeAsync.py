@@ -0,0 +1,120 @@
+from contextlib import asynccontextmanager
+from typing import AnyStr, AsyncIterator, Dict, List
+
+from DbInterface.Neo4jStream import DEFAULT_BATCH_SIZE
+
+try:
+    from neo4j import AsyncGraphDatabase
+except ImportError:
+    AsyncGraphDatabase = None
+
+
+class Neo4jStreamNativeAsync:
+    def __init__(self, address: AnyStr, username: AnyStr, password: AnyStr, encrypted: bool = False,
+                 max_connections: int = 100):
+        """
+        Neo4j async interface as a stream built on the driver's native async sessions.
+        has the same interface as Neo4jStreamAsync without a thread hop per statement
+        requires neo4j driver 5.0 or newer
+        :param address: the db address
+        :param username: the db username
+        :param password: the db password
+        :param encrypted: whether encrypt the neo4j connection
+        :param max_connections: the max amount of connections in the driver pool
+        """
+        self._address = address
+        self._username = username
+        self._password = password
+        self._encrypted = encrypted
+        self._max_connections = max_connections
+        self._driver = None
+
+    def connect(self):
+        if AsyncGraphDatabase is None:
+            raise RuntimeError("The native async backend requires neo4j driver 5.0 or newer")
+        self._driver = AsyncGraphDatabase.driver(self._address, auth=(self._username, self._password),
+                                                 encrypted=self._encrypted,
+                                                 max_connection_pool_size=self._max_connections)
+
+    async def close(self):
+        await self._driver.close()
+
+    async def __aenter__(self):
+        self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def read_async(self, query: AnyStr, parameters: Dict = None):
+        """
+        Reads results from the database in an async manner
+        :param query: the query to run
+        :param parameters: the values of the $param placeholders in the query
+        :return: the results
+        """
+        async with self._driver.session() as session:
+            result = await session.run(query, parameters)
+            return [record async for record in result]
+
+    async def read_stream_async(self, query: AnyStr, parameters: Dict = None,
+                                batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[List]:
+        """
+        Reads results from the database in batches while the records are still being fetched from the server
+        the session is kept open until the iteration is done
+        :param query: the query to run
+        :param parameters: the values of the $param placeholders in the query
+        :param batch_size: the amount of records in each batch and the fetch size of the session
+        :return: an async iterator of record batches
+        """
+        async with self._driver.session(fetch_size=batch_size) as session:
+            result = await session.run(query, parameters)
+            batch = []
+            async for record in result:
+                batch.append(record)
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+    async def write_async(self, query: AnyStr, parameters: Dict = None):
+        """
+        Writes to a neo4j database in an async manner
+        :param query: the query to write
+        :param parameters: the values of the $param placeholders in the query
+        :return: the results, for writes that return a summary such as a count
+        """
+        async with self._driver.session() as session:
+            result = await session.run(query, parameters)
+            return [record async for record in result]
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Opens a transaction that is committed on exit or rolled back if an error was raised
+        :return: the transaction
+        """
+        async with self._driver.session() as session:
+            transaction = Neo4jNativeAsyncTransaction(await session.begin_transaction())
+            try:
+                yield transaction
+            except BaseException:
+                await transaction.rollback()
+                raise
+            await transaction.commit()
+
+
+class Neo4jNativeAsyncTransaction:
+    def __init__(self, transaction):
+        self._transaction = transaction
+
+    async def run(self, query, parameters: Dict = None):
+        result = await self._transaction.run(query, parameters)
+        await result.consume()
+
+    async def commit(self):
+        await self._transaction.commit()
+
+    async def rollback(self):
+        await self._transaction.rollback()
@@ -0,0 +1,257 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from neo4j.exceptions import ServiceUnavailable
+
+try:
+    from neo4j.exceptions import SessionExpired
+except ImportError:
+    from neo4j.exceptions import ConnectionExpired as SessionExpired
+
+DEFAULT_POOL_SIZE = 30
+DEFAULT_ACQUIRE_TIMEOUT = 60.0
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0
+HEALTH_CHECK_QUERY = "RETURN 1"
+BROKEN_SESSION_ERRORS = (ServiceUnavailable, SessionExpired)
+
+
+class SessionPoolMetrics:
+    def __init__(self):
+        """
+        Counts the acquisitions of a session pool and how long they waited for a session
+        """
+        self.acquisitions = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+        self.created = 0
+        self.discarded = 0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.acquisitions if self.acquisitions else 0.0
+
+    def record_wait(self, wait: float) -> None:
+        self.acquisitions += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def __str__(self):
+        return f"{self.acquisitions} acquisitions, mean wait {self.mean_wait * 1000:.2f}ms, " \
+               f"max wait {self.max_wait * 1000:.2f}ms, {self.timeouts} timeouts, " \
+               f"{self.created} sessions created, {self.discarded} discarded"
+
+
+class SessionPool:
+    def __init__(self, create_session: Callable[[], Any], run_blocking: Callable[..., Awaitable],
+                 size: int = DEFAULT_POOL_SIZE, acquire_timeout: Optional[float] = DEFAULT_ACQUIRE_TIMEOUT,
+                 health_check_interval: Optional[float] = DEFAULT_HEALTH_CHECK_INTERVAL):
+        """
+        A bounded pool of blocking driver sessions shared between concurrent async operations.
+        sessions are created on demand up to the pool size and reused afterwards.
+        the blocking calls of a borrowed session should run through run() so a session is never reused or closed
+        while a cancelled operation left a call of it running on a thread
+        :param create_session: creates a new blocking session
+        :param run_blocking: runs a blocking function with its arguments off the event loop
+        :param size: the max amount of sessions
+        :param acquire_timeout: the max seconds to wait for a session, waits forever if None
+        :param health_check_interval: the seconds a session can be idle before it is checked with a query
+        when taken from the pool, sessions are never checked if None
+        """
+        self._create_session = create_session
+        self._run_blocking = run_blocking
+        self._size = size
+        self._acquire_timeout = acquire_timeout
+        self._health_check_interval = health_check_interval
+        self._idle: List[Tuple[Any, float]] = []
+        self._available = asyncio.Condition()
+        self._open = 0
+        self._calls: Dict[int, asyncio.Future] = {}
+        self._background: Set[asyncio.Future] = set()
+        self.metrics = SessionPoolMetrics()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def open_sessions(self) -> int:
+        return self._open
+
+    async def acquire(self):
+        """
+        Takes a session from the pool, creating one if the pool isn't full or waiting for one to be released
+        :return: the session
+        """
+        start = time.perf_counter()
+        try:
+            session = await asyncio.wait_for(self._acquire(), self._acquire_timeout)
+        except asyncio.TimeoutError:
+            self.metrics.timeouts += 1
+            raise TimeoutError(f"No session was released within {self._acquire_timeout}s, "
+                               f"all {self._size} sessions are in use")
+        self.metrics.record_wait(time.perf_counter() - start)
+        return session
+
+    async def _acquire(self):
+        while True:
+            async with self._available:
+                await self._available.wait_for(lambda: self._idle or self._open < self._size)
+                if self._idle:
+                    session, released_at = self._idle.pop()
+                else:
+                    session, released_at = None, None
+                    self._open += 1
+            if session is None:
+                return await self._create()
+            try:
+                healthy = await self._healthy(session, released_at)
+            except BaseException:
+                # a timeout or cancellation may interrupt the health check while it still runs on its thread
+                self.discard_later(session)
+                raise
+            if healthy:
+                return session
+            await self.discard(session)
+
+    async def _create(self):
+        creation = asyncio.ensure_future(self._run_blocking(self._create_session))
+        try:
+            session = await asyncio.shield(creation)
+        except BaseException:
+            # the session may still be created on its thread, it is closed once it exists
+            self._in_background(self._discard_created(creation))
+            raise
+        self.metrics.created += 1
+        return session
+
+    async def _discard_created(self, creation: asyncio.Future) -> None:
+        try:
+            session = await creation
+        except Exception:
+            await self._forget()
+            return
+        self.metrics.created += 1
+        await self.discard(session)
+
+    async def _healthy(self, session, released_at: float) -> bool:
+        if self._health_check_interval is None or time.monotonic() - released_at < self._health_check_interval:
+            return True
+        try:
+            await self.run(session, lambda: session.run(HEALTH_CHECK_QUERY).consume())
+            return True
+        except Exception:
+            return False
+
+    async def run(self, session, function: Callable, *args):
+        """
+        Runs a blocking call of a borrowed session off the event loop.
+        cancelling the caller doesn't stop the call, the session is only closed after the call returns
+        :param session: the session the call uses
+        :param function: the blocking function
+        :param args: the arguments of the function
+        :return: the result of the function
+        """
+        call = asyncio.ensure_future(self._run_blocking(function, *args))
+        self._calls[id(session)] = call
+        call.add_done_callback(partial(self._call_done, id(session)))
+        return await asyncio.shield(call)
+
+    def _call_done(self, session_id: int, call: asyncio.Future) -> None:
+        if self._calls.get(session_id) is call:
+            del self._calls[session_id]
+        if not call.cancelled():
+            # a call of a cancelled operation has no one waiting for its error
+            call.exception()
+
+    async def release(self, session) -> None:
+        """
+        Returns a session to the pool. a session with a call still running is discarded once the call returns
+        :param session: the session to return
+        """
+        if id(session) in self._calls:
+            self.discard_later(session)
+            return
+        async with self._available:
+            self._idle.append((session, time.monotonic()))
+            self._available.notify()
+
+    async def discard(self, session) -> None:
+        """
+        Closes a broken session and frees its place in the pool
+        IMPORTANT! the session shouldn't have a running call, use discard_later for sessions of cancelled operations
+        :param session: the session to close
+        """
+        self.metrics.discarded += 1
+        self._open -= 1
+        try:
+            await self._run_blocking(session.close)
+        except Exception:
+            pass
+        finally:
+            await self._notify()
+
+    def discard_later(self, session) -> None:
+        """
+        Discards a session in the background once its running call returns.
+        used for the sessions of cancelled operations, the session keeps its place in the pool until it is closed
+        :param session: the session to close
+        """
+        self._in_background(self._discard_after_call(session))
+
+    async def _discard_after_call(self, session) -> None:
+        call = self._calls.get(id(session))
+        if call is not None:
+            await asyncio.wait([call])
+        await self.discard(session)
+
+    def _in_background(self, coroutine: Awaitable) -> None:
+        task = asyncio.ensure_future(coroutine)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _forget(self) -> None:
+        self._open -= 1
+        await self._notify()
+
+    async def _notify(self) -> None:
+        async with self._available:
+            self._available.notify()
+
+    @asynccontextmanager
+    async def session(self):
+        """
+        Borrows a session for the duration of the context.
+        sessions that failed with a connection error are discarded instead of returned to the pool,
+        sessions of cancelled operations are discarded once their running call returns
+        :return: the session
+        """
+        session = await self.acquire()
+        try:
+            yield session
+        except BROKEN_SESSION_ERRORS:
+            await self._discard_after_call(session)
+            raise
+        except Exception:
+            await self.release(session)
+            raise
+        except BaseException:
+            self.discard_later(session)
+            raise
+        await self.release(session)
+
+    async def close(self) -> None:
+        """
+        Waits for the sessions being discarded and closes the idle sessions.
+        sessions still in use are closed when they are released to a closed driver
+        """
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        async with self._available:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for session, _ in idle:
+            await self._run_blocking(session.close)
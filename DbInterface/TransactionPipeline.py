@@ -0,0 +1,76 @@
+import asyncio
+from typing import Awaitable, Callable, Iterable, Optional, Tuple, TypeVar
+
+from neo4j.exceptions import TransientError
+
+from DbInterface.Neo4jStreamAsync import Neo4jStreamAsync, Neo4jAsyncTransaction
+
+TransactionWork = Callable[[Neo4jAsyncTransaction], Awaitable[None]]
+T = TypeVar("T")
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
+DEFAULT_RETRY_DELAY = 0.1
+
+
+async def retry_async(call: Callable[[], Awaitable[T]], retries: int = DEFAULT_RETRIES,
+                      retry_delay: float = DEFAULT_RETRY_DELAY) -> T:
+    """
+    Calls an async function again on transient errors such as deadlocks
+    :param call: the async function to call
+    :param retries: how many times to retry before giving up
+    :param retry_delay: the seconds to wait before the first retry, doubled on every retry
+    :return: the result of the call
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await call()
+        except TransientError:
+            if attempt == retries:
+                raise
+            await asyncio.sleep(retry_delay * 2 ** attempt)
+
+
+async def run_transaction_async(stream: Neo4jStreamAsync, work: TransactionWork, retries: int = DEFAULT_RETRIES,
+                                retry_delay: float = DEFAULT_RETRY_DELAY) -> None:
+    """
+    Runs work in a transaction retrying it in a new transaction on transient errors such as deadlocks
+    :param stream: the stream to open the transaction in
+    :param work: an async function running the queries of the transaction
+    :param retries: how many times to retry the transaction before giving up
+    :param retry_delay: the seconds to wait before the first retry, doubled on every retry
+    """
+    async def attempt():
+        async with stream.transaction() as transaction:
+            await work(transaction)
+
+    await retry_async(attempt, retries, retry_delay)
+
+
+async def run_transactions_async(stream: Neo4jStreamAsync, works: Iterable[Tuple[int, TransactionWork]],
+                                 concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+                                 progress: Optional[Callable[[int], None]] = None) -> None:
+    """
+    Runs transactions keeping up to concurrency of them in flight at a time.
+    works are pulled lazily so a new transaction only starts once a running one is committed
+    IMPORTANT! concurrency above the stream max_workers will wait on the stream thread pool
+    :param stream: the stream to run the transactions in
+    :param works: an iterable of (item count, async function running the queries of a transaction)
+    :param concurrency: the max amount of transactions in flight
+    :param retries: how many times to retry a transaction on transient errors
+    :param progress: called with the item count of every committed transaction
+    """
+    works = iter(works)
+
+    async def worker():
+        for count, work in works:
+            await run_transaction_async(stream, work, retries)
+            if progress:
+                progress(count)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max(1, concurrency))]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for running in workers:
+            running.cancel()
+        raise
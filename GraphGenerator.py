@@ -1,10 +1,21 @@
 import argparse
 import json
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack
 from typing import AnyStr, List
 
-from DatabaseGenerator.DatabaseGenerator import create_graph_map
-from GraphModeler import export_database_json, import_database_json
+from DatabaseGenerator.DatabaseGenerator import DEGREE_MODELS, DEFAULT_DATABASE_NAME, iter_generated_nodes, \
+    iter_generated_relationships, iter_generated_relationship_rows
 from GraphModeler.DbTranformations.DbPerturber import perturb_graph_reference
+from GraphModeler.DbTranformations import FastJson
+from GraphModeler.DbTranformations.DbLoader import load_database_file
+from GraphModeler.DbTranformations.DbSaver import export_diff_json, write_database_json, save_database_json, \
+    write_indexed_database_binary, save_database_binary
+from GraphModeler.DbTranformations.PerturbationJournal import write_journal
+from GraphModeler.Diff import diff_databases, diff_database_files
+from GraphModeler.Diff.StreamDiffer import export_diff_entry_json
 
 
 def load_names_data_set(path: AnyStr) -> List[AnyStr]:
@@ -34,6 +45,11 @@ def create_arg_parser() -> argparse.ArgumentParser:
     perturb_parser.add_argument("--perturb_chance", "-c", help="the chance for the graph to mutate", type=float)
     perturb_parser.add_argument("--iterations", "-i", help="the amount of times to go over the graph and mutate it",
                                 type=int)
+    perturb_parser.add_argument("--journal", "-j", required=False,
+                                help="an output file to record every mutation as json lines. "
+                                     "the journal can be replayed against neo4j as an incremental update")
+    perturb_parser.add_argument("--format", "-f", choices=["json", "binary"], default="json",
+                                help="the output file format, the input format is detected from the file")
     perturb_parser.set_defaults(func=perturb_command)
     generate_parser = subparsers.add_parser("generate")
     generate_parser.add_argument("--names", "-n",
@@ -45,7 +61,28 @@ def create_arg_parser() -> argparse.ArgumentParser:
                                  help="the chance for a node to connect to another one, higher is a bigger chance",
                                  default=5,
                                  type=int)
+    generate_parser.add_argument("--seed", "-s", help="the seed of the generated graph, the same seed generates "
+                                                      "the same graph", type=int, required=False)
+    generate_parser.add_argument("--workers", "-w", help="the amount of processes to generate the graph in",
+                                 default=1, type=int)
+    generate_parser.add_argument("--nodes", "-N", help="the amount of nodes to generate, the names are reused with "
+                                                       "a suffix when there are fewer names", type=int, required=False)
+    generate_parser.add_argument("--degree_model", "-D", help="how the relationships of every node are picked",
+                                 choices=list(DEGREE_MODELS), default="uniform")
+    generate_parser.add_argument("--format", "-f", choices=["json", "binary"], default="json",
+                                 help="the output file format")
     generate_parser.set_defaults(func=generation_command)
+    diff_parser = subparsers.add_parser("diff")
+    diff_parser.add_argument("--source", "-s", help="the original database json file")
+    diff_parser.add_argument("--target", "-t", help="the database json file to compare against the source")
+    diff_parser.add_argument("--output", "-o", help="an output file to save the differences as a json",
+                             required=False)
+    diff_parser.add_argument("--stream", "-S", action="store_true",
+                             help="diff the files without loading both graphs to memory. "
+                                  "the differences are written to the output as json lines")
+    diff_parser.add_argument("--memory_budget", "-m", help="the memory budget in MB for a streaming diff",
+                             default=256, type=int)
+    diff_parser.set_defaults(func=diff_command)
 
     return parser
 
@@ -53,32 +90,98 @@ def create_arg_parser() -> argparse.ArgumentParser:
 def generation_command(args) -> None:
     """
     Handles generating databases from the cli
+    the graph is written to the output while it is generated so only a few chunks are kept in memory
     :param args: the args from the command line
     """
     try:
-        with open(args.output_file, "w+") as output:
+        binary = args.format == "binary"
+        with open(args.output_file, "wb" if binary else "w+") as output:
             names = load_names_data_set(args.names)
-            database = create_graph_map(names, args.connection_chance)
-            database_json = export_database_json(database)
-            json.dump(database_json, output)
+            seed = args.seed if args.seed is not None else random.getrandbits(32)
+            node_count = args.nodes if args.nodes is not None else len(names)
+            print(f"seed: {seed}")
+            nodes = iter_generated_nodes(names, node_count, seed)
+            if binary:
+                write_indexed_database_binary(output, DEFAULT_DATABASE_NAME, nodes, iter_generated_relationship_rows(
+                    node_count, args.connection_chance, seed, args.degree_model, args.workers))
+            else:
+                write_database_json(output, DEFAULT_DATABASE_NAME, nodes, iter_generated_relationships(
+                    node_count, args.connection_chance, seed, args.degree_model, args.workers))
     except FileExistsError:
         print("File already exists. please choose a different filename")
 
 
 def perturb_command(args) -> None:
+    """
+    Handles perturbing a database file from the cli and reports the mutation throughput
+    :param args: the args from the command line
+    """
     try:
-        with open(args.database, "r") as db_file:
-            db_json = json.load(db_file)
-            database = import_database_json(db_json)
-            perturb_graph_reference(database, args.perturb_chance, args.iterations)
-        with open(args.output, "w+") as output_file:
-            json.dump(export_database_json(database), output_file)
+        database = load_database_file(args.database)
+        with ExitStack() as stack:
+            journal = write_journal(stack.enter_context(open(args.journal, "w+"))) if args.journal else None
+            start = time.perf_counter()
+            mutations = perturb_graph_reference(database, args.perturb_chance, args.iterations, journal)
+            elapsed = time.perf_counter() - start
+            print(f"{mutations} mutations in {elapsed:.2f}s ({mutations / max(elapsed, 1e-9):.0f} mutations/s)")
+        binary = args.format == "binary"
+        with open(args.output, "wb" if binary else "w+") as output_file:
+            (save_database_binary if binary else save_database_json)(database, output_file)
     except FileExistsError:
         print("File already exists please choose a different filename")
     except FileNotFoundError:
         print("File not found please make sure you entered the correct file path")
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, ValueError):
+        print("Invalid database file")
+
+
+def diff_command(args) -> None:
+    """
+    Handles diffing two database files from the cli
+    :param args: the args from the command line
+    """
+    if args.stream:
+        stream_diff_command(args)
+        return
+    try:
+        source = load_database_file(args.source)
+        target = load_database_file(args.target)
+        diff = diff_databases(source, target)
+        print(f"nodes: {len(diff.added_nodes)} added, {len(diff.removed_nodes)} removed, "
+              f"{len(diff.changed_nodes)} changed")
+        print(f"relationships: {len(diff.added_relationships)} added, {len(diff.removed_relationships)} removed, "
+              f"{len(diff.changed_relationships)} changed")
+        if args.output:
+            with open(args.output, "w+") as output_file:
+                FastJson.dump(export_diff_json(diff), output_file)
+    except FileNotFoundError:
+        print("File not found please make sure you entered the correct file path")
+    except (json.JSONDecodeError, ValueError):
+        print("Invalid database file")
+
+
+def stream_diff_command(args) -> None:
+    """
+    Handles diffing two database files from the cli without loading them to memory
+    :param args: the args from the command line
+    """
+    counts = Counter()
+    try:
+        with ExitStack() as stack:
+            output_file = stack.enter_context(open(args.output, "w+")) if args.output else None
+            for entry in diff_database_files(args.source, args.target, args.memory_budget * 1024 * 1024):
+                counts[entry.item_type, entry.change] += 1
+                if output_file:
+                    output_file.write(FastJson.dumps(export_diff_entry_json(entry)) + "\n")
+    except FileNotFoundError:
+        print("File not found please make sure you entered the correct file path")
+        return
+    except (json.JSONDecodeError, ValueError):
         print("Invalid database file")
+        return
+    for item_type in ("node", "relationship"):
+        print(f"{item_type}s: {counts[item_type, 'added']} added, {counts[item_type, 'removed']} removed, "
+              f"{counts[item_type, 'changed']} changed")
 
 
 def main():
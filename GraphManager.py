@@ -1,22 +1,81 @@
 import argparse
 import asyncio
 import cProfile
-import json
+import os
+import time
+from typing import AnyStr
 
 from DbInterface.Neo4jStreamAsync import Neo4jStreamAsync
-from GraphModeler import import_database_json
-from GraphModeler.DbTranformations.DbSaver import export_database_neo4j_async, delete_database_neo4j_async
+from DbInterface.Neo4jStreamNativeAsync import Neo4jStreamNativeAsync
+from DbInterface.SessionPool import DEFAULT_ACQUIRE_TIMEOUT
+from GraphModeler.DbTranformations.DbLoader import load_database_file, import_neo4j_database_async, \
+    count_neo4j_database_async
+from GraphModeler.DbTranformations.DbSaver import export_database_neo4j_async, delete_database_neo4j_async, \
+    sync_database_neo4j_async, save_database_binary
+from GraphModeler.Diff import diff_databases
+from GraphModeler.Models.Database import Database
+
+
+class ProgressReporter:
+    def __init__(self, total: int, description: AnyStr, interval: float = 1.0):
+        """
+        Prints the progress and throughput of a long running operation
+        :param total: the total amount of items
+        :param description: what is being done to the items
+        :param interval: the min seconds between prints
+        """
+        self._total = total
+        self._description = description
+        self._interval = interval
+        self._done = 0
+        self._start = time.perf_counter()
+        self._last_print = self._start
+
+    def __call__(self, count: int) -> None:
+        self._done += count
+        now = time.perf_counter()
+        if now - self._last_print >= self._interval or self._done >= self._total:
+            self._last_print = now
+            self.print()
+
+    def print(self) -> None:
+        elapsed = max(time.perf_counter() - self._start, 1e-9)
+        print(f"{self._description} {self._done}/{self._total} items "
+              f"in {elapsed:.1f}s ({self._done / elapsed:,.0f} items/s)")
 
 
 def create_arg_parser() -> argparse.ArgumentParser:
     neo4j_parser = argparse.ArgumentParser()
-    neo4j_parser.add_argument("--mode", "-m", choices=["export", "delete"], help="the mode of usage")
+    neo4j_parser.add_argument("--mode", "-m", choices=["export", "delete", "sync"],
+                              help="the mode of usage. sync only applies the differences between neo4j and the "
+                                   "database file")
     neo4j_parser.add_argument("--username", "-u", help="the neo4j server username")
     neo4j_parser.add_argument("--password", "-p", help="the neo4j server password")
     neo4j_parser.add_argument("--address", "-a", help="the neo4j server address")
-    neo4j_parser.add_argument("--database", "-d", help="a database file to load into neo4j", required=False)
+    neo4j_parser.add_argument("--database", "-d", help="a database json file or binary snapshot to load into neo4j",
+                              required=False)
     neo4j_parser.add_argument("--commit_size", "-c", help="the size of each commit to the database", required=False,
                               default=1000, type=int)
+    neo4j_parser.add_argument("--per_item", help="export with a query per node or relationship instead of "
+                                                 "batched UNWIND queries", action="store_true")
+    neo4j_parser.add_argument("--constraints", help="create node_id uniqueness constraints before exporting so "
+                                                    "relationships look up their nodes by index",
+                              action="store_true")
+    neo4j_parser.add_argument("--concurrency", help="the amount of commits in flight at a time", required=False,
+                              default=4, type=int)
+    neo4j_parser.add_argument("--backend", "-b", choices=["executor", "native"], default="executor",
+                              help="run the blocking driver in a thread pool or use the native async driver "
+                                   "(requires neo4j driver 5.0 or newer)")
+    neo4j_parser.add_argument("--pool_size", help="the max amount of sessions shared by the concurrent operations "
+                                                  "of the executor backend", required=False, type=int)
+    neo4j_parser.add_argument("--acquire_timeout", help="the max seconds to wait for a free session",
+                              default=DEFAULT_ACQUIRE_TIMEOUT, type=float)
+    neo4j_parser.add_argument("--in_transactions", action="store_true",
+                              help="delete with CALL {} IN TRANSACTIONS instead of looping over batches of "
+                                   "commit_size items (requires neo4j 4.4 or newer)")
+    neo4j_parser.add_argument("--snapshot", "-s", required=False,
+                              help="a snapshot of the last exported database. sync diffs against it instead of "
+                                   "reading neo4j when it exists, export and sync update it")
     neo4j_parser.set_defaults(func=neo4j_command)
     return neo4j_parser
 
@@ -29,15 +88,74 @@ def neo4j_command(args) -> None:
     asyncio.run(run_command(args))
 
 
+def create_stream(args):
+    """
+    Creates the async stream for the selected backend
+    :param args: the args from the command line
+    :return: the stream
+    """
+    if args.backend == "native":
+        return Neo4jStreamNativeAsync(args.address, args.username, args.password)
+    return Neo4jStreamAsync(args.address, args.username, args.password, asyncio.get_event_loop(),
+                            pool_size=args.pool_size, acquire_timeout=args.acquire_timeout)
+
+
 async def run_command(args):
-    async with Neo4jStreamAsync(args.address, args.username, args.password, asyncio.get_event_loop()) as stream:
+    async with create_stream(args) as stream:
         if args.mode == "export":
-            with open(args.database) as db_file:
-                db_json = json.load(db_file)
-            database = import_database_json(db_json)
-            await export_database_neo4j_async(database, stream, 1000)
+            database = load_database_file(args.database)
+            progress = ProgressReporter(len(database.graph.nodes) + len(database.graph.relationships), "exported")
+            await export_database_neo4j_async(database, stream, args.commit_size, not args.per_item, args.constraints,
+                                              args.concurrency, progress=progress)
+            save_snapshot(database, args.snapshot)
+        elif args.mode == "sync":
+            await sync_command(args, stream)
         elif args.mode == "delete":
-            await delete_database_neo4j_async(stream)
+            progress = None if args.in_transactions else \
+                ProgressReporter(await count_neo4j_database_async(stream), "deleted")
+            await delete_database_neo4j_async(stream, args.commit_size, args.concurrency, args.in_transactions,
+                                              progress=progress)
+            if args.snapshot and os.path.exists(args.snapshot):
+                os.remove(args.snapshot)
+        if isinstance(stream, Neo4jStreamAsync):
+            print(f"session pool: {stream.metrics}")
+
+
+async def sync_command(args, stream) -> None:
+    """
+    Syncs neo4j to the database file by applying only the differences
+    :param args: the args from the command line
+    :param stream: the stream to sync
+    """
+    target = load_database_file(args.database)
+    if args.snapshot and os.path.exists(args.snapshot):
+        source = load_database_file(args.snapshot)
+    else:
+        source = await import_neo4j_database_async(stream, target.name)
+    diff = diff_databases(source, target)
+    print(f"nodes: {len(diff.added_nodes)} added, {len(diff.removed_nodes)} removed, "
+          f"{len(diff.changed_nodes)} changed")
+    print(f"relationships: {len(diff.added_relationships)} added, {len(diff.removed_relationships)} removed, "
+          f"{len(diff.changed_relationships)} changed")
+    total = len(diff.added_nodes) + len(diff.removed_nodes) + len(diff.changed_nodes) + \
+        len(diff.added_relationships) + len(diff.removed_relationships) + 2 * len(diff.changed_relationships)
+    progress = ProgressReporter(total, "synced")
+    await sync_database_neo4j_async(diff, stream, args.commit_size, args.concurrency, progress=progress)
+    save_snapshot(target, args.snapshot)
+
+
+def save_snapshot(database: Database, path: AnyStr) -> None:
+    """
+    Saves the database that was written to neo4j as the snapshot for the next sync
+    the snapshot is replaced only after it was fully written
+    :param database: the database in neo4j
+    :param path: the snapshot path, nothing is saved if not given
+    """
+    if not path:
+        return
+    with open(f"{path}.tmp", "wb") as snapshot:
+        save_database_binary(database, snapshot)
+    os.replace(f"{path}.tmp", path)
 
 
 def run():
@@ -0,0 +1,165 @@
+"""
+A compact snapshot of a database.
+    header: magic, version, node count, relationship count, string table offset
+    nodes: id kind, 128 bit uuid or a string index, label count, node_id position, labels, properties
+    relationships: node_a index, type, node_b index, properties
+    string table: count, then every string as a length and utf-8 bytes
+every repeated string (name, labels, keys, types and string values) is written once to the string table
+"""
+import json
+import struct
+import uuid
+from typing import Any, AnyStr, Dict, IO, List, Mapping, Tuple
+
+from GraphModeler.Models.ColumnarGraph import StringTable
+
+MAGIC = b"N4JSNAP\0"
+VERSION = 1
+HEADER = struct.Struct("<8sIQQQ")
+STRING_COUNT = struct.Struct("<Q")
+LENGTH = struct.Struct("<I")
+NODE_ID = struct.Struct("<B16s")
+NODE_HEADER = struct.Struct("<HH")
+RELATIONSHIP = struct.Struct("<QIQ")
+PROPERTY = struct.Struct("<IB")
+COUNT = struct.Struct("<H")
+INDEX = struct.Struct("<I")
+INT = struct.Struct("<q")
+FLOAT = struct.Struct("<d")
+
+UUID_ID = 0
+STRING_ID = 1
+TAG_NONE, TAG_STRING, TAG_INT, TAG_FLOAT, TAG_TRUE, TAG_FALSE, TAG_JSON = range(7)
+INT_MIN, INT_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def is_binary_snapshot(path: AnyStr) -> bool:
+    """
+    Checks if a file is a binary snapshot by its magic
+    :param path: the path of the file
+    :return: whether the file is a binary snapshot
+    """
+    with open(path, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def encode_node_id(node_id: AnyStr, strings: StringTable) -> bytes:
+    """
+    Encodes a node id as 128 bits if it is a canonical uuid or as a string index otherwise
+    :param node_id: the id to encode
+    :param strings: the string table of the snapshot
+    :return: the encoded id
+    """
+    try:
+        parsed = uuid.UUID(node_id)
+        if str(parsed) == node_id:
+            return NODE_ID.pack(UUID_ID, parsed.bytes)
+    except (ValueError, AttributeError, TypeError):
+        pass
+    return NODE_ID.pack(STRING_ID, INDEX.pack(strings.index(str(node_id))))
+
+
+def decode_node_id(buffer, offset: int, strings: List[AnyStr]) -> Tuple[AnyStr, int]:
+    """
+    Decodes a node id
+    :param buffer: the snapshot buffer
+    :param offset: the offset of the id
+    :param strings: the string table of the snapshot
+    :return: the id and the offset after it
+    """
+    kind, raw = NODE_ID.unpack_from(buffer, offset)
+    if kind == UUID_ID:
+        digits = raw.hex()
+        node_id = f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+    else:
+        node_id = strings[INDEX.unpack_from(raw)[0]]
+    return node_id, offset + NODE_ID.size
+
+
+def encode_properties(properties: Mapping, strings: StringTable) -> bytes:
+    """
+    Encodes properties as a count and tagged key value pairs
+    :param properties: the properties to encode
+    :param strings: the string table of the snapshot
+    :return: the encoded properties
+    """
+    parts = [COUNT.pack(len(properties))]
+    for key, value in properties.items():
+        key_index = strings.index(key)
+        if value is None:
+            parts.append(PROPERTY.pack(key_index, TAG_NONE))
+        elif value is True or value is False:
+            parts.append(PROPERTY.pack(key_index, TAG_TRUE if value else TAG_FALSE))
+        elif isinstance(value, str):
+            parts.append(PROPERTY.pack(key_index, TAG_STRING) + INDEX.pack(strings.index(value)))
+        elif isinstance(value, int) and INT_MIN <= value <= INT_MAX:
+            parts.append(PROPERTY.pack(key_index, TAG_INT) + INT.pack(value))
+        elif isinstance(value, float):
+            parts.append(PROPERTY.pack(key_index, TAG_FLOAT) + FLOAT.pack(value))
+        else:
+            parts.append(PROPERTY.pack(key_index, TAG_JSON) + INDEX.pack(strings.index(json.dumps(value))))
+    return b"".join(parts)
+
+
+def decode_properties(buffer, offset: int, strings: List[AnyStr]) -> Tuple[Dict[AnyStr, Any], int]:
+    """
+    Decodes properties
+    :param buffer: the snapshot buffer
+    :param offset: the offset of the properties
+    :param strings: the string table of the snapshot
+    :return: the properties and the offset after them
+    """
+    count, = COUNT.unpack_from(buffer, offset)
+    offset += COUNT.size
+    properties = {}
+    if not count:
+        return properties, offset
+    for _ in range(count):
+        key_index, tag = PROPERTY.unpack_from(buffer, offset)
+        offset += PROPERTY.size
+        if tag == TAG_STRING:
+            value = strings[INDEX.unpack_from(buffer, offset)[0]]
+            offset += INDEX.size
+        elif tag == TAG_INT:
+            value, = INT.unpack_from(buffer, offset)
+            offset += INT.size
+        elif tag == TAG_FLOAT:
+            value, = FLOAT.unpack_from(buffer, offset)
+            offset += FLOAT.size
+        elif tag == TAG_JSON:
+            value = json.loads(strings[INDEX.unpack_from(buffer, offset)[0]])
+            offset += INDEX.size
+        else:
+            value = None if tag == TAG_NONE else tag == TAG_TRUE
+        properties[strings[key_index]] = value
+    return properties, offset
+
+
+def write_string_table(output: IO, strings: StringTable) -> None:
+    """
+    Writes the string table at the current position of the output
+    :param output: the binary file to write to
+    :param strings: the string table of the snapshot
+    """
+    output.write(STRING_COUNT.pack(len(strings)))
+    for value in strings.values:
+        encoded = value.encode("UTF-8")
+        output.write(LENGTH.pack(len(encoded)) + encoded)
+
+
+def read_string_table(buffer, offset: int) -> List[AnyStr]:
+    """
+    Reads the string table of a snapshot
+    :param buffer: the snapshot buffer
+    :param offset: the offset of the string table
+    :return: the strings by index
+    """
+    count, = STRING_COUNT.unpack_from(buffer, offset)
+    offset += STRING_COUNT.size
+    strings = []
+    for _ in range(count):
+        length, = LENGTH.unpack_from(buffer, offset)
+        offset += LENGTH.size
+        strings.append(buffer[offset:offset + length].decode("UTF-8"))
+        offset += length
+    return strings
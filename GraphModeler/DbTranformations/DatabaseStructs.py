@@ -0,0 +1,56 @@
+"""
+Typed msgspec structs of the database json document.
+decoding straight into the structs validates the document while decoding and skips building a dict per item.
+the structs can't form cycles so they aren't tracked by the garbage collector.
+they are only defined when msgspec is installed
+"""
+from typing import Any, AnyStr, Dict, IO, List, Union
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if msgspec is not None:
+    class NodeStruct(msgspec.Struct, gc=False):
+        node_types: Union[List[str], str]
+        properties: Dict[str, Any] = {}
+
+    class RelationshipStruct(msgspec.Struct, gc=False):
+        node_a: str
+        relationship_type: str
+        node_b: str
+        properties: Dict[str, Any] = {}
+
+    class GraphStruct(msgspec.Struct, gc=False):
+        nodes: List[NodeStruct] = []
+        relationships: List[RelationshipStruct] = []
+
+    class DatabaseStruct(msgspec.Struct, gc=False):
+        name: str
+        graph: GraphStruct
+
+    _decoder = msgspec.json.Decoder(DatabaseStruct)
+
+
+def decode_database(data: Union[AnyStr, bytes]) -> "DatabaseStruct":
+    """
+    Decodes a database json document into structs
+    IMPORTANT! requires msgspec, check msgspec is not None first
+    :param data: the json document
+    :return: the database struct
+    """
+    try:
+        return _decoder.decode(data)
+    except msgspec.ValidationError as e:
+        raise ValueError(f"Failed loading database {e}")
+
+
+def load_database(file: IO) -> "DatabaseStruct":
+    """
+    Decodes a database json file into structs
+    IMPORTANT! requires msgspec, check msgspec is not None first
+    :param file: the file to read, opened as text or binary
+    :return: the database struct
+    """
+    return decode_database(file.read())
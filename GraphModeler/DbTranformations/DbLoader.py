@@ -1,66 +1,120 @@
-from itertools import chain
-from typing import AnyStr, Dict, Optional, List, Coroutine, Awaitable
+import asyncio
+import mmap
+from typing import Any, AnyStr, Callable, Dict, Optional, List, Awaitable
 
 import neo4j
 
-from DbInterface.Neo4jStream import Neo4jStream
+try:
+    from neo4j.graph import Relationship as Neo4jRelationship
+except ImportError:
+    from neo4j import Relationship as Neo4jRelationship
+
+from DbInterface.Neo4jStream import Neo4jStream, DEFAULT_BATCH_SIZE
 from DbInterface.Neo4jStreamAsync import Neo4jStreamAsync
+from GraphModeler.DbTranformations import FastJson, DatabaseStructs
+from GraphModeler.DbTranformations.BinarySnapshot import HEADER, MAGIC, VERSION, NODE_HEADER, RELATIONSHIP, \
+    INDEX, decode_node_id, decode_properties, read_string_table, is_binary_snapshot
 from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models.ColumnarGraph import ColumnarGraph
 from GraphModeler.Models.Database import Database
 from GraphModeler.Models.Graph import Graph
 
+DEFAULT_PAGE_SIZE = 10000
+RELATIONSHIPS_PAGE_QUERY = "MATCH (n)-[r]->(m) WHERE id(r) > $last_id " \
+                           "RETURN id(r) AS id, n.node_id AS node_a, type(r) AS relationship_type, " \
+                           "m.node_id AS node_b, properties(r) AS properties " \
+                           "ORDER BY id(r) LIMIT $page_size"
+
 
-def import_neo4j_database(stream: Neo4jStream, name: AnyStr) -> Database:
+def import_neo4j_database(stream: Neo4jStream, name: AnyStr, batch_size: int = DEFAULT_BATCH_SIZE) -> Database:
     """
     Loads a graph from neo4j as a python object
+    nodes are converted and indexed batch by batch as they are fetched
     :param stream: the neo4j interface to load from
     :param name: the name of the database
+    :param batch_size: the amount of records fetched at a time
     :return: the database object representing the neo4j graph
     """
-    nodes = [import_node_neo4j(result) for result in stream.read("MATCH (n) RETURN n")]
-    nodes_by_ids = {node.node_id: node for node in nodes}
+    nodes = []
+    nodes_by_ids = {}
+    for records in stream.read_stream("MATCH (n) RETURN n", batch_size=batch_size):
+        for record in records:
+            node = import_node_neo4j(record)
+            nodes.append(node)
+            nodes_by_ids[node.node_id] = node
     relationships = import_relationships_neo4j(stream, nodes_by_ids)
     return Database(Graph(nodes, relationships), name)
 
 
-async def import_neo4j_database_async(stream: Neo4jStreamAsync, name: AnyStr) -> Database:
+async def import_neo4j_database_async(stream: Neo4jStreamAsync, name: AnyStr, batch_size: int = DEFAULT_BATCH_SIZE,
+                                      page_size: int = DEFAULT_PAGE_SIZE) -> Database:
     """
     Imports a neo4j database in an async manner for performance
+    the nodes and the relationship pages are fetched concurrently
     :param stream: the neo4j stream
     :param name: the name of the database
+    :param batch_size: the amount of node records fetched at a time
+    :param page_size: the amount of relationships in each page
     :return: the database object representing the neo4j graph
     """
-    nodes = [import_node_neo4j(result) for result in await stream.read_async("MATCH (n) RETURN n")]
-    nodes_index = nodes_by_ids_async(nodes)
-    relationships = import_relationships_neo4j_async(stream, nodes_index)
-    return Database(Graph(nodes, relationships), name)
+    nodes_index = asyncio.ensure_future(import_nodes_neo4j_async(stream, batch_size))
+    try:
+        relationships = await import_relationships_neo4j_async(stream, nodes_index, page_size)
+        nodes = await nodes_index
+    finally:
+        if not nodes_index.done():
+            nodes_index.cancel()
+            await asyncio.gather(nodes_index, return_exceptions=True)
+    return Database(Graph(list(nodes.values()), relationships), name)
 
 
-async def nodes_by_ids_async(nodes: List[Node]) -> Dict[AnyStr, Node]:
+async def import_nodes_neo4j_async(stream: Neo4jStreamAsync, batch_size: int = DEFAULT_BATCH_SIZE) -> \
+        Dict[AnyStr, Node]:
     """
-    Takes a list of nodes and indexes them by id
-    :param nodes: the nodes to index
-    :return: the index
+    Loads all nodes from neo4j in an async manner converting and indexing them batch by batch
+    :param stream: the neo4j stream
+    :param batch_size: the amount of records fetched at a time
+    :return: the nodes indexed by id in the order they were fetched
     """
-    return {node.node_id: node for node in nodes}
+    nodes_by_id = {}
+    async for records in stream.read_stream_async("MATCH (n) RETURN n", batch_size=batch_size):
+        for record in records:
+            node = import_node_neo4j(record)
+            nodes_by_id[node.node_id] = node
+    return nodes_by_id
 
 
-async def import_relationships_neo4j_async(stream: Neo4jStreamAsync, nodes_by_id: Awaitable[Dict[AnyStr, Node]]) -> \
-        List[Relationship]:
+async def import_relationships_neo4j_async(stream: Neo4jStreamAsync, nodes_by_id: Awaitable[Dict[AnyStr, Node]],
+                                           page_size: int = DEFAULT_PAGE_SIZE) -> List[Relationship]:
     """
     Loads relationships from neo4j graph into python object
+    the pages are fetched while the nodes index is still loading and resolved once it is ready
     :param stream: the neo4j stream
     :param nodes_by_id: the nodes indexed by id
-    :return: an Awaitable for the relationships
+    :param page_size: the amount of relationships in each page
+    :return: the relationships
     """
-    query_result = stream.read_async("MATCH (n)-[r]-(m) RETURN n, r, n")
-    result_relationships = {result for result in chain.from_iterable(query_result)
-                            if issubclass(type(result), neo4j.types.graph.Relationship)}
+    records = []
+    last_id = -1
+    while True:
+        page = list(await stream.read_async(RELATIONSHIPS_PAGE_QUERY, {"last_id": last_id, "page_size": page_size}))
+        records.extend(page)
+        if len(page) < page_size:
+            break
+        last_id = page[-1]["id"]
     nodes_index = await nodes_by_id
-    relationships = []
-    for relationship in result_relationships:
-        relationships.append(import_neo4j_relationship(nodes_index, relationship))
-    return relationships
+    return [import_relationship_record(nodes_index, record) for record in records]
+
+
+async def count_neo4j_database_async(stream: Neo4jStreamAsync) -> int:
+    """
+    Counts the nodes and relationships in neo4j
+    :param stream: the neo4j interface to count in
+    :return: the amount of nodes and relationships
+    """
+    nodes = await stream.read_async("MATCH (n) RETURN count(n) AS count")
+    relationships = await stream.read_async("MATCH ()-[r]->() RETURN count(r) AS count")
+    return next(iter(nodes))["count"] + next(iter(relationships))["count"]
 
 
 def import_node_neo4j(result: neo4j.Record) -> Node:
@@ -72,24 +126,38 @@ def import_node_neo4j(result: neo4j.Record) -> Node:
     return Node(list(result[0].labels), {key: value for key, value in result[0].items()})
 
 
-def import_relationships_neo4j(stream: Neo4jStream, nodes_by_id: Dict[AnyStr, Node]) -> List[Relationship]:
+def import_relationships_neo4j(stream: Neo4jStream, nodes_by_id: Dict[AnyStr, Node],
+                               page_size: int = DEFAULT_PAGE_SIZE) -> List[Relationship]:
     """
-    Loads all relationships from a neo4j result
+    Loads all relationships from neo4j. every relationship is fetched once with only its endpoint ids
+    in pages ordered by the relationship internal id
     :param stream: the neo4j stream to load the relationships from
-    :param nodes_by_id: a dict containing nodes mapped by their internal id
+    :param nodes_by_id: a dict containing nodes mapped by their node_id
+    :param page_size: the amount of relationships in each page
     :return: the relationships
     """
-    query_result = stream.read("MATCH (n)-[r]-(m) RETURN n, r, m")
-    relationships_raw = {result for result in chain.from_iterable(query_result)
-                         if isinstance(result, neo4j.Relationship)}
     relationships = []
-    for relationship in relationships_raw:
-        new_relationship = import_neo4j_relationship(nodes_by_id, relationship)
-        relationships.append(new_relationship)
-    return relationships
+    last_id = -1
+    while True:
+        records = list(stream.read(RELATIONSHIPS_PAGE_QUERY, {"last_id": last_id, "page_size": page_size}))
+        relationships.extend(import_relationship_record(nodes_by_id, record) for record in records)
+        if len(records) < page_size:
+            return relationships
+        last_id = records[-1]["id"]
+
 
+def import_relationship_record(nodes_by_id: Dict[AnyStr, Node], record: neo4j.Record) -> Relationship:
+    """
+    Imports a relationship page record to a loader relationship type
+    :param nodes_by_id: the nodes index
+    :param record: a record of the relationships page query
+    :return: the new relationship
+    """
+    return Relationship(nodes_by_id[record["node_a"]], record["relationship_type"], nodes_by_id[record["node_b"]],
+                        dict(record["properties"]))
 
-def import_neo4j_relationship(nodes_by_id: Dict[AnyStr, Node], relationship_record: neo4j.Relationship) -> Relationship:
+
+def import_neo4j_relationship(nodes_by_id: Dict[AnyStr, Node], relationship_record: Neo4jRelationship) -> Relationship:
     """
     Imports a neo4j relationship record to a loader relationship type
     :param nodes_by_id: the nodes index
@@ -147,3 +215,109 @@ def import_graph_json(graph_raw: Dict) -> Optional[Graph]:
         return graph
     except KeyError as e:
         raise ValueError(f"Failed loading graph with error cannot find key {e}")
+
+
+def import_database_struct(database_struct: "DatabaseStructs.DatabaseStruct") -> Database:
+    """
+    Loads a database from the typed structs of its json document
+    :param database_struct: the decoded database
+    :return: the database object
+    """
+    graph_struct = database_struct.graph
+    nodes = [Node(node_struct.node_types, node_struct.properties) for node_struct in graph_struct.nodes]
+    nodes_by_ids = {node.node_id: node for node in nodes}
+    try:
+        relationships = [Relationship(nodes_by_ids[rel_struct.node_a], rel_struct.relationship_type,
+                                      nodes_by_ids[rel_struct.node_b], rel_struct.properties)
+                         for rel_struct in graph_struct.relationships]
+    except KeyError as e:
+        raise ValueError(f"Failed loading graph with error cannot find node {e}")
+    return Database(Graph(nodes, relationships), database_struct.name)
+
+
+def read_binary_snapshot(path: AnyStr, add_node: Callable[[AnyStr, List[AnyStr], Dict, int], Any],
+                         add_relationship: Callable[[int, AnyStr, int, Dict], Any]) -> AnyStr:
+    """
+    Decodes a binary snapshot item by item. the file is memory mapped instead of read into memory
+    :param path: the path of the snapshot
+    :param add_node: called with the id, labels, properties without the id and the position of the id
+    in the properties of every node in order
+    :param add_relationship: called with the index of the first node, the type, the index of the second node
+    and the properties of every relationship in order
+    :return: the name of the database
+    """
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        magic, version, node_count, relationship_count, strings_offset = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} database snapshot")
+        strings = read_string_table(buffer, strings_offset)
+        offset = HEADER.size
+        label_sets = {}
+        for _ in range(node_count):
+            node_id, offset = decode_node_id(buffer, offset, strings)
+            label_count, id_position = NODE_HEADER.unpack_from(buffer, offset)
+            offset += NODE_HEADER.size
+            labels_end = offset + label_count * INDEX.size
+            raw_labels = buffer[offset:labels_end]
+            node_types = label_sets.get(raw_labels)
+            if node_types is None:
+                node_types = label_sets[raw_labels] = [strings[index] for index, in INDEX.iter_unpack(raw_labels)]
+            properties, offset = decode_properties(buffer, labels_end, strings)
+            add_node(node_id, node_types, properties, id_position)
+        for _ in range(relationship_count):
+            node_a, relationship_type, node_b = RELATIONSHIP.unpack_from(buffer, offset)
+            properties, offset = decode_properties(buffer, offset + RELATIONSHIP.size, strings)
+            add_relationship(node_a, strings[relationship_type], node_b, properties)
+    return strings[0]
+
+
+def load_database_binary(path: AnyStr) -> Database:
+    """
+    Loads a database from a binary snapshot
+    :param path: the path of the snapshot
+    :return: the database object
+    """
+    nodes = []
+    relationships = []
+
+    def add_node(node_id: AnyStr, node_types: List[AnyStr], properties: Dict, id_position: int) -> None:
+        items = list(properties.items())
+        items.insert(id_position, ("node_id", node_id))
+        nodes.append(Node(node_types, dict(items)))
+
+    def add_relationship(node_a: int, relationship_type: AnyStr, node_b: int, properties: Dict) -> None:
+        relationships.append(Relationship(nodes[node_a], relationship_type, nodes[node_b], properties))
+
+    name = read_binary_snapshot(path, add_node, add_relationship)
+    return Database(Graph(nodes, relationships), name)
+
+
+def load_columnar_binary(path: AnyStr) -> ColumnarGraph:
+    """
+    Loads the graph of a binary snapshot straight into columns without building a node or relationship object.
+    the snapshot already points relationships to their nodes by index so they are added as they are decoded
+    :param path: the path of the snapshot
+    :return: the columnar graph
+    """
+    graph = ColumnarGraph()
+
+    def add_node(node_id: AnyStr, node_types: List[AnyStr], properties: Dict, _: int) -> None:
+        graph.add_node(node_id, node_types, properties)
+
+    read_binary_snapshot(path, add_node, graph.add_relationship)
+    return graph
+
+
+def load_database_file(path: AnyStr) -> Database:
+    """
+    Loads a database from a json file or a binary snapshot by the file contents.
+    json files are decoded into typed structs when msgspec is installed
+    :param path: the path of the file
+    :return: the database object
+    """
+    if is_binary_snapshot(path):
+        return load_database_binary(path)
+    with open(path, "rb") as database_file:
+        if DatabaseStructs.msgspec is not None:
+            return import_database_struct(DatabaseStructs.load_database(database_file))
+        return import_database_json(FastJson.load(database_file))
@@ -1,59 +1,80 @@
-from typing import Callable
+from typing import Callable, Optional
 
 from Config import GlobalSettings
 from GraphModeler.Models import Relationship, Node
 from GraphModeler.Models.Database import Database
-from copy import deepcopy
+from GraphModeler.Models.OverlayGraph import OverlayGraph
+from GraphModeler.DbTranformations.PerturbationJournal import Journal, node_deletion_entry, relationship_entry, \
+    CREATE_RELATIONSHIP, DELETE_RELATIONSHIP
 import random
 
 
-def perturb_graph(database: Database, perturb_chance: float, iterations: int) -> Database:
+def perturb_graph(database: Database, perturb_chance: float, iterations: int,
+                  journal: Optional[Journal] = None) -> Database:
     """
     Takes a database and changes it small changes for testing differences between graphs
-    WARNING! This function will copy the whole database in memory, should not be used if you care about your ram usage
+    the new database graph is an overlay over the original graph that only holds the changes,
+    the original graph is shared and should not be modified while the new database is in use.
+    its adjacency index is built on the first call and reused by every later copy
     :param database: the database to change
     :param perturb_chance: the chance of a node changing or a relationship changing
     :param iterations: the amount of iterations to run over the graph
+    :param journal: called with a json entry of every change made to the graph
     :return: a new database slightly changed
     """
-    db_copy = deepcopy(database)
-    perturb_graph_reference(db_copy, perturb_chance, iterations)
+    db_copy = Database(OverlayGraph(database.graph), database.name)
+    perturb_graph_reference(db_copy, perturb_chance, iterations, journal)
     return db_copy
 
 
-def perturb_graph_reference(database: Database, perturb_chance: float, iterations: int) -> None:
+def perturb_graph_reference(database: Database, perturb_chance: float, iterations: int,
+                            journal: Optional[Journal] = None) -> int:
     """
     Takes a database and changes it small changes for testing differences between graphs
     WARNING! this function modifies the sent graph
     :param database: the database to modify
     :param perturb_chance: the chance of a node or a relationship changing
     :param iterations: the amount of iterations to run over the graph to perturb
+    :param journal: called with a json entry of every change made to the graph
+    :return: the amount of mutations applied to the graph
     """
+    if not database.graph.indexed:
+        database.graph.index_adjacency()
+    mutations = 0
     for action in [delete_random_node, create_random_relationship, delete_random_relationship]:
         for i in range(iterations):
             if perturb_chance > random.random():
-                action(database)
+                action(database, journal)
+                mutations += 1
+    return mutations
 
 
-def create_random_relationship(database: Database) -> None:
+def create_random_relationship(database: Database, journal: Optional[Journal] = None) -> None:
     """
     add a random relationship in the graph
     :param database: the database to modify
+    :param journal: called with a json entry of the change
     """
-    node_a = random.choice(database.graph.nodes)
-    node_b = random.choice(database.graph.nodes)
+    node_a = database.graph.random_node()
+    node_b = database.graph.random_node()
     rel = Relationship(node_a, GlobalSettings.TEST_GRAPH_RELATIONSHIP, node_b)
-    database.graph.relationships.append(rel)
+    database.graph.add_relationship(rel)
+    if journal:
+        journal(relationship_entry(CREATE_RELATIONSHIP, rel))
 
 
-def delete_random_node(database: Database) -> None:
+def delete_random_node(database: Database, journal: Optional[Journal] = None) -> None:
     """
     Removes a random node from the graph
     :param database: the database to remove the node from
+    :param journal: called with a json entry of every detached relationship and then of the node
     """
-    selected_node = random.choice(database.graph.nodes)
-    detach_node(database, selected_node)
-    database.graph.nodes.remove(selected_node)
+    selected_node = database.graph.random_node()
+    detached = database.graph.remove_node(selected_node)
+    if journal:
+        for rel in detached:
+            journal(relationship_entry(DELETE_RELATIONSHIP, rel, cascade=True))
+        journal(node_deletion_entry(selected_node))
 
 
 def detach_node(database: Database, node: Node) -> None:
@@ -62,13 +83,17 @@ def detach_node(database: Database, node: Node) -> None:
     :param database: the database to remove the relationships from
     :param node: the node to detach
     """
-    node_relationships = filter(lambda rel: rel.node_a == node or rel.node_b == node, database.graph.relationships)
-    database.graph.relationships = list(set(database.graph.relationships) - set(node_relationships))
+    for rel in database.graph.node_relationships(node):
+        database.graph.remove_relationship(rel)
 
 
-def delete_random_relationship(database: Database) -> None:
+def delete_random_relationship(database: Database, journal: Optional[Journal] = None) -> None:
     """
-    Removes a random node from the graph
-    :param database: the database to remove the node from
+    Removes a random relationship from the graph
+    :param database: the database to remove the relationship from
+    :param journal: called with a json entry of the change
     """
-    database.graph.relationships.remove(random.choice(database.graph.relationships))
+    rel = database.graph.random_relationship()
+    database.graph.remove_relationship(rel)
+    if journal:
+        journal(relationship_entry(DELETE_RELATIONSHIP, rel))
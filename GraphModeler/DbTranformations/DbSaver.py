@@ -1,13 +1,37 @@
 import asyncio
-from typing import Dict, Iterable, List, Any, Callable, AnyStr
+from collections import defaultdict
+from functools import partial
+from itertools import islice
+from typing import Dict, Iterable, List, Any, Callable, AnyStr, Tuple, Optional, IO, Mapping
+
+from neo4j.exceptions import ClientError
 
 from DbInterface import Neo4jStream
 from DbInterface.Neo4jStreamAsync import Neo4jStreamAsync
-from GraphModeler.DbTranformations.QuerySticher import create_node_query, create_relationship_query
-
+from DbInterface.TransactionPipeline import run_transactions_async, TransactionWork, DEFAULT_CONCURRENCY, \
+    DEFAULT_RETRIES, retry_async
+from GraphModeler.DbTranformations import FastJson
+from GraphModeler.DbTranformations.BinarySnapshot import HEADER, MAGIC, VERSION, NODE_HEADER, RELATIONSHIP, \
+    INDEX, encode_node_id, encode_properties, write_string_table
+from GraphModeler.DbTranformations.QuerySticher import create_node_query, create_relationship_query, \
+    create_nodes_batch_query, create_relationships_batch_query, create_node_id_constraint_query, \
+    delete_nodes_batch_query, update_nodes_batch_query, delete_relationships_batch_query, \
+    add_relationships_batch_query
+from GraphModeler.Diff.GraphDiff import GraphDiff
 from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models.ColumnarGraph import StringTable
 from GraphModeler.Models.Database import Database
 from GraphModeler.Models.Graph import Graph
+from GraphModeler.Models.QueryConverter import Query
+
+DEFAULT_WRITE_SIZE = 1000
+EXISTING_SCHEMA_ERROR_SUFFIX = "AlreadyExists"
+DEFAULT_DELETE_BATCH_SIZE = 10000
+DELETE_RELATIONSHIPS_BATCH_QUERY = "MATCH ()-[r]->() WHERE id(r) % $partitions = $partition " \
+                                   "WITH r LIMIT $batch_size DELETE r RETURN count(r) AS deleted"
+DELETE_NODES_BATCH_QUERY = "MATCH (n) WHERE id(n) % $partitions = $partition " \
+                           "WITH n LIMIT $batch_size DETACH DELETE n RETURN count(n) AS deleted"
+DELETE_IN_TRANSACTIONS_QUERY = "MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF $batch_size ROWS"
 
 
 def chunks(chunks_source, chunk_size):
@@ -21,13 +45,24 @@ def chunks(chunks_source, chunk_size):
         yield chunks_source[i:i + chunk_size]
 
 
+def query_arguments(query: Query) -> Tuple[AnyStr, Optional[Dict]]:
+    """
+    Converts the result of a query function to the arguments of a run call
+    :param query: either a query string or a (query, parameters) pair
+    :return: the query and its parameters
+    """
+    if isinstance(query, tuple):
+        return query
+    return query, None
+
+
 def export_node_json(node: Node) -> Dict:
     """
     Converts a node to json for serialization
     :param node: the node to convert
     :return: a dict representing the node
     """
-    return {"node_types": node.node_types, "properties": node.properties}
+    return {"node_types": node.node_types, "properties": dict(node.properties)}
 
 
 def export_relationship_json(rel: Relationship) -> Dict:
@@ -37,7 +72,7 @@ def export_relationship_json(rel: Relationship) -> Dict:
     :return: a dict representing the relationship
     """
     return {"node_a": rel.node_a.node_id, "relationship_type": rel.relationship_type, "node_b": rel.node_b.node_id,
-            "properties": rel.properties}
+            "properties": dict(rel.properties)}
 
 
 def export_graph_json(graph: Graph) -> Dict:
@@ -61,72 +96,507 @@ def export_database_json(database: Database) -> Dict:
     return {"name": database.name, "graph": export_graph_json(database.graph)}
 
 
-def export_database_neo4j(database: Database, stream: Neo4jStream, commit_size: int) -> None:
+def write_database_json(output: IO, name: AnyStr, nodes: Iterable[Node], relationships: Iterable[Relationship],
+                        write_size: int = DEFAULT_WRITE_SIZE) -> None:
+    """
+    Writes a database json document item by item from iterators so the whole graph never has to be in memory.
+    the document holds the same values as export_database_json, encoded with orjson or msgspec when available
+    :param output: the text file to write to
+    :param name: the name of the database
+    :param nodes: the nodes to write
+    :param relationships: the relationships to write, written after all of the nodes
+    :param write_size: the amount of items encoded before each write
+    """
+    output.write(f'{{"name": {FastJson.dumps(name)}, "graph": {{"nodes": [')
+    write_json_items(output, map(export_node_json, nodes), write_size)
+    output.write('], "relationships": [')
+    write_json_items(output, map(export_relationship_json, relationships), write_size)
+    output.write("]}}")
+
+
+def save_database_json(database: Database, output: IO) -> None:
+    """
+    Writes a database to a json file without building the whole json document in memory
+    :param database: the database to save
+    :param output: the text file to write to
+    """
+    write_database_json(output, database.name, database.graph.nodes, database.graph.relationships)
+
+
+def write_database_binary(output: IO, name: AnyStr, nodes: Iterable[Node],
+                          relationships: Iterable[Relationship]) -> None:
+    """
+    Writes a database as a binary snapshot item by item from iterators.
+    relationships point to their nodes by index so the index of every node id is kept while writing,
+    use write_indexed_database_binary when the relationships already know the indexes of their nodes
+    :param output: the seekable binary file to write to
+    :param name: the name of the database
+    :param nodes: the nodes to write
+    :param relationships: the relationships to write, their nodes must be in the nodes
+    """
+    node_indexes = {}
+
+    def indexed_nodes():
+        for node in nodes:
+            node_indexes[node.node_id] = len(node_indexes)
+            yield node
+
+    rows = ((node_indexes[rel.node_a.node_id], rel.relationship_type, node_indexes[rel.node_b.node_id],
+             rel.properties) for rel in relationships)
+    write_indexed_database_binary(output, name, indexed_nodes(), rows)
+
+
+def write_indexed_database_binary(output: IO, name: AnyStr, nodes: Iterable[Node],
+                                  relationships: Iterable[Tuple[int, AnyStr, int, Mapping]]) -> None:
+    """
+    Writes a database as a binary snapshot from iterators of nodes and of relationship rows.
+    node ids are kept as 128 bits and the strings are written once in a table at the end of the file.
+    IMPORTANT! the table of distinct strings (labels, keys, types, string values and non uuid ids) stays in memory
+    until the end, so the output only streams when the strings repeat
+    :param output: the seekable binary file to write to
+    :param name: the name of the database
+    :param nodes: the nodes to write
+    :param relationships: rows of the index of the first node, the type, the index of the second node
+    and the properties, written after all of the nodes
+    """
+    strings = StringTable()
+    strings.index(name)
+    start = output.tell()
+    output.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0))
+    node_count = 0
+    for node in nodes:
+        keys = [key for key in node.properties if key != "node_id"]
+        id_position = list(node.properties).index("node_id") if "node_id" in node.properties else len(keys)
+        output.write(encode_node_id(node.node_id, strings) + NODE_HEADER.pack(len(node.labels), id_position) +
+                     b"".join(INDEX.pack(strings.index(node_type)) for node_type in node.labels) +
+                     encode_properties({key: node[key] for key in keys}, strings))
+        node_count += 1
+    relationship_count = 0
+    for node_a, relationship_type, node_b, properties in relationships:
+        output.write(RELATIONSHIP.pack(node_a, strings.index(relationship_type), node_b) +
+                     encode_properties(properties, strings))
+        relationship_count += 1
+    strings_offset = output.tell() - start
+    write_string_table(output, strings)
+    end = output.tell()
+    output.seek(start)
+    output.write(HEADER.pack(MAGIC, VERSION, node_count, relationship_count, strings_offset))
+    output.seek(end)
+
+
+def save_database_binary(database: Database, output: IO) -> None:
+    """
+    Writes a database to a binary snapshot
+    :param database: the database to save
+    :param output: the seekable binary file to write to
+    """
+    write_database_binary(output, database.name, database.graph.nodes, database.graph.relationships)
+
+
+def write_json_items(output: IO, items: Iterable[Any], write_size: int = DEFAULT_WRITE_SIZE) -> None:
+    """
+    Writes the items of a json array separated by commas without the brackets
+    :param output: the text file to write to
+    :param items: the json items to write
+    :param write_size: the amount of items encoded before each write
+    """
+    items = iter(items)
+    separator = ""
+    while True:
+        chunk = list(islice(items, write_size))
+        if not chunk:
+            return
+        output.write(separator + FastJson.dumps(chunk)[1:-1])
+        separator = ", "
+
+
+def export_diff_json(diff: GraphDiff) -> Dict:
+    """
+    Converts a graph diff to json. changed items are saved as their source and target versions
+    :param diff: the diff to convert
+    :return: a dict representing the diff
+    """
+    return {"nodes": {"added": [export_node_json(node) for node in diff.added_nodes],
+                      "removed": [export_node_json(node) for node in diff.removed_nodes],
+                      "changed": [{"source": export_node_json(source), "target": export_node_json(target)}
+                                  for source, target in diff.changed_nodes]},
+            "relationships": {"added": [export_relationship_json(rel) for rel in diff.added_relationships],
+                              "removed": [export_relationship_json(rel) for rel in diff.removed_relationships],
+                              "changed": [{"source": export_relationship_json(source),
+                                           "target": export_relationship_json(target)}
+                                          for source, target in diff.changed_relationships]}}
+
+
+def node_batches(nodes: Iterable[Node]) -> Dict[AnyStr, List[Dict]]:
+    """
+    Groups nodes into batch queries by their types and property keys
+    :param nodes: the nodes to group
+    :return: the rows of each batch mapped by the batch query
+    """
+    groups = defaultdict(list)
+    for node in nodes:
+        groups[node.labels, tuple(node.properties)].append(dict(node.properties))
+    return {create_nodes_batch_query(node_types, keys): rows for (node_types, keys), rows in groups.items()}
+
+
+def relationship_batches(relationships: Iterable[Relationship],
+                         query_function: Callable[..., AnyStr] = create_relationships_batch_query) -> \
+        Dict[AnyStr, List[Dict]]:
+    """
+    Groups relationships into batch queries by their type, endpoint types and property keys
+    :param relationships: the relationships to group
+    :param query_function: creates the batch query from the types and property keys of a group
+    :return: the rows of each batch mapped by the batch query
+    """
+    groups = defaultdict(list)
+    for rel in relationships:
+        key = (rel.node_a.labels, rel.relationship_type, rel.node_b.labels, tuple(rel.properties))
+        groups[key].append({"node_a": rel.node_a.node_id, "node_b": rel.node_b.node_id,
+                            "properties": dict(rel.properties)})
+    return {query_function(*key): rows for key, rows in groups.items()}
+
+
+def relationship_deletion_batches(relationships: Iterable[Relationship]) -> Dict[AnyStr, List[Dict]]:
+    """
+    Groups relationships into batch deletion queries by their type and endpoint types.
+    copies with the same nodes and properties are merged into a single row counting them
+    so only as many parallel relationships as were given are deleted
+    :param relationships: the relationships to delete
+    :return: the rows of each batch mapped by the batch query
+    """
+    groups = defaultdict(list)
+    rows_by_nodes = {}
+    for rel in relationships:
+        properties = dict(rel.properties)
+        rows = rows_by_nodes.setdefault((rel.node_a.node_id, rel.relationship_type, rel.node_b.node_id), [])
+        for row in rows:
+            if row["properties"] == properties:
+                row["count"] += 1
+                break
+        else:
+            row = {"node_a": rel.node_a.node_id, "node_b": rel.node_b.node_id, "properties": properties, "count": 1}
+            rows.append(row)
+            groups[rel.node_a.labels, rel.relationship_type, rel.node_b.labels].append(row)
+    return {delete_relationships_batch_query(*key): rows for key, rows in groups.items()}
+
+
+def node_deletion_batches(nodes: Iterable[Node]) -> Dict[AnyStr, List[Dict]]:
+    """
+    Groups nodes into batch deletion queries by their types
+    :param nodes: the nodes to delete
+    :return: the rows of each batch mapped by the batch query
+    """
+    groups = defaultdict(list)
+    for node in nodes:
+        groups[node.labels].append({"node_id": node.node_id})
+    return {delete_nodes_batch_query(node_types): rows for node_types, rows in groups.items()}
+
+
+def node_update_batches(changed_nodes: Iterable[Tuple[Node, Node]]) -> Dict[AnyStr, List[Dict]]:
+    """
+    Groups changed nodes into batch update queries by their source and target types
+    :param changed_nodes: (source, target) pairs of the changed nodes
+    :return: the rows of each batch mapped by the batch query
+    """
+    groups = defaultdict(list)
+    for source, target in changed_nodes:
+        groups[source.labels, target.labels].append({"node_id": target.node_id,
+                                                              "properties": dict(target.properties)})
+    return {update_nodes_batch_query(*key): rows for key, rows in groups.items()}
+
+
+def diff_batches(diff: GraphDiff) -> List[Dict[AnyStr, List[Dict]]]:
+    """
+    Converts a diff to batch queries in the order they need to run in.
+    relationships are deleted first, then nodes are deleted, updated and created and then relationships are created.
+    a changed relationship is deleted with its source properties and created with its target properties.
+    relationships are directed and every removed or added relationship deletes or creates exactly one copy
+    :param diff: the differences to apply
+    :return: the batches of every step, each step should finish before the next one starts
+    """
+    return [relationship_deletion_batches(diff.removed_relationships +
+                                          [source for source, _ in diff.changed_relationships]),
+            node_deletion_batches(diff.removed_nodes),
+            node_update_batches(diff.changed_nodes),
+            node_batches(diff.added_nodes),
+            relationship_batches(diff.added_relationships + [target for _, target in diff.changed_relationships],
+                                 add_relationships_batch_query)]
+
+
+def sync_database_neo4j(diff: GraphDiff, stream: Neo4jStream, commit_size: int) -> None:
+    """
+    Applies the differences between the neo4j contents and a target database instead of exporting all of it
+    :param diff: the differences between the current neo4j contents and the target
+    :param stream: the neo4j interface to use
+    :param commit_size: how many items to change in each commit
+    """
+    for batches in diff_batches(diff):
+        export_batches_to_graph(batches, stream, commit_size)
+
+
+async def sync_database_neo4j_async(diff: GraphDiff, stream: Neo4jStreamAsync, commit_size: int,
+                                    concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+                                    progress: Optional[Callable[[int], None]] = None) -> None:
+    """
+    Applies the differences between the neo4j contents and a target database in an async manner
+    the commits of every step run concurrently, each step starts after the previous one is done
+    :param diff: the differences between the current neo4j contents and the target
+    :param stream: the stream to write to
+    :param commit_size: how many items to change in each commit
+    :param concurrency: the max amount of commits in flight
+    :param retries: how many times to retry a commit on transient errors such as deadlocks
+    :param progress: called with the amount of items in every finished commit
+    """
+    for batches in diff_batches(diff):
+        await run_transactions_async(stream, batch_works(batches, commit_size), concurrency, retries, progress)
+
+
+def batch_chunks(batches: Dict[AnyStr, List[Dict]], commit_size: int) -> Iterable[Tuple[AnyStr, List[Dict]]]:
+    """
+    Splits batches into chunks of rows
+    :param batches: the rows of each batch mapped by the batch query
+    :param commit_size: the amount of rows in each chunk
+    :return: an iterable of (query, rows) chunks
+    """
+    for query, rows in batches.items():
+        for chunk in chunks(rows, commit_size):
+            yield query, chunk
+
+
+def node_types_of(nodes: Iterable[Node]) -> List[AnyStr]:
+    """
+    Finds all of the node types used in the nodes
+    :param nodes: the nodes to look through
+    :return: the distinct node types
+    """
+    return list(dict.fromkeys(node_type for node in nodes for node_type in node.labels))
+
+
+def create_node_id_constraints(database: Database, stream: Neo4jStream) -> None:
+    """
+    Creates a uniqueness constraint on node_id for every node type in the database
+    so nodes can be matched by their id with an index lookup. existing constraints are kept
+    :param database: the database to create the constraints for
+    :param stream: the neo4j interface to use
+    """
+    for node_type in node_types_of(database.graph.nodes):
+        try:
+            stream.write(create_node_id_constraint_query(node_type)).consume()
+        except ClientError as error:
+            raise_unless_existing_schema(error)
+
+
+async def create_node_id_constraints_async(database: Database, stream: Neo4jStreamAsync) -> None:
+    """
+    Creates a uniqueness constraint on node_id for every node type in the database in an async manner
+    :param database: the database to create the constraints for
+    :param stream: the stream to create the constraints in
+    """
+    for node_type in node_types_of(database.graph.nodes):
+        try:
+            await stream.write_async(create_node_id_constraint_query(node_type))
+        except ClientError as error:
+            raise_unless_existing_schema(error)
+
+
+def raise_unless_existing_schema(error: ClientError) -> None:
+    """
+    Ignores the errors of creating a constraint or index that already exists and raises anything else
+    :param error: the error of the schema query
+    """
+    if not (error.code or "").endswith(EXISTING_SCHEMA_ERROR_SUFFIX):
+        raise error
+
+
+def export_database_neo4j(database: Database, stream: Neo4jStream, commit_size: int, batched: bool = True,
+                          create_constraints: bool = False) -> None:
     """
     Loads a database from an object into neo4j
     :param database: the database to load
     :param stream: the neo4j interface to use
     :param commit_size: how many nodes or relationships to write to the database before commiting
+    :param batched: whether to write each commit as a single UNWIND query instead of a query per item
+    :param create_constraints: whether to create node_id uniqueness constraints before writing
     """
-    export_objects_to_graph(database.graph.nodes, stream, commit_size, create_node_query)
-    export_objects_to_graph(database.graph.relationships, stream, commit_size, create_relationship_query)
+    if create_constraints:
+        create_node_id_constraints(database, stream)
+    if batched:
+        export_batches_to_graph(node_batches(database.graph.nodes), stream, commit_size)
+        export_batches_to_graph(relationship_batches(database.graph.relationships), stream, commit_size)
+    else:
+        export_objects_to_graph(database.graph.nodes, stream, commit_size,
+                                partial(create_node_query, parameterized=True))
+        export_objects_to_graph(database.graph.relationships, stream, commit_size,
+                                partial(create_relationship_query, parameterized=True))
 
 
-async def export_database_neo4j_async(database: Database, stream: Neo4jStreamAsync, commit_size: int) -> None:
+async def export_database_neo4j_async(database: Database, stream: Neo4jStreamAsync, commit_size: int,
+                                      batched: bool = True, create_constraints: bool = False,
+                                      concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+                                      progress: Optional[Callable[[int], None]] = None) -> None:
     """
     Exports a database object to neo4j in an async manner
+    keeps several commits in flight at a time. all of the nodes are written before the relationships start
     :param database: the database to export
     :param stream: the stream to export to
     :param commit_size: the size of each commit to the database
+    :param batched: whether to write each commit as a single UNWIND query instead of a query per item
+    :param create_constraints: whether to create node_id uniqueness constraints before writing
+    :param concurrency: the max amount of commits in flight
+    :param retries: how many times to retry a commit on transient errors such as deadlocks
+    :param progress: called with the amount of items in every finished commit
+    """
+    if create_constraints:
+        await create_node_id_constraints_async(database, stream)
+    pipeline = partial(run_transactions_async, stream, concurrency=concurrency, retries=retries, progress=progress)
+    if batched:
+        await pipeline(batch_works(node_batches(database.graph.nodes), commit_size))
+        await pipeline(batch_works(relationship_batches(database.graph.relationships), commit_size))
+    else:
+        await pipeline(object_works(database.graph.nodes, commit_size,
+                                    partial(create_node_query, parameterized=True)))
+        await pipeline(object_works(database.graph.relationships, commit_size,
+                                    partial(create_relationship_query, parameterized=True)))
+
+
+def export_batches_to_graph(batches: Dict[AnyStr, List[Dict]], stream: Neo4jStream, commit_size: int) -> None:
+    """
+    Writes batches to a neo4j stream sending each commit as a single parameterized query
+    :param batches: the rows of each batch mapped by the batch query
+    :param stream: the neo4j stream to write to
+    :param commit_size: the amount of rows in each commit
+    """
+    for query, rows in batch_chunks(batches, commit_size):
+        with stream.transaction() as transaction:
+            transaction.run(query, {"rows": rows})
+
+
+def batch_works(batches: Dict[AnyStr, List[Dict]], commit_size: int) -> Iterable[Tuple[int, TransactionWork]]:
+    """
+    Converts batches to transaction works for the async pipeline, each commit is a single parameterized query
+    :param batches: the rows of each batch mapped by the batch query
+    :param commit_size: the amount of rows in each commit
+    :return: an iterable of (item count, transaction work)
+    """
+    for query, rows in batch_chunks(batches, commit_size):
+        async def work(transaction, batch_query=query, batch_rows=rows):
+            await transaction.run(batch_query, {"rows": batch_rows})
+
+        yield len(rows), work
+
+
+def object_works(items: List[Any], commit_size: int, query_function: Callable[[Any], Query]) -> \
+        Iterable[Tuple[int, TransactionWork]]:
     """
-    await export_objects_to_graph_async(database.graph.nodes, stream, commit_size, create_node_query)
-    await export_objects_to_graph_async(database.graph.relationships, stream, commit_size, create_relationship_query)
+    Converts items to transaction works for the async pipeline, each item is written with its own query
+    :param items: the items to export
+    :param commit_size: the size of each commit to the graph
+    :param query_function: the query function to convert the object to a neo4j query or a (query, parameters) pair
+    :return: an iterable of (item count, transaction work)
+    """
+    for chunk in chunks(items, commit_size):
+        async def work(transaction, chunk_items=chunk):
+            for item in chunk_items:
+                await transaction.run(*query_arguments(query_function(item)))
+
+        yield len(chunk), work
+
+
+async def export_batches_to_graph_async(batches: Dict[AnyStr, List[Dict]], stream: Neo4jStreamAsync,
+                                        commit_size: int, concurrency: int = DEFAULT_CONCURRENCY) -> None:
+    """
+    Writes batches to the graph in an async manner sending each commit as a single parameterized query
+    :param batches: the rows of each batch mapped by the batch query
+    :param stream: the graph to export to
+    :param commit_size: the amount of rows in each commit
+    :param concurrency: the max amount of commits in flight
+    """
+    await run_transactions_async(stream, batch_works(batches, commit_size), concurrency)
 
 
 async def export_objects_to_graph_async(items: List[Any], stream: Neo4jStreamAsync, commit_size: int,
-                                        query_function: Callable[[Any], AnyStr]) -> None:
+                                        query_function: Callable[[Any], Query],
+                                        concurrency: int = DEFAULT_CONCURRENCY) -> None:
     """
     Exports a list of object to the graph in an async manner
     :param items: the items to export
     :param stream: the graph to export to
     :param commit_size: the size of each commit to the graph
-    :param query_function: the query function to convert the object to a neo4j query
+    :param query_function: the query function to convert the object to a neo4j query or a (query, parameters) pair
+    :param concurrency: the max amount of commits in flight
     """
-    for chunk in chunks(items, commit_size):
-        async with stream.transaction() as transaction:
-            for item in chunk:
-                await transaction.run(query_function(item))
+    await run_transactions_async(stream, object_works(items, commit_size, query_function), concurrency)
 
 
 def export_objects_to_graph(objects: List[Any], stream: Neo4jStream, commit_size: int,
-                            query_function: Callable[[Any], AnyStr]) -> None:
+                            query_function: Callable[[Any], Query]) -> None:
     """
     Writes an object to a neo4j stream converting it to a neo4j query using the supplied function
     :param objects: the source objects to write to neo4j
     :param stream: the neo4j stream to write to
     :param commit_size: the size of each objects commit
-    :param query_function: the function to convert the object to a neo4j query
+    :param query_function: the function to convert the object to a neo4j query or a (query, parameters) pair
     """
     for chunk in chunks(objects, commit_size):
         with stream.transaction() as transaction:
             for item in chunk:
-                transaction.run(query_function(item))
+                transaction.run(*query_arguments(query_function(item)))
 
 
-def delete_database_neo4j(stream: Neo4jStream):
+def delete_database_neo4j(stream: Neo4jStream, batch_size: int = DEFAULT_DELETE_BATCH_SIZE,
+                          in_transactions: bool = False, progress: Optional[Callable[[int], None]] = None) -> None:
     """
-    Deletes a neo4j database
+    Deletes a neo4j database in batches so no single transaction has to hold the whole graph.
+    the relationships are deleted before the nodes so a node with many relationships doesn't make a huge commit
     WARNING! THIS WILL DELETE THE DATABASE IN NEO4J PERMANENTLY
-    :param stream:
-    :return:
+    :param stream: the stream to delete the database from
+    :param batch_size: the amount of nodes or relationships deleted in each commit
+    :param in_transactions: whether to let neo4j split the deletion with CALL {} IN TRANSACTIONS (neo4j 4.4 or newer)
+    instead of looping over LIMIT queries. progress isn't reported in this mode
+    :param progress: called with the amount of items deleted in every commit
     """
-    stream.write("MATCH (n) DETACH DELETE n")
+    if in_transactions:
+        stream.write(DELETE_IN_TRANSACTIONS_QUERY, {"batch_size": batch_size})
+        return
+    for query in (DELETE_RELATIONSHIPS_BATCH_QUERY, DELETE_NODES_BATCH_QUERY):
+        deleted = batch_size
+        while deleted == batch_size:
+            result = stream.write(query, {"batch_size": batch_size, "partitions": 1, "partition": 0})
+            deleted = next(iter(result))["deleted"]
+            if progress:
+                progress(deleted)
 
 
-async def delete_database_neo4j_async(stream: Neo4jStreamAsync) -> None:
+async def delete_database_neo4j_async(stream: Neo4jStreamAsync, batch_size: int = DEFAULT_DELETE_BATCH_SIZE,
+                                      concurrency: int = 1, in_transactions: bool = False,
+                                      retries: int = DEFAULT_RETRIES,
+                                      progress: Optional[Callable[[int], None]] = None) -> None:
     """
-    Deletes a neo4j database in an async manner
+    Deletes a neo4j database in batches in an async manner.
+    with concurrency above one the items are split into partitions by their internal id and
+    every partition is deleted in its own loop of batches
     WARNING! THIS WILL DELETE THE NEO4J CONTENTS PERMANENTLY
     :param stream: the stream to delete the database from
+    :param batch_size: the amount of nodes or relationships deleted in each commit
+    :param concurrency: the amount of partitions deleted in parallel
+    :param in_transactions: whether to let neo4j split the deletion with CALL {} IN TRANSACTIONS (neo4j 4.4 or newer)
+    instead of looping over LIMIT queries. progress isn't reported in this mode
+    :param retries: how many times to retry a batch on transient errors such as deadlocks
+    :param progress: called with the amount of items deleted in every commit
     """
-    await stream.write_async("MATCH (n) DETACH DELETE n")
+    if in_transactions:
+        await stream.write_async(DELETE_IN_TRANSACTIONS_QUERY, {"batch_size": batch_size})
+        return
+    partitions = max(1, concurrency)
+
+    async def delete_partition(query: AnyStr, partition: int) -> None:
+        parameters = {"batch_size": batch_size, "partitions": partitions, "partition": partition}
+        deleted = batch_size
+        while deleted == batch_size:
+            records = await retry_async(lambda: stream.write_async(query, parameters), retries)
+            deleted = next(iter(records))["deleted"]
+            if progress:
+                progress(deleted)
+
+    for batch_query in (DELETE_RELATIONSHIPS_BATCH_QUERY, DELETE_NODES_BATCH_QUERY):
+        await asyncio.gather(*(delete_partition(batch_query, partition) for partition in range(partitions)))
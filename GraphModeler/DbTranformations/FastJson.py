@@ -0,0 +1,77 @@
+"""
+json encoding and decoding through orjson or msgspec when one of them is installed, falling back to the json module.
+the encoded documents are compact and hold the same values as json.dumps
+"""
+import gc
+import json
+from typing import Any, AnyStr, IO
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+elif msgspec is not None:
+    BACKEND = "msgspec"
+else:
+    BACKEND = "json"
+
+
+def dumps(value: Any) -> AnyStr:
+    """
+    Encodes a value as a json string
+    :param value: the value to encode
+    :return: the json string
+    """
+    if orjson is not None:
+        return orjson.dumps(value).decode("UTF-8")
+    if msgspec is not None:
+        return msgspec.json.encode(value).decode("UTF-8")
+    return json.dumps(value)
+
+
+def loads(data: AnyStr) -> Any:
+    """
+    Decodes a json string or bytes
+    :param data: the json to decode
+    :return: the decoded value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        return msgspec.json.decode(data)
+    return json.loads(data)
+
+
+def load(file: IO) -> Any:
+    """
+    Decodes a whole json file, the file can be opened as text or binary.
+    the garbage collector is paused while decoding since the decoded containers can't form cycles
+    and collecting while millions of them are created takes about half of the decoding time
+    :param file: the file to read
+    :return: the decoded value
+    """
+    data = file.read()
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return loads(data)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def dump(value: Any, file: IO) -> None:
+    """
+    Encodes a value to a text file
+    :param value: the value to encode
+    :param file: the file to write to
+    """
+    file.write(dumps(value))
@@ -0,0 +1,125 @@
+import json
+from typing import Any, AnyStr, IO, Iterator, Tuple
+
+GRAPH_SECTIONS = ("nodes", "relationships")
+DEFAULT_CHUNK_SIZE = 1 << 16
+_WHITESPACE = " \t\n\r"
+
+
+class JsonStreamReader:
+    def __init__(self, file: IO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Reads a database json file incrementally without loading the whole document to memory
+        :param file: a text file to read from
+        :param chunk_size: how many characters to read from the file at a time
+        """
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def iter_database(self) -> Iterator[Tuple[AnyStr, Any]]:
+        """
+        Iterates over a database json document in file order
+        :return: an iterator of ("name", name), ("nodes", node_raw) and ("relationships", relationship_raw) pairs
+        """
+        self._expect("{")
+        for key in self._iter_object_keys():
+            if key == "graph":
+                yield from self._iter_graph()
+            elif key == "name":
+                yield key, self._decode_value()
+            else:
+                self._decode_value()
+
+    def _iter_graph(self) -> Iterator[Tuple[AnyStr, Any]]:
+        self._expect("{")
+        for key in self._iter_object_keys():
+            if key in GRAPH_SECTIONS:
+                for item in self._iter_array():
+                    yield key, item
+            else:
+                self._decode_value()
+
+    def _iter_object_keys(self) -> Iterator[AnyStr]:
+        if self._peek() == "}":
+            self._position += 1
+            return
+        while True:
+            key = self._decode_value()
+            self._expect(":")
+            yield key
+            if self._next_separator("}"):
+                return
+
+    def _iter_array(self) -> Iterator[Any]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._position += 1
+            return
+        while True:
+            yield self._decode_value()
+            if self._next_separator("]"):
+                return
+
+    def _next_separator(self, closing: AnyStr) -> bool:
+        """
+        Consumes the separator after a value
+        :param closing: the character closing the current container
+        :return: true if the container was closed
+        """
+        char = self._peek()
+        self._position += 1
+        if char == closing:
+            return True
+        if char != ",":
+            raise ValueError(f"Invalid database json expected ',' or '{closing}' but found {char!r}")
+        return False
+
+    def _decode_value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+                # a number at the end of the buffer might continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._position = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def _expect(self, char: AnyStr) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Invalid database json expected {char!r} but found {found!r}")
+        self._position += 1
+
+    def _peek(self) -> AnyStr:
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in _WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if self._eof:
+                raise ValueError("Invalid database json unexpected end of file")
+            self._fill()
+
+    def _fill(self) -> None:
+        chunk = self._file.read(self._chunk_size)
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        self._eof = not chunk
+
+
+def iter_database_json(file: IO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[AnyStr, Any]]:
+    """
+    Reads a database json file incrementally
+    :param file: the file to read from
+    :param chunk_size: how many characters to read from the file at a time
+    :return: an iterator of (section, raw item) pairs in file order
+    """
+    return JsonStreamReader(file, chunk_size).iter_database()
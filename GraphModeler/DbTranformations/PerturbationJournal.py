@@ -0,0 +1,151 @@
+from collections import defaultdict
+from typing import AnyStr, Callable, Dict, Iterable, Iterator, IO, List, Optional
+
+from DbInterface import Neo4jStream
+from GraphModeler.DbTranformations import FastJson
+from GraphModeler.DbTranformations.DbLoader import import_node_json
+from GraphModeler.DbTranformations.DbSaver import export_node_json, export_relationship_json, export_objects_to_graph
+from GraphModeler.DbTranformations.QuerySticher import delete_node_query, add_relationship_query, \
+    delete_single_relationship_query
+from GraphModeler.Diff.GraphDiff import GraphDiff
+from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models.Database import Database
+from GraphModeler.Models.QueryConverter import Query
+
+Journal = Callable[[Dict], None]
+DELETE_NODE = "delete_node"
+DELETE_RELATIONSHIP = "delete_relationship"
+CREATE_RELATIONSHIP = "create_relationship"
+
+
+def node_deletion_entry(node: Node) -> Dict:
+    """
+    Creates a journal entry of a deleted node
+    :param node: the deleted node
+    :return: the json entry
+    """
+    return {"action": DELETE_NODE, "node": export_node_json(node)}
+
+
+def relationship_entry(action: AnyStr, rel: Relationship, cascade: bool = False) -> Dict:
+    """
+    Creates a journal entry of a created or deleted relationship
+    the endpoint types are kept so the entry can be replayed against neo4j on its own
+    :param action: either CREATE_RELATIONSHIP or DELETE_RELATIONSHIP
+    :param rel: the relationship
+    :param cascade: whether the relationship was deleted because one of its nodes was deleted
+    :return: the json entry
+    """
+    return {"action": action, "relationship": export_relationship_json(rel),
+            "node_a_types": rel.node_a.node_types, "node_b_types": rel.node_b.node_types,
+            "cascade": cascade}
+
+
+def write_journal(journal_file: IO) -> Journal:
+    """
+    Creates a journal writing every entry as a json line
+    :param journal_file: the file to write to
+    :return: the journal function
+    """
+    return lambda entry: journal_file.write(FastJson.dumps(entry) + "\n")
+
+
+def read_journal(journal_file: IO) -> Iterator[Dict]:
+    """
+    Reads a json lines journal
+    :param journal_file: the file to read from
+    :return: an iterator of the journal entries in order
+    """
+    for line in journal_file:
+        if line.strip():
+            yield FastJson.loads(line)
+
+
+def entry_relationship(entry: Dict, nodes: Optional[Dict[AnyStr, Node]] = None) -> Relationship:
+    """
+    Loads the relationship of a journal entry
+    :param entry: the journal entry
+    :param nodes: the nodes to connect mapped by id, endpoint nodes with only an id are created if not given
+    :return: the relationship
+    """
+    raw = entry["relationship"]
+    if nodes is None:
+        node_a = Node(entry["node_a_types"], {"node_id": raw["node_a"]})
+        node_b = Node(entry["node_b_types"], {"node_id": raw["node_b"]})
+    else:
+        node_a, node_b = nodes[raw["node_a"]], nodes[raw["node_b"]]
+    return Relationship(node_a, raw["relationship_type"], node_b, raw["properties"])
+
+
+def apply_journal(database: Database, entries: Iterable[Dict]) -> None:
+    """
+    Applies journal entries to a database in memory. cascaded deletions are applied by their node deletion
+    WARNING! this function modifies the sent graph
+    :param database: the database the journal was recorded on
+    :param entries: the journal entries in order
+    """
+    graph = database.graph
+    if not graph.indexed:
+        graph.index_adjacency()
+    nodes = {node.node_id: node for node in graph.nodes}
+    for entry in entries:
+        if entry["action"] == DELETE_NODE:
+            graph.remove_node(nodes.pop(entry["node"]["properties"]["node_id"]))
+        elif entry["action"] == CREATE_RELATIONSHIP:
+            graph.add_relationship(entry_relationship(entry, nodes))
+        elif not entry["cascade"]:
+            rel = entry_relationship(entry, nodes)
+            graph.remove_relationship(next(current for current in graph.outgoing(rel.node_a)
+                                           if current == rel and current.properties == rel.properties))
+
+
+def journal_diff(entries: Iterable[Dict]) -> GraphDiff:
+    """
+    Calculates the net differences a journal recorded, a relationship created and deleted later cancels out.
+    used as the ground truth of a perturbation when testing the differs
+    :param entries: the journal entries in order
+    :return: the differences between the graph before and after the journal
+    """
+    diff = GraphDiff()
+    added: Dict[tuple, List[Relationship]] = defaultdict(list)
+    for entry in entries:
+        if entry["action"] == DELETE_NODE:
+            diff.removed_nodes.append(import_node_json(entry["node"]))
+            continue
+        rel = entry_relationship(entry)
+        key = rel.node_a.node_id, rel.relationship_type, rel.node_b.node_id
+        if entry["action"] == CREATE_RELATIONSHIP:
+            added[key].append(rel)
+        elif added[key]:
+            added[key].pop()
+        else:
+            diff.removed_relationships.append(rel)
+    diff.added_relationships = [rel for relationships in added.values() for rel in relationships]
+    return diff
+
+
+def journal_query(entry: Dict) -> Query:
+    """
+    Converts a journal entry to a parameterized neo4j query.
+    relationships are directed, a creation adds exactly one relationship and a deletion removes exactly one copy
+    :param entry: the journal entry, cascaded deletions are expected to be filtered out
+    :return: a (query, parameters) pair
+    """
+    if entry["action"] == DELETE_NODE:
+        node = Node(entry["node"]["node_types"], {"node_id": entry["node"]["properties"]["node_id"]})
+        return delete_node_query(node, parameterized=True)
+    if entry["action"] == CREATE_RELATIONSHIP:
+        return add_relationship_query(entry_relationship(entry))
+    return delete_single_relationship_query(entry_relationship(entry))
+
+
+def replay_journal_neo4j(entries: Iterable[Dict], stream: Neo4jStream, commit_size: int) -> None:
+    """
+    Replays a journal against a neo4j database as an incremental update instead of a full export.
+    cascaded relationship deletions are skipped since deleting their node detaches them
+    :param entries: the journal entries in order
+    :param stream: the neo4j stream to write to
+    :param commit_size: the amount of entries in each commit
+    """
+    entries = [entry for entry in entries if not entry.get("cascade")]
+    export_objects_to_graph(entries, stream, commit_size, journal_query)
@@ -1,42 +1,202 @@
-from typing import AnyStr
+from typing import AnyStr, Sequence
 
 from GraphModeler.Models import Node, Relationship
-from GraphModeler.Models.QueryConverter import node_query, relationship_nodes_query, relationship_query, \
-    generate_properties
+from GraphModeler.Models.QueryConverter import node_query, relationship_endpoints_query, relationship_query, \
+    properties_query, escape_name, row_properties, node_id_query, Query, ParameterizedQuery
 
 
-def create_node_query(node: Node) -> AnyStr:
+def create_node_query(node: Node, parameterized: bool = False) -> Query:
     """
     Takes a node and convert it to a query for generating a node in neo4j
     :param node: the node to convert
+    :param parameterized: whether to return a (query, parameters) pair with $param placeholders instead of literals
     :return: the query string for creating the node
     """
+    if parameterized:
+        query, parameters = node_query(node, parameterized=True)
+        return f"MERGE {query}", parameters
     return f"MERGE {node_query(node)}"
 
 
-def delete_node_query(node: Node) -> AnyStr:
+def delete_node_query(node: Node, parameterized: bool = False) -> Query:
     """
     Takes a node and converts it to a query to delete it in neo4j
     :param node: the node to delete
+    :param parameterized: whether to return a (query, parameters) pair with $param placeholders instead of literals
     :return: the query string for deleting the node
     """
+    if parameterized:
+        query, parameters = node_query(node, 'n', parameterized=True)
+        return f"MATCH {query} DETACH DELETE n", parameters
     return f"MATCH {node_query(node, 'n')} DETACH DELETE n"
 
 
-def create_relationship_query(rel: Relationship) -> AnyStr:
+def create_relationship_query(rel: Relationship, parameterized: bool = False) -> Query:
     """
     Takes a relationship and converts it to a neo4j query representing the same
     :param rel: the relationship to convert
+    :param parameterized: whether to return a (query, parameters) pair with $param placeholders instead of literals
     :return: the query string for creating the relationship
     """
-    return f"MATCH {relationship_nodes_query(rel)} MERGE {relationship_query(rel)}"
+    if parameterized:
+        nodes, nodes_parameters = relationship_endpoints_query(rel, parameterized=True)
+        relationship, relationship_parameters = relationship_query(rel, parameterized=True)
+        return f"MATCH {nodes} MERGE {relationship}", {**nodes_parameters, **relationship_parameters}
+    return f"MATCH {relationship_endpoints_query(rel)} MERGE {relationship_query(rel)}"
 
 
-def delete_relationship_query(rel: Relationship) -> AnyStr:
+def delete_relationship_query(rel: Relationship, parameterized: bool = False) -> Query:
     """
     Takes a relationship and converts it to a neo4j query deleting it
     :param rel: the relationship to delete
+    :param parameterized: whether to return a (query, parameters) pair with $param placeholders instead of literals
     :return: the query string for deleting the relationship
     """
-    return f"MATCH ({node_query(rel.node_a, 'a')})-[r:{rel.relationship_type} {generate_properties(rel)}]-({node_query(rel.node_b, 'b')}) DELETE r"
+    if parameterized:
+        node_a, node_a_parameters = node_id_query(rel.node_a, 'a', parameterized=True)
+        node_b, node_b_parameters = node_id_query(rel.node_b, 'b', parameterized=True)
+    else:
+        node_a, node_b = node_id_query(rel.node_a, 'a'), node_id_query(rel.node_b, 'b')
+        node_a_parameters = node_b_parameters = {}
+    properties, rel_parameters = properties_query(rel, 'r', parameterized) if rel.properties else ("", {})
+    relationship = f"r:{rel.relationship_type} {properties}" if properties else f"r:{rel.relationship_type}"
+    query = f"MATCH {node_a}-[{relationship}]-{node_b} DELETE r"
+    return (query, {**node_a_parameters, **node_b_parameters, **rel_parameters}) if parameterized else query
 
+
+def add_relationship_query(rel: Relationship) -> ParameterizedQuery:
+    """
+    Takes a relationship and converts it to a neo4j query adding it as a new directed relationship
+    unlike create_relationship_query a reverse or parallel relationship that already exists doesn't prevent it
+    :param rel: the relationship to add
+    :return: a (query, parameters) pair for adding the relationship
+    """
+    nodes, parameters = relationship_endpoints_query(rel, parameterized=True)
+    query = f"MATCH {nodes} CREATE (nodeA)-[r:{escape_name(rel.relationship_type)}]->(nodeB) SET r = $properties"
+    return query, {**parameters, "properties": dict(rel.properties)}
+
+
+def delete_single_relationship_query(rel: Relationship) -> ParameterizedQuery:
+    """
+    Takes a relationship and converts it to a neo4j query deleting exactly one directed relationship
+    with the same nodes, type and properties. reverse relationships and other parallel copies are kept
+    :param rel: the relationship to delete
+    :return: a (query, parameters) pair for deleting the relationship
+    """
+    node_a, node_a_parameters = node_id_query(rel.node_a, 'a', parameterized=True)
+    node_b, node_b_parameters = node_id_query(rel.node_b, 'b', parameterized=True)
+    query = f"MATCH {node_a}-[r:{escape_name(rel.relationship_type)}]->{node_b} " \
+            f"WHERE properties(r) = $properties WITH r LIMIT 1 DELETE r"
+    return query, {**node_a_parameters, **node_b_parameters, "properties": dict(rel.properties)}
+
+
+def create_nodes_batch_query(node_types: Sequence[AnyStr], property_keys: Sequence[AnyStr]) -> AnyStr:
+    """
+    Creates a parameterized query for merging a batch of nodes sharing the same types and property keys
+    the query expects a $rows parameter of the nodes properties
+    :param node_types: the types of the nodes in the batch
+    :param property_keys: the property keys of the nodes in the batch
+    :return: the query string for creating the nodes
+    """
+    labels = ":".join(escape_name(node_type) for node_type in node_types)
+    return f"UNWIND $rows AS row MERGE (n:{labels} {row_properties(property_keys)})"
+
+
+def create_relationships_batch_query(node_a_types: Sequence[AnyStr], relationship_type: AnyStr,
+                                     node_b_types: Sequence[AnyStr], property_keys: Sequence[AnyStr]) -> AnyStr:
+    """
+    Creates a parameterized query for merging a batch of relationships sharing the same type, endpoint types and
+    property keys. the query expects a $rows parameter of {"node_a": id, "node_b": id, "properties": {...}} rows
+    :param node_a_types: the types of the first node of the relationships
+    :param relationship_type: the type of the relationships
+    :param node_b_types: the types of the second node of the relationships
+    :param property_keys: the property keys of the relationships
+    :return: the query string for creating the relationships
+    """
+    labels_a = ":".join(escape_name(node_type) for node_type in node_a_types)
+    labels_b = ":".join(escape_name(node_type) for node_type in node_b_types)
+    properties = f" {row_properties(property_keys, 'row.properties')}" if property_keys else ""
+    return f"UNWIND $rows AS row MATCH (nodeA:{labels_a} {{node_id: row.node_a}}), " \
+           f"(nodeB:{labels_b} {{node_id: row.node_b}}) " \
+           f"MERGE (nodeA)-[r:{escape_name(relationship_type)}{properties}]-(nodeB)"
+
+
+def delete_nodes_batch_query(node_types: Sequence[AnyStr]) -> AnyStr:
+    """
+    Creates a parameterized query for deleting a batch of nodes sharing the same types by their ids
+    the query expects a $rows parameter of {"node_id": id} rows
+    :param node_types: the types of the nodes in the batch
+    :return: the query string for deleting the nodes
+    """
+    labels = ":".join(escape_name(node_type) for node_type in node_types)
+    return f"UNWIND $rows AS row MATCH (n:{labels} {{node_id: row.node_id}}) DETACH DELETE n"
+
+
+def update_nodes_batch_query(source_types: Sequence[AnyStr], target_types: Sequence[AnyStr]) -> AnyStr:
+    """
+    Creates a parameterized query for replacing the types and properties of a batch of nodes found by their ids
+    the query expects a $rows parameter of {"node_id": id, "properties": {...}} rows
+    :param source_types: the current types of the nodes in the batch
+    :param target_types: the new types of the nodes in the batch
+    :return: the query string for updating the nodes
+    """
+    labels = ":".join(escape_name(node_type) for node_type in source_types)
+    query = f"UNWIND $rows AS row MATCH (n:{labels} {{node_id: row.node_id}})"
+    removed = [escape_name(node_type) for node_type in source_types if node_type not in target_types]
+    added = [escape_name(node_type) for node_type in target_types if node_type not in source_types]
+    if removed:
+        query += f" REMOVE n:{':'.join(removed)}"
+    if added:
+        query += f" SET n:{':'.join(added)}"
+    return query + " SET n = row.properties"
+
+
+def add_relationships_batch_query(node_a_types: Sequence[AnyStr], relationship_type: AnyStr,
+                                  node_b_types: Sequence[AnyStr], property_keys: Sequence[AnyStr]) -> AnyStr:
+    """
+    Creates a parameterized query for adding a batch of directed relationships sharing the same type, endpoint types
+    and property keys. unlike create_relationships_batch_query every row creates a new relationship even if a
+    reverse or parallel one already exists. the query expects the same rows as create_relationships_batch_query
+    :param node_a_types: the types of the first node of the relationships
+    :param relationship_type: the type of the relationships
+    :param node_b_types: the types of the second node of the relationships
+    :param property_keys: the property keys of the relationships
+    :return: the query string for adding the relationships
+    """
+    labels_a = ":".join(escape_name(node_type) for node_type in node_a_types)
+    labels_b = ":".join(escape_name(node_type) for node_type in node_b_types)
+    properties = f" {row_properties(property_keys, 'row.properties')}" if property_keys else ""
+    return f"UNWIND $rows AS row MATCH (nodeA:{labels_a} {{node_id: row.node_a}}), " \
+           f"(nodeB:{labels_b} {{node_id: row.node_b}}) " \
+           f"CREATE (nodeA)-[r:{escape_name(relationship_type)}{properties}]->(nodeB)"
+
+
+def delete_relationships_batch_query(node_a_types: Sequence[AnyStr], relationship_type: AnyStr,
+                                     node_b_types: Sequence[AnyStr]) -> AnyStr:
+    """
+    Creates a parameterized query for deleting a batch of directed relationships sharing the same type and endpoint
+    types. the query expects a $rows parameter of {"node_a": id, "node_b": id, "properties": {...}, "count": n} rows,
+    each row deletes up to count relationships with exactly these properties so parallel copies not in the row are kept
+    IMPORTANT! rows should be distinct, two rows of the same relationship may both match the same copy
+    :param node_a_types: the types of the first node of the relationships
+    :param relationship_type: the type of the relationships
+    :param node_b_types: the types of the second node of the relationships
+    :return: the query string for deleting the relationships
+    """
+    labels_a = ":".join(escape_name(node_type) for node_type in node_a_types)
+    labels_b = ":".join(escape_name(node_type) for node_type in node_b_types)
+    return f"UNWIND $rows AS row CALL {{ WITH row MATCH (nodeA:{labels_a} {{node_id: row.node_a}})" \
+           f"-[r:{escape_name(relationship_type)}]->(nodeB:{labels_b} {{node_id: row.node_b}}) " \
+           f"WHERE properties(r) = row.properties RETURN collect(r)[..row.count] AS matched }} " \
+           f"UNWIND matched AS r DELETE r"
+
+
+def create_node_id_constraint_query(node_type: AnyStr) -> AnyStr:
+    """
+    Creates a query for a uniqueness constraint on the node_id of a node type.
+    the constraint is backed by an index so matching nodes by id doesn't scan the label
+    IMPORTANT! the syntax of neo4j 4.0 has no IF NOT EXISTS, running it for an existing constraint raises a ClientError
+    :param node_type: the node type to constrain
+    :return: the query string for creating the constraint
+    """
+    return f"CREATE CONSTRAINT ON (n:{escape_name(node_type)}) ASSERT n.node_id IS UNIQUE"
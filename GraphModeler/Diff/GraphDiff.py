@@ -0,0 +1,39 @@
+from dataclasses import dataclass, field
+from typing import AnyStr, Dict, List, Optional, Tuple
+
+from GraphModeler.Models import Node, Relationship
+
+
+@dataclass
+class GraphDiff:
+    """
+    The differences between a source graph and a target graph
+    changed items are kept as (source, target) pairs
+    """
+    added_nodes: List[Node] = field(default_factory=list)
+    removed_nodes: List[Node] = field(default_factory=list)
+    changed_nodes: List[Tuple[Node, Node]] = field(default_factory=list)
+    added_relationships: List[Relationship] = field(default_factory=list)
+    removed_relationships: List[Relationship] = field(default_factory=list)
+    changed_relationships: List[Tuple[Relationship, Relationship]] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        """
+        Checks whether the two graphs were identical
+        :return: true if no differences were found
+        """
+        return not (self.added_nodes or self.removed_nodes or self.changed_nodes or
+                    self.added_relationships or self.removed_relationships or self.changed_relationships)
+
+
+@dataclass
+class DiffEntry:
+    """
+    A single difference found while streaming a diff
+    item_type is either node or relationship and change is either added, removed or changed
+    the items are kept in their json form
+    """
+    item_type: AnyStr
+    change: AnyStr
+    source: Optional[Dict] = None
+    target: Optional[Dict] = None
@@ -0,0 +1,223 @@
+from collections import defaultdict
+from typing import AnyStr, Dict, Iterable, List, Sequence, Set, Tuple
+
+from GraphModeler.Diff.GraphDiff import GraphDiff
+from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models.ColumnarGraph import ColumnarGraph, PropertyColumns, MISSING
+from GraphModeler.Models.Database import Database
+from GraphModeler.Models.Graph import Graph
+
+RelationshipKey = Tuple[AnyStr, AnyStr, AnyStr]
+
+
+def relationship_key(rel: Relationship) -> RelationshipKey:
+    """
+    Generates the key a relationship is matched by when diffing
+    :param rel: the relationship to generate the key for
+    :return: a tuple of (node_a id, relationship type, node_b id)
+    """
+    return rel.node_a.node_id, rel.relationship_type, rel.node_b.node_id
+
+
+def index_nodes(nodes: Iterable[Node]) -> Dict[AnyStr, Node]:
+    """
+    Indexes nodes by their id
+    :param nodes: the nodes to index
+    :return: the nodes mapped by id
+    """
+    return {node.node_id: node for node in nodes}
+
+
+def index_relationships(relationships: Iterable[Relationship]) -> Dict[RelationshipKey, List[Relationship]]:
+    """
+    Indexes relationships by their key. parallel relationships with the same key are kept in order
+    :param relationships: the relationships to index
+    :return: the relationships mapped by key
+    """
+    index = defaultdict(list)
+    for rel in relationships:
+        index[relationship_key(rel)].append(rel)
+    return index
+
+
+def diff_databases(source: Database, target: Database) -> GraphDiff:
+    """
+    Finds the differences between two databases
+    :param source: the original database
+    :param target: the database to compare against the original
+    :return: the differences needed to turn source into target
+    """
+    return diff_graphs(source.graph, target.graph)
+
+
+def diff_graphs(source: Graph, target: Graph) -> GraphDiff:
+    """
+    Finds the differences between two graphs in O(N+E) by matching nodes by id and relationships by key
+    :param source: the original graph
+    :param target: the graph to compare against the original
+    :return: the differences needed to turn source into target
+    """
+    diff = GraphDiff()
+    diff_nodes(source.nodes, target.nodes, diff)
+    diff_relationships(source.relationships, target.relationships, diff)
+    return diff
+
+
+def diff_nodes(source: Iterable[Node], target: Iterable[Node], diff: GraphDiff) -> None:
+    """
+    Adds the node differences between two node collections to a diff
+    :param source: the original nodes
+    :param target: the nodes to compare against the original
+    :param diff: the diff to fill
+    """
+    source_index = index_nodes(source)
+    target_index = index_nodes(target)
+    for node_id, source_node in source_index.items():
+        target_node = target_index.get(node_id)
+        if target_node is None:
+            diff.removed_nodes.append(source_node)
+        elif source_node.labels != target_node.labels or source_node.properties != target_node.properties:
+            diff.changed_nodes.append((source_node, target_node))
+    diff.added_nodes.extend(node for node_id, node in target_index.items() if node_id not in source_index)
+
+
+def diff_relationships(source: Iterable[Relationship], target: Iterable[Relationship], diff: GraphDiff) -> None:
+    """
+    Adds the relationship differences between two relationship collections to a diff
+    :param source: the original relationships
+    :param target: the relationships to compare against the original
+    :param diff: the diff to fill
+    """
+    source_index = index_relationships(source)
+    target_index = index_relationships(target)
+    for key, source_relationships in source_index.items():
+        target_relationships = target_index.get(key, [])
+        for source_rel, target_rel in zip(source_relationships, target_relationships):
+            if source_rel.properties != target_rel.properties:
+                diff.changed_relationships.append((source_rel, target_rel))
+        diff.removed_relationships.extend(source_relationships[len(target_relationships):])
+    for key, target_relationships in target_index.items():
+        diff.added_relationships.extend(target_relationships[len(source_index.get(key, [])):])
+
+
+def diff_columnar_graphs(source: ColumnarGraph, target: ColumnarGraph) -> GraphDiff:
+    """
+    Finds the differences between two columnar graphs comparing the matched rows column by column
+    so no dict is built per row, only the nodes and relationships that differ are materialized as objects
+    :param source: the original graph
+    :param target: the graph to compare against the original
+    :return: the differences needed to turn source into target
+    """
+    diff = GraphDiff()
+    diff_columnar_nodes(source, target, diff)
+    diff_columnar_relationships(source, target, diff)
+    return diff
+
+
+def diff_columnar_nodes(source: ColumnarGraph, target: ColumnarGraph, diff: GraphDiff) -> None:
+    """
+    Adds the node differences between two columnar graphs to a diff, nodes are matched by id
+    :param source: the original graph
+    :param target: the graph to compare against the original
+    :param diff: the diff to fill
+    """
+    source_rows, target_rows = [], []
+    for source_row, node_id in enumerate(source.node_ids):
+        target_row = target.node_index.get(node_id)
+        if target_row is None:
+            diff.removed_nodes.append(source.node(source_row))
+        else:
+            source_rows.append(source_row)
+            target_rows.append(target_row)
+    changed = changed_rows(source.node_properties, target.node_properties, source_rows, target_rows)
+    source_labels = [source.node_labels[row] for row in source_rows]
+    target_labels = [target.node_labels[row] for row in target_rows]
+    for position, (source_label, target_label) in enumerate(zip(source_labels, target_labels)):
+        if source.label_sets.values[source_label] != target.label_sets.values[target_label]:
+            changed.add(position)
+    diff.changed_nodes.extend((source.node(source_rows[position]), target.node(target_rows[position]))
+                              for position in sorted(changed))
+    diff.added_nodes.extend(target.node(index) for node_id, index in target.node_index.items()
+                            if node_id not in source.node_index)
+
+
+def diff_columnar_relationships(source: ColumnarGraph, target: ColumnarGraph, diff: GraphDiff) -> None:
+    """
+    Adds the relationship differences between two columnar graphs to a diff.
+    relationships are matched by key and parallel relationships by their order
+    :param source: the original graph
+    :param target: the graph to compare against the original
+    :param diff: the diff to fill
+    """
+    source_keys = numbered_keys(list(source.relationship_keys()))
+    target_keys = numbered_keys(list(target.relationship_keys()))
+    source_rows, target_rows = [], []
+    for key, source_row in source_keys.items():
+        target_row = target_keys.get(key)
+        if target_row is None:
+            diff.removed_relationships.append(columnar_relationship(source, source_row))
+        else:
+            source_rows.append(source_row)
+            target_rows.append(target_row)
+    changed = changed_rows(source.relationship_properties, target.relationship_properties, source_rows, target_rows)
+    diff.changed_relationships.extend((columnar_relationship(source, source_rows[position]),
+                                       columnar_relationship(target, target_rows[position]))
+                                      for position in sorted(changed))
+    diff.added_relationships.extend(columnar_relationship(target, row) for key, row in target_keys.items()
+                                    if key not in source_keys)
+
+
+def columnar_relationship(graph: ColumnarGraph, row: int) -> Relationship:
+    """
+    Builds the relationship object of a row
+    :param graph: the graph holding the row
+    :param row: the row of the relationship
+    :return: the relationship
+    """
+    return Relationship(graph.node(graph.sources[row]), graph.relationship_types.values[graph.types[row]],
+                        graph.node(graph.targets[row]), graph.relationship_properties.row(row))
+
+
+def numbered_keys(keys: List[RelationshipKey]) -> Dict[Tuple, int]:
+    """
+    Maps every relationship key to its row so parallel relationships are matched in order.
+    the first occurrence of a key is mapped as is and the later ones as (key, occurrence)
+    :param keys: the relationship keys by row
+    :return: the row of every key
+    """
+    rows = {key: row for row, key in enumerate(keys)}
+    if len(rows) == len(keys):
+        return rows
+    rows = {}
+    occurrences = defaultdict(int)
+    for row, key in enumerate(keys):
+        occurrence = occurrences[key]
+        rows[(key, occurrence) if occurrence else key] = row
+        occurrences[key] += 1
+    return rows
+
+
+def changed_rows(source: PropertyColumns, target: PropertyColumns, source_rows: Sequence[int],
+                 target_rows: Sequence[int]) -> Set[int]:
+    """
+    Compares the properties of matched rows one key column at a time instead of building a dict per row
+    :param source: the original property columns
+    :param target: the property columns to compare against the original
+    :param source_rows: the matched rows in source
+    :param target_rows: the rows in target matched to source_rows by position
+    :return: the positions of the matched rows whose properties differ
+    """
+    changed = set()
+    for key in source.columns.keys() | target.columns.keys():
+        source_values = _column_values(source, key, source_rows)
+        target_values = _column_values(target, key, target_rows)
+        changed.update(position for position, (source_value, target_value)
+                       in enumerate(zip(source_values, target_values)) if source_value != target_value)
+    return changed
+
+
+def _column_values(columns: PropertyColumns, key: AnyStr, rows: Sequence[int]) -> List:
+    column = columns.columns.get(key)
+    if column is None:
+        return [MISSING] * len(rows)
+    return [column[row] for row in rows]
@@ -0,0 +1,222 @@
+import math
+import os
+import tempfile
+import zlib
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from typing import Any, AnyStr, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from GraphModeler.DbTranformations import FastJson
+from GraphModeler.DbTranformations.JsonStreamLoader import iter_database_json
+from GraphModeler.Diff.GraphDiff import DiffEntry
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+# parsed json items take several times the space of their text
+JSON_EXPANSION_FACTOR = 8
+MAX_PARTITIONS = 4096
+# partition files written at once, a file with more partitions is split in several passes over it
+MAX_OPEN_PARTITIONS = 256
+NODE_ENTRY = "n"
+RELATIONSHIP_ENTRY = "r"
+
+
+def raw_node_id(node_raw: Dict) -> AnyStr:
+    """
+    Gets the id of a node in its json form
+    :param node_raw: the node json
+    :return: the node id
+    """
+    try:
+        return node_raw["properties"]["node_id"]
+    except KeyError as e:
+        raise ValueError(f"Cannot diff a node without an id missing key {e}")
+
+
+def raw_relationship_key(relationship_raw: Dict) -> Tuple[AnyStr, AnyStr, AnyStr]:
+    """
+    Gets the key of a relationship in its json form
+    :param relationship_raw: the relationship json
+    :return: a tuple of (node_a id, relationship type, node_b id)
+    """
+    return relationship_raw["node_a"], relationship_raw["relationship_type"], relationship_raw["node_b"]
+
+
+def partitions_for_budget(paths: Iterable[AnyStr], memory_budget: int) -> int:
+    """
+    Calculates how many partitions the files should be split to so a single partition fits in the memory budget
+    :param paths: the database files to diff
+    :param memory_budget: the memory budget in bytes
+    :return: the number of partitions
+    """
+    largest = max(os.path.getsize(path) for path in paths)
+    return min(MAX_PARTITIONS, max(1, math.ceil(largest * JSON_EXPANSION_FACTOR / memory_budget)))
+
+
+def open_partitions_limit() -> int:
+    """
+    Calculates how many partition files can be open at once while staying well below the open files limit
+    :return: the max amount of partition files to write in a single pass
+    """
+    if resource is None:
+        return MAX_OPEN_PARTITIONS
+    soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft_limit == resource.RLIM_INFINITY:
+        return MAX_OPEN_PARTITIONS
+    return max(1, min(MAX_OPEN_PARTITIONS, soft_limit // 4))
+
+
+def diff_database_files(source_path: AnyStr, target_path: AnyStr, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                        work_dir: Optional[AnyStr] = None) -> Iterator[DiffEntry]:
+    """
+    Finds the differences between two database json files without loading both graphs to memory.
+    The files are hash partitioned on disk by node id and relationship key so only a single partition of the
+    source is kept in memory at a time
+    :param source_path: the original database file
+    :param target_path: the database file to compare against the original
+    :param memory_budget: the amount of memory in bytes a single partition is allowed to take
+    :param work_dir: a directory for the partition files, defaults to the system temp directory
+    :return: an iterator of the differences as they are found
+    """
+    partitions = partitions_for_budget((source_path, target_path), memory_budget)
+    if partitions == 1:
+        with open(source_path) as source_file, open(target_path) as target_file:
+            yield from diff_entries(database_entries(source_file), database_entries(target_file))
+        return
+    with tempfile.TemporaryDirectory(dir=work_dir) as partitions_dir:
+        source_parts = partition_database_file(source_path, os.path.join(partitions_dir, "source"), partitions)
+        target_parts = partition_database_file(target_path, os.path.join(partitions_dir, "target"), partitions)
+        for source_part, target_part in zip(source_parts, target_parts):
+            with open(source_part) as source_file, open(target_part) as target_file:
+                yield from diff_entries(partition_entries(source_file), partition_entries(target_file))
+            os.remove(source_part)
+            os.remove(target_part)
+
+
+def database_entries(file) -> Iterator[Tuple[AnyStr, Dict]]:
+    """
+    Streams the nodes and relationships of a database json file as partition entries
+    :param file: the database file
+    :return: an iterator of (entry type, raw item) pairs
+    """
+    for section, item in iter_database_json(file):
+        if section == "nodes":
+            yield NODE_ENTRY, item
+        elif section == "relationships":
+            yield RELATIONSHIP_ENTRY, item
+
+
+def partition_entries(file) -> Iterator[Tuple[AnyStr, Dict]]:
+    """
+    Reads the entries of a partition file
+    :param file: the partition file
+    :return: an iterator of (entry type, raw item) pairs
+    """
+    for line in file:
+        entry_type, item = FastJson.loads(line)
+        yield entry_type, item
+
+
+def entry_partition(entry_type: AnyStr, item: Dict, partitions: int) -> int:
+    """
+    Finds the partition an entry belongs to. uses a stable hash so both files are partitioned the same way
+    :param entry_type: the entry type
+    :param item: the raw item
+    :param partitions: the number of partitions
+    :return: the partition index
+    """
+    if entry_type == NODE_ENTRY:
+        key = raw_node_id(item)
+    else:
+        key = "\0".join(raw_relationship_key(item))
+    return zlib.crc32(key.encode("UTF-8")) % partitions
+
+
+def partition_database_file(path: AnyStr, prefix: AnyStr, partitions: int,
+                            open_limit: Optional[int] = None) -> List[AnyStr]:
+    """
+    Splits a database json file into json lines partition files.
+    when there are more partitions than can be open at once the file is read once per group of partitions
+    :param path: the database file to split
+    :param prefix: the path prefix of the partition files
+    :param partitions: the number of partitions
+    :param open_limit: the max amount of partition files open at once, defaults to a share of the open files limit
+    :return: the partition file paths
+    """
+    paths = [f"{prefix}.{index}.jsonl" for index in range(partitions)]
+    open_limit = open_limit or open_partitions_limit()
+    for first in range(0, partitions, open_limit):
+        last = min(partitions, first + open_limit)
+        with ExitStack() as stack, open(path) as database_file:
+            outputs = [stack.enter_context(open(part_path, "w")) for part_path in paths[first:last]]
+            for entry_type, item in database_entries(database_file):
+                partition = entry_partition(entry_type, item, partitions)
+                if first <= partition < last:
+                    outputs[partition - first].write(FastJson.dumps([entry_type, item]) + "\n")
+    return paths
+
+
+def normalized_node_types(node_raw: Dict) -> List[AnyStr]:
+    """
+    Gets the types of a node in its json form the same way a node object would hold them
+    :param node_raw: the node json
+    :return: the node types as a list
+    """
+    node_types = node_raw["node_types"]
+    return node_types if isinstance(node_types, list) else [node_types]
+
+
+def diff_entries(source: Iterable[Tuple[AnyStr, Dict]], target: Iterable[Tuple[AnyStr, Dict]]) -> \
+        Iterator[DiffEntry]:
+    """
+    Diffs two entry streams by indexing the source and streaming the target over it
+    :param source: the original entries
+    :param target: the entries to compare against the original
+    :return: an iterator of the differences
+    """
+    nodes: Dict[AnyStr, Dict] = {}
+    relationships: Dict[Tuple, Deque[Dict]] = defaultdict(deque)
+    for entry_type, item in source:
+        if entry_type == NODE_ENTRY:
+            nodes[raw_node_id(item)] = item
+        else:
+            relationships[raw_relationship_key(item)].append(item)
+    for entry_type, item in target:
+        if entry_type == NODE_ENTRY:
+            source_node = nodes.pop(raw_node_id(item), None)
+            if source_node is None:
+                yield DiffEntry("node", "added", target=item)
+            elif normalized_node_types(source_node) != normalized_node_types(item) \
+                    or source_node["properties"] != item["properties"]:
+                yield DiffEntry("node", "changed", source_node, item)
+        else:
+            matching = relationships.get(raw_relationship_key(item))
+            if not matching:
+                yield DiffEntry("relationship", "added", target=item)
+                continue
+            source_relationship = matching.popleft()
+            if (source_relationship.get("properties") or {}) != (item.get("properties") or {}):
+                yield DiffEntry("relationship", "changed", source_relationship, item)
+    for node in nodes.values():
+        yield DiffEntry("node", "removed", source=node)
+    for remaining in relationships.values():
+        for relationship in remaining:
+            yield DiffEntry("relationship", "removed", source=relationship)
+
+
+def export_diff_entry_json(entry: DiffEntry) -> Dict[AnyStr, Any]:
+    """
+    Converts a diff entry to json for writing as json lines
+    :param entry: the entry to convert
+    :return: a dict representing the entry
+    """
+    entry_json = {"item_type": entry.item_type, "change": entry.change}
+    if entry.source is not None:
+        entry_json["source"] = entry.source
+    if entry.target is not None:
+        entry_json["target"] = entry.target
+    return entry_json
@@ -0,0 +1,3 @@
+from GraphModeler.Diff.GraphDiff import GraphDiff, DiffEntry
+from GraphModeler.Diff.GraphDiffer import diff_databases, diff_graphs, diff_columnar_graphs
+from GraphModeler.Diff.StreamDiffer import diff_database_files
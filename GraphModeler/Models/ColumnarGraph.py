@@ -0,0 +1,210 @@
+from array import array
+from typing import Any, AnyStr, Dict, Iterator, List, Mapping, Sequence, Tuple
+
+from GraphModeler.Models.Graph import Graph
+from GraphModeler.Models.Node import Node
+from GraphModeler.Models.Properties import intern_labels
+from GraphModeler.Models.Relationship import Relationship
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class _Missing:
+    def __repr__(self):
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+
+class StringTable:
+    def __init__(self):
+        """
+        Maps values to small ints so columns can hold ints instead of object references
+        """
+        self.values: List = []
+        self._indexes: Dict[Any, int] = {}
+
+    def index(self, value) -> int:
+        """
+        Gets the index of a value adding it to the table if needed
+        :param value: the value to look up
+        :return: the index of the value
+        """
+        try:
+            return self._indexes[value]
+        except KeyError:
+            self._indexes[value] = len(self.values)
+            self.values.append(value)
+            return len(self.values) - 1
+
+    def __len__(self):
+        return len(self.values)
+
+
+class PropertyColumns:
+    def __init__(self):
+        """
+        Stores properties as a column per key. rows without a key hold MISSING
+        """
+        self.columns: Dict[AnyStr, List] = {}
+        self.rows = 0
+
+    def append(self, properties: Mapping) -> None:
+        """
+        Adds a row of properties
+        :param properties: the properties of the row
+        """
+        for key, value in properties.items():
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = [MISSING] * self.rows
+            column.append(value)
+        self.rows += 1
+        for column in self.columns.values():
+            if len(column) < self.rows:
+                column.append(MISSING)
+
+    def row(self, index: int) -> Dict[AnyStr, Any]:
+        """
+        Gets the properties of a row
+        :param index: the index of the row
+        :return: the properties the row holds
+        """
+        return {key: column[index] for key, column in self.columns.items() if column[index] is not MISSING}
+
+
+class ColumnarGraph:
+    def __init__(self):
+        """
+        A neo4j graph stored as columns instead of objects.
+        nodes are rows indexed by their id, relationships are int columns of source, target and type
+        """
+        self.node_ids: List[AnyStr] = []
+        self.node_index: Dict[AnyStr, int] = {}
+        self.label_sets = StringTable()
+        self.node_labels = array("l")
+        self.node_properties = PropertyColumns()
+        self.relationship_types = StringTable()
+        self.sources = array("q")
+        self.targets = array("q")
+        self.types = array("l")
+        self.relationship_properties = PropertyColumns()
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def relationship_count(self) -> int:
+        return len(self.sources)
+
+    def add_node(self, node_id: AnyStr, node_types: Sequence[AnyStr], properties: Mapping) -> int:
+        """
+        Adds a node row
+        :param node_id: the id of the node
+        :param node_types: the labels of the node
+        :param properties: the properties of the node, node_id is kept in its own column
+        :return: the index of the node
+        """
+        if node_id in self.node_index:
+            raise ValueError(f"Node {node_id} already exists")
+        self.node_index[node_id] = len(self.node_ids)
+        self.node_ids.append(node_id)
+        self.node_labels.append(self.label_sets.index(intern_labels(node_types)))
+        self.node_properties.append({key: value for key, value in properties.items() if key != "node_id"})
+        return self.node_index[node_id]
+
+    def add_relationship(self, source: int, relationship_type: AnyStr, target: int, properties: Mapping) -> None:
+        """
+        Adds a relationship row between two node indexes
+        :param source: the index of the first node
+        :param relationship_type: the type of the relationship
+        :param target: the index of the second node
+        :param properties: the properties of the relationship
+        """
+        self.sources.append(source)
+        self.targets.append(target)
+        self.types.append(self.relationship_types.index(relationship_type))
+        self.relationship_properties.append(properties)
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> "ColumnarGraph":
+        """
+        Converts an object graph to a columnar graph
+        :param graph: the graph to convert
+        :return: the columnar graph
+        """
+        columnar = cls()
+        for node in graph.nodes:
+            columnar.add_node(node.node_id, node.labels, node.properties)
+        for rel in graph.relationships:
+            columnar.add_relationship(columnar.node_index[rel.node_a.node_id], rel.relationship_type,
+                                      columnar.node_index[rel.node_b.node_id], rel.properties)
+        return columnar
+
+    def node(self, index: int) -> Node:
+        """
+        Materializes a node row as a node object
+        :param index: the index of the node
+        :return: the node
+        """
+        properties = self.node_properties.row(index)
+        properties["node_id"] = self.node_ids[index]
+        return Node(self.label_sets.values[self.node_labels[index]], properties)
+
+    def to_graph(self) -> Graph:
+        """
+        Converts the columnar graph back to an object graph
+        :return: the graph
+        """
+        nodes = [self.node(index) for index in range(self.node_count)]
+        relationships = [Relationship(nodes[self.sources[index]], self.relationship_types.values[self.types[index]],
+                                      nodes[self.targets[index]], self.relationship_properties.row(index))
+                         for index in range(self.relationship_count)]
+        return Graph(nodes, relationships)
+
+    def relationship_keys(self) -> Iterator[Tuple[AnyStr, AnyStr, AnyStr]]:
+        """
+        Iterates over the relationships diff keys
+        :return: an iterator of (node_a id, relationship type, node_b id) in relationship order
+        """
+        node_ids = self.node_ids
+        types = self.relationship_types.values
+        return zip(map(node_ids.__getitem__, self.sources), map(types.__getitem__, self.types),
+                   map(node_ids.__getitem__, self.targets))
+
+    def out_degrees(self) -> Sequence[int]:
+        """
+        Counts the outgoing relationships of every node. vectorized when numpy is available
+        :return: the out degree of each node by index
+        """
+        return _count(self.sources, self.node_count)
+
+    def in_degrees(self) -> Sequence[int]:
+        """
+        Counts the incoming relationships of every node. vectorized when numpy is available
+        :return: the in degree of each node by index
+        """
+        return _count(self.targets, self.node_count)
+
+    def degrees(self) -> Sequence[int]:
+        """
+        Counts all the relationships of every node
+        :return: the degree of each node by index
+        """
+        if numpy is not None:
+            return self.out_degrees() + self.in_degrees()
+        return [out + incoming for out, incoming in zip(self.out_degrees(), self.in_degrees())]
+
+
+def _count(indexes: array, length: int) -> Sequence[int]:
+    if numpy is not None:
+        return numpy.bincount(numpy.frombuffer(indexes, dtype=numpy.int64), minlength=length)
+    counts = [0] * length
+    for index in indexes:
+        counts[index] += 1
+    return counts
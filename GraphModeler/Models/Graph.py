@@ -1,13 +1,200 @@
-from typing import List
-from dataclasses import dataclass, field
+import random
+from collections import defaultdict
+from typing import List, Optional, Dict
 
 from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models.IndexedList import IndexedList
 
 
-@dataclass
 class Graph:
     """
     A neo4j graph
+    can keep an optional adjacency index of every node relationships so removing a node and looking up its
+    neighbors takes O(degree) instead of a scan over all of the relationships
     """
-    nodes: List[Node] = field(default_factory=list)
-    relationships: List[Relationship] = field(default_factory=list)
+
+    def __init__(self, nodes: List[Node] = None, relationships: List[Relationship] = None):
+        self._outgoing: Optional[Dict[Node, List[Relationship]]] = None
+        self._incoming: Optional[Dict[Node, List[Relationship]]] = None
+        self._nodes = nodes if nodes is not None else []
+        self._relationships = relationships if relationships is not None else []
+
+    @property
+    def nodes(self) -> List[Node]:
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes: List[Node]) -> None:
+        self._nodes = nodes
+        if self.indexed:
+            self.index_adjacency()
+
+    @property
+    def relationships(self) -> List[Relationship]:
+        return self._relationships
+
+    @relationships.setter
+    def relationships(self, relationships: List[Relationship]) -> None:
+        self._relationships = relationships
+        if self.indexed:
+            self.index_adjacency()
+
+    @property
+    def indexed(self) -> bool:
+        return self._outgoing is not None
+
+    def index_adjacency(self) -> None:
+        """
+        Builds the adjacency index. from now on the graph should only be changed through its add and remove methods
+        """
+        if not isinstance(self._nodes, IndexedList):
+            self._nodes = IndexedList(self._nodes)
+        if not isinstance(self._relationships, IndexedList):
+            self._relationships = IndexedList(self._relationships)
+        self._outgoing = defaultdict(list)
+        self._incoming = defaultdict(list)
+        for rel in self._relationships:
+            self._outgoing[rel.node_a].append(rel)
+            self._incoming[rel.node_b].append(rel)
+
+    def drop_adjacency_index(self) -> None:
+        """
+        Removes the adjacency index and frees its memory
+        """
+        self._outgoing = None
+        self._incoming = None
+
+    def add_node(self, node: Node) -> None:
+        """
+        Adds a node to the graph
+        :param node: the node to add
+        """
+        self._nodes.append(node)
+
+    def add_relationship(self, rel: Relationship) -> None:
+        """
+        Adds a relationship to the graph
+        :param rel: the relationship to add
+        """
+        self._relationships.append(rel)
+        if self.indexed:
+            self._outgoing[rel.node_a].append(rel)
+            self._incoming[rel.node_b].append(rel)
+
+    def remove_relationship(self, rel: Relationship) -> None:
+        """
+        Removes a relationship from the graph. O(degree) when indexed
+        IMPORTANT! an indexed graph doesn't keep the order of the relationships when removing
+        :param rel: the relationship to remove
+        """
+        if self.indexed:
+            if not self._relationships.discard(rel):
+                raise ValueError(f"{rel} is not in the graph")
+            _swap_remove_identity(self._outgoing[rel.node_a], rel)
+            _swap_remove_identity(self._incoming[rel.node_b], rel)
+        else:
+            _remove_identity(self._relationships, rel)
+
+    def remove_node(self, node: Node) -> List[Relationship]:
+        """
+        Removes a node and all of its relationships from the graph. O(degree) when indexed
+        IMPORTANT! an indexed graph doesn't keep the order of the nodes and relationships when removing
+        :param node: the node to remove
+        :return: the relationships that were removed with the node
+        """
+        detached = self.node_relationships(node)
+        for rel in detached:
+            self.remove_relationship(rel)
+        if self.indexed:
+            if not self._nodes.discard(node):
+                raise ValueError(f"{node} is not in the graph")
+            self._outgoing.pop(node, None)
+            self._incoming.pop(node, None)
+        else:
+            _remove_identity(self._nodes, node)
+        return detached
+
+    def random_node(self) -> Node:
+        """
+        Picks a random node of the graph
+        :return: the node
+        """
+        return random.choice(self._nodes)
+
+    def random_relationship(self) -> Relationship:
+        """
+        Picks a random relationship of the graph
+        :return: the relationship
+        """
+        return random.choice(self._relationships)
+
+    def outgoing(self, node: Node) -> List[Relationship]:
+        """
+        Finds the relationships starting at a node
+        :param node: the node to look up
+        :return: the relationships where the node is node_a
+        """
+        if self.indexed:
+            return list(self._outgoing.get(node, ()))
+        return [rel for rel in self._relationships if rel.node_a == node]
+
+    def incoming(self, node: Node) -> List[Relationship]:
+        """
+        Finds the relationships ending at a node
+        :param node: the node to look up
+        :return: the relationships where the node is node_b
+        """
+        if self.indexed:
+            return list(self._incoming.get(node, ()))
+        return [rel for rel in self._relationships if rel.node_b == node]
+
+    def node_relationships(self, node: Node) -> List[Relationship]:
+        """
+        Finds all of the relationships of a node
+        :param node: the node to look up
+        :return: the relationships where the node is either node_a or node_b
+        """
+        return list({id(rel): rel for rel in self.outgoing(node) + self.incoming(node)}.values())
+
+    def neighbors(self, node: Node) -> List[Node]:
+        """
+        Finds the nodes connected to a node
+        :param node: the node to look up
+        :return: the other node of every relationship of the node
+        """
+        return [rel.node_b for rel in self.outgoing(node)] + [rel.node_a for rel in self.incoming(node)]
+
+    def degree(self, node: Node) -> int:
+        """
+        Counts the relationships of a node
+        :param node: the node to look up
+        :return: the amount of relationships starting or ending at the node
+        """
+        if self.indexed:
+            return len(self._outgoing.get(node, ())) + len(self._incoming.get(node, ()))
+        return len(self.outgoing(node)) + len(self.incoming(node))
+
+    def __eq__(self, other):
+        if not isinstance(other, Graph):
+            return NotImplemented
+        return self.nodes == other.nodes and self.relationships == other.relationships
+
+    def __repr__(self):
+        return f"Graph(nodes={self.nodes!r}, relationships={self.relationships!r})"
+
+
+def _remove_identity(items: List, item) -> None:
+    for position, current in enumerate(items):
+        if current is item:
+            del items[position]
+            return
+    raise ValueError(f"{item} is not in the graph")
+
+
+def _swap_remove_identity(items: List, item) -> None:
+    for position, current in enumerate(items):
+        if current is item:
+            items[position] = items[-1]
+            items.pop()
+            return
+    raise ValueError(f"{item} is not in the graph")
@@ -0,0 +1,89 @@
+from typing import Iterable
+
+
+class IndexedList(list):
+    """
+    A list that tracks the position of every item so an item can be removed in O(1)
+    by moving the last item into its place.
+    items are tracked by identity so every item should appear in the list once
+    IMPORTANT! removing an item changes the order of the list
+    """
+    __slots__ = ("_positions",)
+
+    def __init__(self, items: Iterable = ()):
+        super().__init__(items)
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self._positions = {id(item): position for position, item in enumerate(self)}
+
+    def __reduce__(self):
+        return IndexedList, (list(self),)
+
+    def append(self, item) -> None:
+        self._positions[id(item)] = len(self)
+        super().append(item)
+
+    def extend(self, items: Iterable) -> None:
+        for item in items:
+            self.append(item)
+
+    def __iadd__(self, items: Iterable):
+        self.extend(items)
+        return self
+
+    def holds(self, item) -> bool:
+        """
+        Checks if an item is in the list by identity in O(1)
+        :param item: the item to look up
+        :return: whether the item is in the list
+        """
+        return id(item) in self._positions
+
+    def discard(self, item) -> bool:
+        """
+        Removes an item by identity in O(1)
+        :param item: the item to remove
+        :return: whether the item was in the list
+        """
+        position = self._positions.pop(id(item), None)
+        if position is None:
+            return False
+        last = super().pop()
+        if position < len(self):
+            super().__setitem__(position, last)
+            self._positions[id(last)] = position
+        return True
+
+    def remove(self, item) -> None:
+        if not self.discard(item):
+            self.discard(self[self.index(item)])
+
+    def pop(self, index: int = -1):
+        item = self[index]
+        self.discard(item)
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._positions.clear()
+
+    def insert(self, index: int, item) -> None:
+        super().insert(index, item)
+        self._reindex()
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._reindex()
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._reindex()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._reindex()
@@ -1,55 +1,91 @@
 import uuid
-from dataclasses import dataclass, InitVar
-from typing import Dict, AnyStr, Union, List
+from typing import Dict, AnyStr, Union, List, Tuple, Mapping
 
+from GraphModeler.Models.Properties import PropertyContainer, intern_labels
 
-@dataclass
-class Node:
+
+class Node(PropertyContainer):
     """
     A neo4j node
     sometimes called an edge
+    the labels are kept as an interned tuple and the properties as values over keys shared between nodes
+    the hash is computed once and recomputed only after the id or the labels change
     """
-    node_types: Union[List[AnyStr], AnyStr] = None
-    properties: Dict[AnyStr, AnyStr] = None
-    given_id: InitVar[Union[uuid.UUID, str]] = None
-
-    def __post_init__(self, given_id):
-        if not self.properties:
-            self.properties = {}
-        self.__init_node_types()
-        self.__init_id(given_id)
+    __slots__ = ("_node_types", "_keys", "_values", "_hash")
 
-    def __init_node_types(self):
-        if not self.node_types:
-            raise ValueError("Cannot create a node without one at least type")
-        if not isinstance(self.node_types, list):
-            self.node_types = [self.node_types]
+    def __init__(self, node_types: Union[List[AnyStr], AnyStr] = None, properties: Dict[AnyStr, AnyStr] = None,
+                 given_id: Union[uuid.UUID, str] = None):
+        self._hash = None
+        self.node_types = node_types
+        self.properties = properties
+        self.__init_id(given_id)
 
     def __init_id(self, given_id):
         try:
-            self.node_id = self.properties["node_id"]
+            self.node_id = self["node_id"]
         except KeyError:
             if given_id:
                 self.node_id = given_id
             else:
                 self.node_id = uuid.uuid4()
 
-    def __getitem__(self, item):
-        return self.properties[item]
+    @property
+    def node_types(self) -> List[AnyStr]:
+        """
+        :return: a copy of the labels, set node_types to change them
+        """
+        return list(self._node_types)
+
+    @property
+    def labels(self) -> Tuple[AnyStr, ...]:
+        """
+        :return: the interned labels tuple, shared between nodes with the same labels
+        """
+        return self._node_types
+
+    @node_types.setter
+    def node_types(self, node_types: Union[List[AnyStr], AnyStr]):
+        if not node_types:
+            raise ValueError("Cannot create a node without one at least type")
+        if isinstance(node_types, str):
+            node_types = [node_types]
+        self._node_types = intern_labels(node_types)
+        self._hash = None
+
+    @PropertyContainer.properties.setter
+    def properties(self, properties: Mapping) -> None:
+        PropertyContainer.properties.fset(self, properties)
+        self._hash = None
 
     def __setitem__(self, key, value):
-        self.properties[key] = value
+        super().__setitem__(key, value)
+        if key == "node_id":
+            self._hash = None
+
+    def _delete_property(self, key) -> None:
+        super()._delete_property(key)
+        if key == "node_id":
+            self._hash = None
 
     @property
     def node_id(self):
-        return self.properties["node_id"]
+        return self["node_id"]
 
     @node_id.setter
     def node_id(self, value: uuid.UUID):
-        self.properties["node_id"] = str(value)
+        self["node_id"] = str(value)
 
     def __eq__(self, other):
-        return self.node_types == other.node_types and self.properties == other.properties
+        if self is other:
+            return True
+        if hash(self) != hash(other):
+            return False
+        return self._node_types == other.labels and self.properties == other.properties
 
     def __hash__(self):
-        return hash((frozenset(self.node_types), self.node_id))
+        if self._hash is None:
+            self._hash = hash((frozenset(self._node_types), self.node_id))
+        return self._hash
+
+    def __repr__(self):
+        return f"Node(node_types={list(self.node_types)!r}, properties={self.properties!r})"
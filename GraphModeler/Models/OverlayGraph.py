@@ -0,0 +1,149 @@
+import random
+from collections import defaultdict
+from typing import Dict, List
+
+from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models.Graph import Graph, _swap_remove_identity
+from GraphModeler.Models.IndexedList import IndexedList
+
+
+class OverlayGraph(Graph):
+    """
+    A copy on write view over a base graph that only records the changes made to it.
+    the base graph is shared and its contents are left untouched, the nodes and relationships of the overlay are
+    materialized on access
+    IMPORTANT! the base graph should not be modified while an overlay is in use
+    """
+
+    def __init__(self, base: Graph):
+        """
+        :param base: the graph to overlay. a base without an adjacency index is indexed in place once
+        so every overlay of it shares the index, its nodes and relationships keep their order
+        """
+        if not base.indexed:
+            base.index_adjacency()
+        self.base = base
+        self._removed_nodes: Dict[int, Node] = {}
+        self._removed_relationships: Dict[int, Relationship] = {}
+        self._added_nodes = IndexedList()
+        self._added_relationships = IndexedList()
+        self._added_outgoing: Dict[Node, List[Relationship]] = defaultdict(list)
+        self._added_incoming: Dict[Node, List[Relationship]] = defaultdict(list)
+
+    @property
+    def nodes(self) -> List[Node]:
+        removed = self._removed_nodes
+        return [node for node in self.base.nodes if id(node) not in removed] + list(self._added_nodes)
+
+    @property
+    def relationships(self) -> List[Relationship]:
+        removed = self._removed_relationships
+        return [rel for rel in self.base.relationships if id(rel) not in removed] + list(self._added_relationships)
+
+    @property
+    def removed_nodes(self) -> List[Node]:
+        return list(self._removed_nodes.values())
+
+    @property
+    def removed_relationships(self) -> List[Relationship]:
+        return list(self._removed_relationships.values())
+
+    @property
+    def added_nodes(self) -> List[Node]:
+        return list(self._added_nodes)
+
+    @property
+    def added_relationships(self) -> List[Relationship]:
+        return list(self._added_relationships)
+
+    @property
+    def indexed(self) -> bool:
+        return True
+
+    def index_adjacency(self) -> None:
+        pass
+
+    def materialize(self) -> Graph:
+        """
+        Applies the changes to a new graph
+        :return: a graph of the base graph with the changes, sharing the node and relationship objects
+        """
+        return Graph(self.nodes, self.relationships)
+
+    def add_node(self, node: Node) -> None:
+        self._added_nodes.append(node)
+
+    def add_relationship(self, rel: Relationship) -> None:
+        self._added_relationships.append(rel)
+        self._added_outgoing[rel.node_a].append(rel)
+        self._added_incoming[rel.node_b].append(rel)
+
+    def remove_relationship(self, rel: Relationship) -> None:
+        if self._added_relationships.discard(rel):
+            _swap_remove_identity(self._added_outgoing[rel.node_a], rel)
+            _swap_remove_identity(self._added_incoming[rel.node_b], rel)
+            return
+        if id(rel) in self._removed_relationships or not self.base.relationships.holds(rel):
+            raise ValueError(f"{rel} is not in the graph")
+        self._removed_relationships[id(rel)] = rel
+
+    def remove_node(self, node: Node) -> List[Relationship]:
+        detached = self.node_relationships(node)
+        for rel in detached:
+            self.remove_relationship(rel)
+        if not self._added_nodes.discard(node):
+            if id(node) in self._removed_nodes or not self.base.nodes.holds(node):
+                raise ValueError(f"{node} is not in the graph")
+            self._removed_nodes[id(node)] = node
+        self._added_outgoing.pop(node, None)
+        self._added_incoming.pop(node, None)
+        return detached
+
+    def random_node(self) -> Node:
+        """
+        Picks a random node of the graph without materializing it.
+        removed nodes are rejected and picked again so a pick is O(1) while most of the base graph is kept
+        :return: the node
+        """
+        base_nodes = self.base.nodes
+        return _random_item(base_nodes, self._removed_nodes, self._added_nodes)
+
+    def random_relationship(self) -> Relationship:
+        """
+        Picks a random relationship of the graph without materializing it.
+        removed relationships are rejected and picked again so a pick is O(1) while most of the base graph is kept
+        :return: the relationship
+        """
+        return _random_item(self.base.relationships, self._removed_relationships, self._added_relationships)
+
+    def outgoing(self, node: Node) -> List[Relationship]:
+        removed = self._removed_relationships
+        return [rel for rel in self.base.outgoing(node) if id(rel) not in removed] + \
+            list(self._added_outgoing.get(node, ()))
+
+    def incoming(self, node: Node) -> List[Relationship]:
+        removed = self._removed_relationships
+        return [rel for rel in self.base.incoming(node) if id(rel) not in removed] + \
+            list(self._added_incoming.get(node, ()))
+
+    def degree(self, node: Node) -> int:
+        return len(self.outgoing(node)) + len(self.incoming(node))
+
+    def __repr__(self):
+        return f"OverlayGraph(base={self.base!r}, removed_nodes={self.removed_nodes!r}, " \
+               f"removed_relationships={self.removed_relationships!r}, " \
+               f"added_relationships={self.added_relationships!r})"
+
+
+def _random_item(base: List, removed: Dict, added: List):
+    live = len(base) - len(removed) + len(added)
+    if live <= 0:
+        raise IndexError("Cannot choose from an empty graph")
+    if len(removed) > len(base) // 2:
+        return random.choice([item for item in base if id(item) not in removed] + list(added))
+    while True:
+        index = random.randrange(len(base) + len(added))
+        if index >= len(base):
+            return added[index - len(base)]
+        if id(base[index]) not in removed:
+            return base[index]
@@ -0,0 +1,127 @@
+import sys
+from collections.abc import Mapping, MutableMapping
+from typing import Any, AnyStr, Dict, Iterable, Tuple
+
+# the tables only grow with new key sets and label sets. past the limit new sets are kept unshared
+# so items with unusual or ever changing keys can't grow the tables without a bound
+MAX_INTERNED = 65536
+_keys_table: Dict[Tuple, Tuple] = {}
+_labels_table: Dict[Tuple, Tuple] = {}
+EMPTY = ()
+
+
+def _intern(table: Dict[Tuple, Tuple], items: Tuple) -> Tuple:
+    shared = table.get(items)
+    if shared is not None:
+        return shared
+    if len(table) < MAX_INTERNED:
+        table[items] = items
+    return items
+
+
+def intern_keys(keys: Tuple[AnyStr, ...]) -> Tuple[AnyStr, ...]:
+    """
+    Interns a tuple of property keys so all items with the same keys share a single tuple
+    :param keys: the property keys
+    :return: the shared tuple of the keys, or the keys themselves once the table is full
+    """
+    return _intern(_keys_table, keys)
+
+
+def intern_labels(labels: Iterable[AnyStr]) -> Tuple[AnyStr, ...]:
+    """
+    Interns a set of labels so all nodes with the same labels share a single tuple
+    :param labels: the labels
+    :return: the shared tuple of the labels, or the labels themselves once the table is full
+    """
+    return _intern(_labels_table, tuple(sys.intern(label) for label in labels))
+
+
+class PropertyContainer:
+    """
+    Stores properties as an interned keys tuple shared between items and a values tuple of the item
+    instead of a dict per item
+    """
+    __slots__ = ()
+
+    @property
+    def properties(self) -> "PropertiesView":
+        return PropertiesView(self)
+
+    @properties.setter
+    def properties(self, properties: Mapping) -> None:
+        if properties:
+            self._keys = intern_keys(tuple(sys.intern(key) for key in properties))
+            self._values = tuple(properties.values())
+        else:
+            self._keys = EMPTY
+            self._values = EMPTY
+
+    def __getitem__(self, item):
+        try:
+            return self._values[self._keys.index(item)]
+        except ValueError:
+            raise KeyError(item)
+
+    def __setitem__(self, key, value):
+        try:
+            index = self._keys.index(key)
+            self._values = self._values[:index] + (value,) + self._values[index + 1:]
+        except ValueError:
+            self._keys = intern_keys(self._keys + (sys.intern(key),))
+            self._values = self._values + (value,)
+
+    def _delete_property(self, key) -> None:
+        try:
+            index = self._keys.index(key)
+        except ValueError:
+            raise KeyError(key)
+        # the keys left after a deletion are usually a passing shape, they aren't interned
+        self._keys = self._keys[:index] + self._keys[index + 1:]
+        self._values = self._values[:index] + self._values[index + 1:]
+
+
+class PropertiesView(MutableMapping):
+    """
+    A dict like view over the properties of an item, changes to the view change the item
+    """
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: PropertyContainer):
+        self._owner = owner
+
+    def __getitem__(self, key) -> Any:
+        return self._owner[key]
+
+    def __setitem__(self, key, value) -> None:
+        self._owner[key] = value
+
+    def __delitem__(self, key) -> None:
+        self._owner._delete_property(key)
+
+    def __iter__(self):
+        return iter(self._owner._keys)
+
+    def __len__(self) -> int:
+        return len(self._owner._keys)
+
+    def __contains__(self, key) -> bool:
+        return key in self._owner._keys
+
+    def items(self):
+        return zip(self._owner._keys, self._owner._values)
+
+    def values(self):
+        return self._owner._values
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PropertiesView):
+            if self._owner._keys is other._owner._keys:
+                return self._owner._values == other._owner._values
+            return dict(self.items()) == dict(other.items())
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
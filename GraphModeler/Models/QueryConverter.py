@@ -1,10 +1,13 @@
-from typing import AnyStr, Union
+from typing import AnyStr, Dict, Sequence, Tuple, Union
 
 from GraphModeler.Models import Node, Relationship
 
+ParameterizedQuery = Tuple[AnyStr, Dict]
+Query = Union[AnyStr, ParameterizedQuery]
+
 
 def relationship_query(rel: Relationship, node_names: tuple = ("nodeA", "nodeB"),
-                       relationship_name: AnyStr = "r") -> AnyStr:
+                       relationship_name: AnyStr = "r", parameterized: bool = False) -> Query:
     """
     Transforms a relationship object to a literal neo4j query of the same relationship
     without changing the original object
@@ -12,23 +15,51 @@ def relationship_query(rel: Relationship, node_names: tuple = ("nodeA", "nodeB")
     :param rel: the relationship to transform
     :param node_names: the names of the nodes in the query. useful for multi query strings
     :param relationship_name: the name of the relationship in the query. useful for multi query strings
+    :param parameterized: whether to return a (query, parameters) pair with $param placeholders instead of literals
     :return: a string of the query
     """
     node_a, node_b = node_names
+    parameters = {}
     if rel.properties:
-        return f"({node_a})-[{relationship_name}:{rel.relationship_type} {generate_properties(rel)}]-({node_b})"
-    return f"({node_a})-[{relationship_name}:{rel.relationship_type}]-({node_b})"
+        properties, parameters = properties_query(rel, relationship_name, parameterized)
+        query = f"({node_a})-[{relationship_name}:{rel.relationship_type} {properties}]-({node_b})"
+    else:
+        query = f"({node_a})-[{relationship_name}:{rel.relationship_type}]-({node_b})"
+    return (query, parameters) if parameterized else query
 
 
-def relationship_nodes_query(rel, node_names: tuple = ("nodeA", "nodeB")) -> AnyStr:
+def relationship_nodes_query(rel, node_names: tuple = ("nodeA", "nodeB"), parameterized: bool = False) -> Query:
     """
     Generates a query representation of the nodes in a relationship
     :param rel: the relationship to transform
     :param node_names: the name of the nodes in the query. useful for multi query strings
+    :param parameterized: whether to return a (query, parameters) pair with $param placeholders instead of literals
+    :return: a string of the query
+    """
+    node_a, node_b = node_names
+    if not parameterized:
+        return f"{node_query(rel.node_a, node_a)}, {node_query(rel.node_b, node_b)}"
+    query_a, parameters_a = node_query(rel.node_a, node_a, parameterized=True)
+    query_b, parameters_b = node_query(rel.node_b, node_b, parameterized=True)
+    return f"{query_a}, {query_b}", {**parameters_a, **parameters_b}
+
+
+def relationship_endpoints_query(rel: Relationship, node_names: tuple = ("nodeA", "nodeB"),
+                                 parameterized: bool = False) -> Query:
+    """
+    Generates a query matching the nodes of a relationship only by their types and id
+    so the lookup can use a node_id index instead of filtering by every property
+    :param rel: the relationship to transform
+    :param node_names: the name of the nodes in the query. useful for multi query strings
+    :param parameterized: whether to return a (query, parameters) pair with $param placeholders instead of literals
     :return: a string of the query
     """
     node_a, node_b = node_names
-    return f"{node_query(rel.node_a, node_a)}, {node_query(rel.node_b, node_b)}"
+    if not parameterized:
+        return f"{node_id_query(rel.node_a, node_a)}, {node_id_query(rel.node_b, node_b)}"
+    query_a, parameters_a = node_id_query(rel.node_a, node_a, parameterized=True)
+    query_b, parameters_b = node_id_query(rel.node_b, node_b, parameterized=True)
+    return f"{query_a}, {query_b}", {**parameters_a, **parameters_b}
 
 
 def generate_properties(item: Union[Node, Relationship]) -> AnyStr:
@@ -47,11 +78,82 @@ def generate_properties(item: Union[Node, Relationship]) -> AnyStr:
     return properties
 
 
-def node_query(node: Node, node_name="n") -> AnyStr:
+def generate_parameterized_properties(item: Union[Node, Relationship], prefix: AnyStr) -> ParameterizedQuery:
+    """
+    Generates neo4j properties of an item as placeholders transforms the properties dict from {"key": "value"} to
+    {key: $prefix_0} and returns the values as parameters. items with the same keys generate the same query text
+    :param item: the item to transform
+    :param prefix: the prefix of the parameter names. useful for multi query strings
+    :return: the properties as a neo4j query string and the parameters for it
+    """
+    if not item.properties:
+        raise ValueError("Missing item properties")
+    placeholders = []
+    parameters = {}
+    for index, (key, value) in enumerate(item.properties.items()):
+        parameter = f"{prefix}_{index}"
+        placeholders.append(f"{key}: ${parameter}")
+        parameters[parameter] = value
+    return "{" + ", ".join(placeholders) + "}", parameters
+
+
+def properties_query(item: Union[Node, Relationship], prefix: AnyStr, parameterized: bool) -> ParameterizedQuery:
+    """
+    Generates the properties of an item either as literals or as parameters
+    :param item: the item to transform
+    :param prefix: the prefix of the parameter names
+    :param parameterized: whether to generate parameters
+    :return: the properties as a neo4j query string and the parameters for it. empty when not parameterized
+    """
+    if parameterized:
+        return generate_parameterized_properties(item, prefix)
+    return generate_properties(item), {}
+
+
+def escape_name(name: AnyStr) -> AnyStr:
+    """
+    Escapes a label, type or property key so it can be used in a query
+    :param name: the name to escape
+    :return: the name as is if it is a valid identifier else the name quoted in backticks
+    """
+    if name.isidentifier():
+        return name
+    escaped = name.replace("`", "``")
+    return f"`{escaped}`"
+
+
+def row_properties(keys: Sequence[AnyStr], row_name: AnyStr = "row") -> AnyStr:
+    """
+    Generates a properties map of an UNWIND row for batch queries, transforms ("key",) to {key: row.key}
+    :param keys: the property keys of the rows
+    :param row_name: the name of the row in the query
+    :return: the properties as a neo4j query string
+    """
+    return "{" + ", ".join(f"{escape_name(key)}: {row_name}.{escape_name(key)}" for key in keys) + "}"
+
+
+def node_query(node: Node, node_name="n", parameterized: bool = False) -> Query:
     """
     Creates a query representation of a single node
     :param node: the node to transform
     :param node_name: the name of the node in the query. useful for multi query strings
+    :param parameterized: whether to return a (query, parameters) pair with $param placeholders instead of literals
+    :return: a string of the query
+    """
+    properties, parameters = properties_query(node, node_name, parameterized)
+    query = f"({node_name}:{':'.join(node.node_types)} {properties})"
+    return (query, parameters) if parameterized else query
+
+
+def node_id_query(node: Node, node_name="n", parameterized: bool = False) -> Query:
+    """
+    Creates a query representation of a single node matching only its types and id
+    :param node: the node to transform
+    :param node_name: the name of the node in the query. useful for multi query strings
+    :param parameterized: whether to return a (query, parameters) pair with $param placeholders instead of literals
     :return: a string of the query
     """
-    return f"({node_name}:{':'.join(node.node_types)} {generate_properties(node)})"
+    labels = ':'.join(node.node_types)
+    if parameterized:
+        return f"({node_name}:{labels} {{node_id: ${node_name}_id}})", {f"{node_name}_id": node.node_id}
+    return f"({node_name}:{labels} {{node_id: '{node.node_id}'}})"
@@ -1,29 +1,37 @@
-from dataclasses import dataclass, field
+import sys
 from typing import AnyStr, Dict
+
 from GraphModeler.Models.Node import Node
+from GraphModeler.Models.Properties import PropertyContainer
 
 
-@dataclass
-class Relationship:
+class Relationship(PropertyContainer):
     """
     A neo4j relationship between 2 nodes
     sometimes called a vertex
+    the type is interned and the properties are kept as values over keys shared between relationships
+    the hash isn't cached, it is combined from the cached hashes of the nodes so it follows changes to their ids and labels
     """
-    node_a: Node
-    relationship_type: AnyStr
-    node_b: Node
-    properties: Dict[AnyStr, AnyStr] = field(default_factory=dict)
-
-    def __getitem__(self, item):
-        return self.properties[item]
+    __slots__ = ("node_a", "relationship_type", "node_b", "_keys", "_values")
 
-    def __setitem__(self, key, value):
-        self.properties[key] = value
+    def __init__(self, node_a: Node, relationship_type: AnyStr, node_b: Node, properties: Dict[AnyStr, AnyStr] = None):
+        self.node_a = node_a
+        self.relationship_type = sys.intern(relationship_type)
+        self.node_b = node_b
+        self.properties = properties
 
     def __eq__(self, other):
+        if self is other:
+            return True
+        if hash(self) != hash(other):
+            return False
         return self.relationship_type == other.relationship_type \
                and self.node_a == other.node_a \
                and self.node_b == other.node_b
 
     def __hash__(self):
         return hash((self.relationship_type, self.node_a, self.node_b))
+
+    def __repr__(self):
+        return f"Relationship(node_a={self.node_a!r}, relationship_type={self.relationship_type!r}, " \
+               f"node_b={self.node_b!r}, properties={self.properties!r})"
@@ -0,0 +1,25 @@
+from DbInterface.Neo4jStream import Neo4jStream
+
+
+class FakeSession:
+    def __init__(self, records):
+        self.records = records
+        self.fetched = 0
+
+    def run(self, query, parameters=None):
+        for record in self.records:
+            self.fetched += 1
+            yield record
+
+
+def test_read_stream_batches():
+    # Arrange
+    stream = Neo4jStream("bolt://localhost", "neo4j", "neo4j")
+    stream._session = FakeSession(list(range(7)))
+    # Act
+    result = stream.read_stream("MATCH (n) RETURN n", batch_size=3)
+    first_batch = next(result)
+    # Assert
+    assert first_batch == [0, 1, 2]
+    assert stream._session.fetched == 3
+    assert list(result) == [[3, 4, 5], [6]]
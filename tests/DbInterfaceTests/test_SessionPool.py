@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+from neo4j.exceptions import ServiceUnavailable
+
+from DbInterface.SessionPool import SessionPool
+
+
+class FakeResult:
+    def consume(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, healthy: bool = True):
+        self.healthy = healthy
+        self.closed = False
+
+    def run(self, query, parameters=None):
+        if not self.healthy:
+            raise ServiceUnavailable("connection lost")
+        return FakeResult()
+
+    def close(self):
+        self.closed = True
+
+
+async def run_blocking(function, *args):
+    return function(*args)
+
+
+def create_pool(size: int, **kwargs) -> SessionPool:
+    return SessionPool(FakeSession, run_blocking, size, **kwargs)
+
+
+def test_session_pool_reuses_sessions():
+    # Arrange
+    pool = create_pool(2)
+
+    async def borrow():
+        async with pool.session():
+            await asyncio.sleep(0.001)
+
+    async def borrow_concurrently():
+        await asyncio.gather(*(borrow() for _ in range(10)))
+
+    # Act
+    asyncio.run(asyncio.wait_for(borrow_concurrently(), 5))
+    # Assert
+    assert pool.metrics.created == 2
+    assert pool.metrics.acquisitions == 10
+    assert pool.metrics.max_wait > 0
+
+
+def test_session_pool_acquire_timeout():
+    # Arrange
+    pool = create_pool(1, acquire_timeout=0.01)
+
+    async def hold_and_acquire():
+        await pool.acquire()
+        await pool.acquire()
+
+    # Act
+    with pytest.raises(TimeoutError):
+        asyncio.run(hold_and_acquire())
+    # Assert
+    assert pool.metrics.timeouts == 1
+
+
+def test_session_pool_discards_broken_sessions():
+    # Arrange
+    pool = create_pool(1, health_check_interval=0)
+
+    async def use():
+        with pytest.raises(ServiceUnavailable):
+            async with pool.session():
+                raise ServiceUnavailable("connection lost")
+        first = await pool.acquire()
+        first.healthy = False
+        await pool.release(first)
+        second = await pool.acquire()
+        return first, second
+
+    # Act
+    first, second = asyncio.run(use())
+    # Assert
+    assert first.closed and second is not first
+    assert pool.metrics.discarded == 2
+    assert pool.open_sessions == 1
+
+
+async def slow_run_blocking(function, *args):
+    if function is not FakeSession:
+        await asyncio.sleep(0.05)
+    return function(*args)
+
+
+def test_session_pool_timeout_during_health_check():
+    # Arrange
+    pool = SessionPool(FakeSession, slow_run_blocking, 1, acquire_timeout=0.01, health_check_interval=0)
+
+    async def use():
+        first = await pool.acquire()
+        await pool.release(first)
+        with pytest.raises(TimeoutError):
+            await pool.acquire()
+        closed_during_check = first.closed
+        await asyncio.sleep(0.2)
+        return first, closed_during_check, await asyncio.wait_for(pool.acquire(), 1)
+
+    # Act
+    first, closed_during_check, result = asyncio.run(use())
+    # Assert
+    assert not closed_during_check and first.closed
+    assert isinstance(result, FakeSession) and result is not first
+    assert pool.open_sessions == 1
+
+
+def test_session_pool_cancel_during_call():
+    # Arrange
+    pool = SessionPool(FakeSession, slow_run_blocking, 1)
+    borrowed = []
+
+    async def query():
+        async with pool.session() as session:
+            borrowed.append(session)
+            await pool.run(session, session.run, "RETURN 1")
+
+    async def cancel_and_acquire():
+        task = asyncio.ensure_future(query())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        closed_during_call = borrowed[0].closed
+        return closed_during_call, await asyncio.wait_for(pool.acquire(), 1)
+
+    # Act
+    closed_during_call, session = asyncio.run(cancel_and_acquire())
+    # Assert
+    assert not closed_during_call and borrowed[0].closed
+    assert session is not borrowed[0]
+    assert pool.metrics.discarded == 1
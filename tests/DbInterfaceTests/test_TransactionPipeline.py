@@ -0,0 +1,63 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from neo4j.exceptions import TransientError
+
+from DbInterface.TransactionPipeline import run_transactions_async
+
+
+class FakeAsyncStream:
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.committed = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        runs = []
+        try:
+            yield runs
+            self.committed.extend(runs)
+        finally:
+            self.in_flight -= 1
+
+
+def works(count):
+    for index in range(count):
+        async def work(transaction, value=index):
+            await asyncio.sleep(0.001)
+            transaction.append(value)
+
+        yield 10, work
+
+
+def test_run_transactions_bounded_concurrency():
+    # Arrange
+    stream = FakeAsyncStream()
+    progress = []
+    # Act
+    asyncio.run(run_transactions_async(stream, works(20), concurrency=3, progress=progress.append))
+    # Assert
+    assert sorted(stream.committed) == list(range(20))
+    assert stream.max_in_flight == 3
+    assert sum(progress) == 200
+
+
+def test_run_transactions_retries_transient_errors():
+    # Arrange
+    stream = FakeAsyncStream()
+    attempts = []
+
+    async def flaky(transaction):
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TransientError("deadlock")
+        transaction.append("done")
+    # Act
+    asyncio.run(run_transactions_async(stream, [(1, flaky)], retries=3))
+    # Assert
+    assert stream.committed == ["done"]
+    assert len(attempts) == 3
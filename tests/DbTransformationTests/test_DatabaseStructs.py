@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+from GraphModeler.DbTranformations import DatabaseStructs
+from GraphModeler.DbTranformations.DatabaseStructs import decode_database
+from GraphModeler.DbTranformations.DbLoader import import_database_json, import_database_struct
+from GraphModeler.DbTranformations.DbSaver import export_database_json
+
+pytestmark = pytest.mark.skipif(DatabaseStructs.msgspec is None, reason="msgspec is not installed")
+
+DATABASE = {"name": "Test", "graph": {
+    "nodes": [{"node_types": "TypeA", "properties": {"name": "a", "node_id": "1"}},
+              {"node_types": ["TypeA", "TypeB"], "properties": {"node_id": "2", "tags": ["x"]}}],
+    "relationships": [{"node_a": "1", "relationship_type": "Rel", "node_b": "2", "properties": {"weight": 1.5}}]}}
+
+
+def test_decode_database_matches_json_import():
+    # Arrange
+    expected = export_database_json(import_database_json(DATABASE))
+    # Act
+    result = import_database_struct(decode_database(json.dumps(DATABASE)))
+    # Assert
+    assert export_database_json(result) == expected
+
+
+def test_decode_database_invalid_document():
+    # Arrange
+    document = json.dumps({"name": "Test", "graph": {"nodes": [{"properties": {}}]}})
+    # Act
+    with pytest.raises(ValueError):
+        decode_database(document)
@@ -1,6 +1,9 @@
+import asyncio
+
 import pytest
 
-from GraphModeler.DbTranformations.DbLoader import import_node_json, import_relationship_json, import_graph_json
+from GraphModeler.DbTranformations.DbLoader import import_node_json, import_relationship_json, import_graph_json, \
+    import_relationships_neo4j, import_neo4j_database_async
 from GraphModeler.Models import Node, Relationship
 from GraphModeler.Models.Graph import Graph
 
@@ -46,3 +49,95 @@ def test_load_graph(relationship_nodes):
     })
     # Assert
     assert result == expected
+
+
+class FakePagedStream:
+    def __init__(self, records):
+        self.records = records
+        self.pages = 0
+
+    def read(self, query, parameters=None):
+        self.pages += 1
+        return [record for record in self.records if record["id"] > parameters["last_id"]][:parameters["page_size"]]
+
+
+def test_import_relationships_neo4j_pages(relationship_nodes):
+    # Arrange
+    records = [{"id": index, "node_a": "1", "relationship_type": "Rel", "node_b": "2", "properties": {"i": index}}
+               for index in range(5)]
+    stream = FakePagedStream(records)
+    # Act
+    result = import_relationships_neo4j(stream, relationship_nodes, page_size=2)
+    # Assert
+    assert [rel["i"] for rel in result] == [0, 1, 2, 3, 4]
+    assert result[0].node_a is relationship_nodes["1"] and result[0].node_b is relationship_nodes["2"]
+    assert stream.pages == 3
+
+
+class FakeNeo4jNode(dict):
+    def __init__(self, labels, properties):
+        super().__init__(properties)
+        self.labels = set(labels)
+
+
+class FakeAsyncStream(FakePagedStream):
+    def __init__(self, nodes, records):
+        super().__init__(records)
+        self.nodes = nodes
+
+    async def read_stream_async(self, query, parameters=None, batch_size=1000):
+        for index in range(0, len(self.nodes), batch_size):
+            await asyncio.sleep(0)
+            yield [[node] for node in self.nodes[index:index + batch_size]]
+
+    async def read_async(self, query, parameters=None):
+        await asyncio.sleep(0)
+        return self.read(query, parameters)
+
+
+def test_import_neo4j_database_async():
+    # Arrange
+    nodes = [FakeNeo4jNode(["TypeA"], {"node_id": str(index)}) for index in range(5)]
+    records = [{"id": index, "node_a": str(index), "relationship_type": "Rel", "node_b": str(index + 1),
+                "properties": {}} for index in range(4)]
+    stream = FakeAsyncStream(nodes, records)
+    # Act
+    result = asyncio.run(import_neo4j_database_async(stream, "Test", batch_size=2, page_size=3))
+    # Assert
+    assert [node.node_id for node in result.graph.nodes] == ["0", "1", "2", "3", "4"]
+    assert [(rel.node_a.node_id, rel.node_b.node_id) for rel in result.graph.relationships] == \
+           [("0", "1"), ("1", "2"), ("2", "3"), ("3", "4")]
+    assert all(rel.node_a is result.graph.nodes[int(rel.node_a.node_id)] for rel in result.graph.relationships)
+
+
+class FailingPagesStream(FakeAsyncStream):
+    def __init__(self):
+        super().__init__([], [])
+        self.nodes_stopped = False
+
+    async def read_stream_async(self, query, parameters=None, batch_size=1000):
+        try:
+            while True:
+                await asyncio.sleep(0.01)
+                yield []
+        finally:
+            self.nodes_stopped = True
+
+    async def read_async(self, query, parameters=None):
+        await asyncio.sleep(0.02)
+        raise RuntimeError("page failed")
+
+
+def test_import_neo4j_database_async_cancels_nodes_on_error():
+    # Arrange
+    stream = FailingPagesStream()
+
+    async def import_and_check():
+        with pytest.raises(RuntimeError):
+            await import_neo4j_database_async(stream, "Test")
+        return stream.nodes_stopped
+
+    # Act
+    result = asyncio.run(import_and_check())
+    # Assert
+    assert result
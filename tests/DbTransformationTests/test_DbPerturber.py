@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from GraphModeler.DbTranformations.DbPerturber import perturb_graph, perturb_graph_reference
+from GraphModeler.Diff import diff_databases
+from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models.Database import Database
+from GraphModeler.Models.Graph import Graph
+
+
+@pytest.fixture()
+def test_database() -> Database:
+    nodes = [Node("Person", given_id=str(index)) for index in range(50)]
+    relationships = [Relationship(nodes[index], "Knows", nodes[(index * 7 + 1) % 50]) for index in range(50)]
+    return Database(Graph(nodes, relationships), "test")
+
+
+def test_perturb_graph_reference_counts_mutations(test_database):
+    # Arrange
+    random.seed(1)
+    # Act
+    mutations = perturb_graph_reference(test_database, 1, 5)
+    # Assert
+    assert mutations == 15
+    assert len(test_database.graph.nodes) == 45
+
+
+def test_perturb_graph_keeps_source(test_database):
+    # Arrange
+    random.seed(1)
+    source_relationships = list(test_database.graph.relationships)
+    # Act
+    perturbed = perturb_graph(test_database, 1, 5)
+    # Assert
+    assert test_database.graph.relationships == source_relationships
+    assert len(diff_databases(test_database, perturbed).removed_nodes) == 5
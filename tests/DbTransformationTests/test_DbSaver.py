@@ -1,7 +1,18 @@
+import asyncio
+import io
+import json
+
 import pytest
+from neo4j.exceptions import ClientError
 
-from GraphModeler.DbTranformations.DbSaver import export_node_json, export_relationship_json, export_graph_json
+from GraphModeler.DbTranformations.DbSaver import export_node_json, export_relationship_json, export_graph_json, \
+    node_batches, write_database_json, export_database_json, save_database_binary, diff_batches, \
+    delete_database_neo4j, delete_database_neo4j_async, DELETE_RELATIONSHIPS_BATCH_QUERY, DELETE_NODES_BATCH_QUERY, \
+    create_node_id_constraints_async
+from GraphModeler.Diff import diff_graphs
+from GraphModeler.DbTranformations.DbLoader import load_database_binary, load_columnar_binary
 from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models.Database import Database
 from GraphModeler.Models.Graph import Graph
 
 
@@ -50,3 +61,154 @@ def test_graph_json(test_relationship, test_node):
     result = export_graph_json(test_graph)
     # Assert
     assert result == expected
+
+
+def test_node_batches():
+    # Arrange
+    nodes = [Node("TypeA", given_id="1"), Node("TypeA", given_id="2"), Node("TypeB", given_id="3")]
+    expected = {"UNWIND $rows AS row MERGE (n:TypeA {node_id: row.node_id})": [{"node_id": "1"}, {"node_id": "2"}],
+                "UNWIND $rows AS row MERGE (n:TypeB {node_id: row.node_id})": [{"node_id": "3"}]}
+    # Act
+    result = node_batches(nodes)
+    # Assert
+    assert result == expected
+
+
+def test_write_database_json():
+    # Arrange
+    nodes = [Node("TestTypeA", given_id=str(index)) for index in range(5)]
+    database = Database(Graph(nodes, [Relationship(nodes[0], "Rel", nodes[1], {"weight": 1})]), "test")
+    output = io.StringIO()
+    # Act
+    write_database_json(output, database.name, iter(database.graph.nodes), iter(database.graph.relationships),
+                        write_size=2)
+    # Assert
+    assert json.loads(output.getvalue()) == export_database_json(database)
+
+
+def test_binary_snapshot_round_trip(tmp_path):
+    # Arrange
+    nodes = [Node("TestTypeA", {"node_id": "7a6c1c7e-3d5b-4b4f-9a55-0c1f3f6f1a2b", "name": "a", "age": 3}),
+             Node(["TestTypeA", "TestTypeB"], {"name": None, "score": 1.5, "tags": ["x"]}, given_id="2")]
+    database = Database(Graph(nodes, [Relationship(nodes[0], "Rel", nodes[1], {"weight": True})]), "test")
+    path = tmp_path / "graph.bin"
+    # Act
+    with open(path, "wb") as output:
+        save_database_binary(database, output)
+    result = load_database_binary(path)
+    # Assert
+    assert export_database_json(result) == export_database_json(database)
+
+
+def test_binary_snapshot_columnar_load(tmp_path):
+    # Arrange
+    nodes = [Node("TestTypeA", {"name": "a"}, given_id="1"), Node(["TestTypeA", "TestTypeB"], given_id="2")]
+    graph = Graph(nodes, [Relationship(nodes[0], "Rel", nodes[1], {"weight": 2})])
+    path = tmp_path / "graph.bin"
+    with open(path, "wb") as output:
+        save_database_binary(Database(graph, "test"), output)
+    # Act
+    result = load_columnar_binary(path)
+    # Assert
+    assert export_graph_json(result.to_graph()) == export_graph_json(graph)
+
+
+def test_diff_batches_order():
+    # Arrange
+    source_nodes = [Node("TestTypeA", given_id=str(index)) for index in range(3)]
+    target_nodes = [source_nodes[0], Node("TestTypeB", given_id="1"), Node("TestTypeA", given_id="3")]
+    source = Graph(source_nodes, [Relationship(source_nodes[0], "Rel", source_nodes[2])])
+    target = Graph(target_nodes, [Relationship(target_nodes[0], "Rel", target_nodes[2])])
+    # Act
+    result = diff_batches(diff_graphs(source, target))
+    # Assert
+    assert [[rows for rows in batches.values()] for batches in result] == [
+        [[{"node_a": "0", "node_b": "2", "properties": {}, "count": 1}]],
+        [[{"node_id": "2"}]],
+        [[{"node_id": "1", "properties": {"node_id": "1"}}]],
+        [[{"node_id": "3"}]],
+        [[{"node_a": "0", "node_b": "3", "properties": {}}]]]
+    assert list(result[2]) == ["UNWIND $rows AS row MATCH (n:TestTypeA {node_id: row.node_id}) "
+                               "REMOVE n:TestTypeA SET n:TestTypeB SET n = row.properties"]
+
+
+def test_diff_batches_reverse_and_parallel_relationships():
+    # Arrange
+    nodes = [Node("TestTypeA", given_id=str(index)) for index in range(2)]
+    source = Graph(nodes, [Relationship(nodes[0], "Rel", nodes[1]) for _ in range(3)])
+    target = Graph(nodes, [Relationship(nodes[0], "Rel", nodes[1]), Relationship(nodes[0], "Rel", nodes[1], {"w": 1}),
+                           Relationship(nodes[1], "Rel", nodes[0])])
+    # Act
+    result = diff_batches(diff_graphs(source, target))
+    # Assert
+    assert list(result[0].values()) == [[{"node_a": "0", "node_b": "1", "properties": {}, "count": 2}]]
+    assert "-[r:Rel]->" in list(result[0])[0]
+    assert sorted((row for rows in result[4].values() for row in rows), key=str) == sorted([
+        {"node_a": "0", "node_b": "1", "properties": {"w": 1}},
+        {"node_a": "1", "node_b": "0", "properties": {}}], key=str)
+    assert all("CREATE (nodeA)-" in query and "->(nodeB)" in query for query in result[4])
+
+
+class FakeDeleteStream:
+    def __init__(self, relationships: int, nodes: int):
+        self.remaining = {DELETE_RELATIONSHIPS_BATCH_QUERY: relationships, DELETE_NODES_BATCH_QUERY: nodes}
+        self.queries = []
+
+    def write(self, query, parameters):
+        self.queries.append(query)
+        deleted = min(parameters["batch_size"], self.remaining[query])
+        self.remaining[query] -= deleted
+        return [{"deleted": deleted}]
+
+    async def write_async(self, query, parameters):
+        await asyncio.sleep(0)
+        return self.write(query, parameters)
+
+
+def test_delete_database_neo4j_batches():
+    # Arrange
+    stream = FakeDeleteStream(25, 10)
+    progress = []
+    # Act
+    delete_database_neo4j(stream, batch_size=10, progress=progress.append)
+    # Assert
+    assert progress == [10, 10, 5, 10, 0]
+    assert stream.queries == [DELETE_RELATIONSHIPS_BATCH_QUERY] * 3 + [DELETE_NODES_BATCH_QUERY] * 2
+
+
+def test_delete_database_neo4j_async_partitions():
+    # Arrange
+    stream = FakeDeleteStream(95, 40)
+    progress = []
+    # Act
+    asyncio.run(delete_database_neo4j_async(stream, batch_size=10, concurrency=3, progress=progress.append))
+    # Assert
+    assert sum(progress) == 135
+    assert stream.remaining == {DELETE_RELATIONSHIPS_BATCH_QUERY: 0, DELETE_NODES_BATCH_QUERY: 0}
+    assert stream.queries.index(DELETE_NODES_BATCH_QUERY) > len(stream.queries) - \
+           stream.queries[::-1].index(DELETE_RELATIONSHIPS_BATCH_QUERY) - 1
+
+
+class FakeSchemaStream:
+    def __init__(self, code: str):
+        self.code = code
+        self.queries = []
+
+    async def write_async(self, query, parameters=None):
+        self.queries.append(query)
+        error = ClientError("schema rule exists")
+        error.code = self.code
+        raise error
+
+
+def test_create_node_id_constraints_keeps_existing():
+    # Arrange
+    database = Database(Graph([Node("TypeA", given_id="1"), Node("TypeB", given_id="2")], []), "test")
+    stream = FakeSchemaStream("Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists")
+    # Act
+    asyncio.run(create_node_id_constraints_async(database, stream))
+    # Assert
+    assert len(stream.queries) == 2
+    with pytest.raises(ClientError):
+        failing_stream = FakeSchemaStream("Neo.ClientError.Statement.SyntaxError")
+        asyncio.run(create_node_id_constraints_async(database, failing_stream))
@@ -0,0 +1,77 @@
+import io
+import random
+from copy import deepcopy
+
+import pytest
+
+from GraphModeler.DbTranformations.DbPerturber import perturb_graph
+from GraphModeler.DbTranformations.PerturbationJournal import apply_journal, journal_diff, journal_query, \
+    read_journal, write_journal, relationship_entry, DELETE_RELATIONSHIP, CREATE_RELATIONSHIP
+from GraphModeler.Diff import diff_databases
+from GraphModeler.Diff.GraphDiffer import relationship_key
+from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models.Database import Database
+from GraphModeler.Models.Graph import Graph
+
+
+@pytest.fixture()
+def test_database() -> Database:
+    nodes = [Node("Person", given_id=str(index)) for index in range(30)]
+    relationships = [Relationship(nodes[index], "Knows", nodes[(index * 7 + 1) % 30]) for index in range(30)]
+    return Database(Graph(nodes, relationships), "test")
+
+
+@pytest.fixture()
+def journal_entries(test_database):
+    random.seed(3)
+    journal_file = io.StringIO()
+    perturbed = perturb_graph(test_database, 0.7, 6, write_journal(journal_file))
+    journal_file.seek(0)
+    return perturbed, list(read_journal(journal_file))
+
+
+def test_journal_diff_matches_differ(test_database, journal_entries):
+    # Arrange
+    perturbed, entries = journal_entries
+    # Act
+    result = journal_diff(entries)
+    # Assert
+    diff = diff_databases(test_database, perturbed)
+    assert sorted(node.node_id for node in result.removed_nodes) == \
+           sorted(node.node_id for node in diff.removed_nodes)
+    assert sorted(map(relationship_key, result.added_relationships)) == \
+           sorted(map(relationship_key, diff.added_relationships))
+    assert sorted(map(relationship_key, result.removed_relationships)) == \
+           sorted(map(relationship_key, diff.removed_relationships))
+
+
+def test_apply_journal(test_database, journal_entries):
+    # Arrange
+    perturbed, entries = journal_entries
+    database = deepcopy(test_database)
+    # Act
+    apply_journal(database, entries)
+    # Assert
+    assert diff_databases(database, perturbed).is_empty()
+
+
+def test_journal_query_delete_relationship():
+    # Arrange
+    rel = Relationship(Node("TypeA", given_id="1"), "Knows", Node("TypeB", given_id="2"))
+    # Act
+    query, parameters = journal_query(relationship_entry(DELETE_RELATIONSHIP, rel))
+    # Assert
+    assert query == "MATCH (a:TypeA {node_id: $a_id})-[r:Knows]->(b:TypeB {node_id: $b_id}) " \
+                    "WHERE properties(r) = $properties WITH r LIMIT 1 DELETE r"
+    assert parameters == {"a_id": "1", "b_id": "2", "properties": {}}
+
+
+def test_journal_query_create_relationship():
+    # Arrange
+    rel = Relationship(Node("TypeA", given_id="1"), "Knows", Node("TypeB", given_id="2"), {"weight": 1})
+    # Act
+    query, parameters = journal_query(relationship_entry(CREATE_RELATIONSHIP, rel))
+    # Assert
+    assert query == "MATCH (nodeA:TypeA {node_id: $nodeA_id}), (nodeB:TypeB {node_id: $nodeB_id}) " \
+                    "CREATE (nodeA)-[r:Knows]->(nodeB) SET r = $properties"
+    assert parameters == {"nodeA_id": "1", "nodeB_id": "2", "properties": {"weight": 1}}
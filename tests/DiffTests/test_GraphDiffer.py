@@ -0,0 +1,50 @@
+import pytest
+
+from GraphModeler.Diff import diff_graphs
+from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models.Graph import Graph
+
+
+@pytest.fixture
+def source_graph() -> Graph:
+    nodes = [Node("TypeA", {"name": "a"}, "1"), Node("TypeA", {"name": "b"}, "2"), Node("TypeB", given_id="3")]
+    relationships = [Relationship(nodes[0], "Rel", nodes[1]), Relationship(nodes[1], "Rel", nodes[2])]
+    return Graph(nodes, relationships)
+
+
+def test_diff_identical_graphs(source_graph):
+    # Arrange
+    target_graph = Graph([Node("TypeA", {"name": "a"}, "1"), Node("TypeA", {"name": "b"}, "2"),
+                          Node("TypeB", given_id="3")])
+    target_graph.relationships = [Relationship(target_graph.nodes[0], "Rel", target_graph.nodes[1]),
+                                  Relationship(target_graph.nodes[1], "Rel", target_graph.nodes[2])]
+    # Act
+    result = diff_graphs(source_graph, target_graph)
+    # Assert
+    assert result.is_empty()
+
+
+def test_diff_nodes(source_graph):
+    # Arrange
+    target_graph = Graph([Node("TypeA", {"name": "changed"}, "1"), Node("TypeA", {"name": "b"}, "2"),
+                          Node("TypeC", given_id="4")])
+    # Act
+    result = diff_graphs(source_graph, target_graph)
+    # Assert
+    assert [node.node_id for node in result.added_nodes] == ["4"]
+    assert [node.node_id for node in result.removed_nodes] == ["3"]
+    assert [(source.node_id, target["name"]) for source, target in result.changed_nodes] == [("1", "changed")]
+
+
+def test_diff_relationships(source_graph):
+    # Arrange
+    nodes = source_graph.nodes
+    target_graph = Graph(nodes, [Relationship(nodes[0], "Rel", nodes[1], {"prop": "value"}),
+                                 Relationship(nodes[2], "Rel", nodes[0]),
+                                 Relationship(nodes[2], "Rel", nodes[0])])
+    # Act
+    result = diff_graphs(source_graph, target_graph)
+    # Assert
+    assert len(result.changed_relationships) == 1
+    assert result.removed_relationships == [source_graph.relationships[1]]
+    assert result.added_relationships == target_graph.relationships[1:]
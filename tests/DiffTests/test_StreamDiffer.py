@@ -0,0 +1,64 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from GraphModeler.DbTranformations.JsonStreamLoader import iter_database_json
+from GraphModeler.Diff import diff_database_files
+from GraphModeler.Diff.StreamDiffer import partition_database_file
+
+SOURCE = {"name": "Source", "graph": {
+    "nodes": [{"node_types": ["TypeA"], "properties": {"name": "a", "node_id": "1"}},
+              {"node_types": ["TypeA"], "properties": {"name": "b", "node_id": "2"}},
+              {"node_types": ["TypeB"], "properties": {"node_id": "3"}}],
+    "relationships": [{"node_a": "1", "relationship_type": "Rel", "node_b": "2", "properties": {}},
+                      {"node_a": "2", "relationship_type": "Rel", "node_b": "3", "properties": {}}]}}
+TARGET = {"name": "Target", "graph": {
+    "nodes": [{"node_types": ["TypeA"], "properties": {"name": "changed", "node_id": "1"}},
+              {"node_types": ["TypeA"], "properties": {"name": "b", "node_id": "2"}},
+              {"node_types": ["TypeC"], "properties": {"node_id": "4"}}],
+    "relationships": [{"node_a": "1", "relationship_type": "Rel", "node_b": "2", "properties": {}},
+                      {"node_a": "4", "relationship_type": "Rel", "node_b": "1", "properties": {}}]}}
+
+
+@pytest.fixture
+def database_files(tmp_path):
+    source_path, target_path = tmp_path / "source.json", tmp_path / "target.json"
+    source_path.write_text(json.dumps(SOURCE))
+    target_path.write_text(json.dumps(TARGET))
+    return str(source_path), str(target_path)
+
+
+def test_iter_database_json_small_chunks():
+    # Arrange
+    expected = [("name", "Source")] + [("nodes", node) for node in SOURCE["graph"]["nodes"]] + \
+               [("relationships", rel) for rel in SOURCE["graph"]["relationships"]]
+    # Act
+    result = list(iter_database_json(io.StringIO(json.dumps(SOURCE, indent=2)), chunk_size=7))
+    # Assert
+    assert result == expected
+
+
+@pytest.mark.parametrize("memory_budget", [1 << 30, 64])
+def test_diff_database_files(database_files, memory_budget):
+    # Arrange
+    expected = {("node", "added", None, "4"), ("node", "removed", "3", None), ("node", "changed", "1", "1"),
+                ("relationship", "added", None, "4"), ("relationship", "removed", "2", None)}
+    # Act
+    result = diff_database_files(*database_files, memory_budget=memory_budget)
+    # Assert
+    assert {(entry.item_type, entry.change,
+             entry.source and (entry.source.get("node_a") or entry.source["properties"]["node_id"]),
+             entry.target and (entry.target.get("node_a") or entry.target["properties"]["node_id"]))
+            for entry in result} == expected
+
+
+def test_partition_database_file_in_passes(database_files, tmp_path):
+    # Arrange
+    source_path, _ = database_files
+    expected = [Path(part).read_text() for part in partition_database_file(source_path, str(tmp_path / "single"), 5)]
+    # Act
+    result = partition_database_file(source_path, str(tmp_path / "passes"), 5, open_limit=2)
+    # Assert
+    assert [Path(part).read_text() for part in result] == expected
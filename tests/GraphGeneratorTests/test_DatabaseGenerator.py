@@ -0,0 +1,84 @@
+import io
+import json
+
+from DatabaseGenerator.DatabaseGenerator import create_graph_map, iter_generated_relationships, iter_generated_nodes, \
+    iter_generated_relationship_rows
+from GraphModeler import export_database_json
+from GraphModeler.DbTranformations.DbLoader import load_database_binary
+from GraphModeler.DbTranformations.DbSaver import write_database_json, write_indexed_database_binary
+
+NAMES = [f"name{index}" for index in range(50)]
+
+
+def test_create_graph_map_seeded():
+    # Arrange
+    first = create_graph_map(NAMES, 5, seed=7)
+    # Act
+    second = create_graph_map(NAMES, 5, seed=7)
+    # Assert
+    assert export_database_json(first) == export_database_json(second)
+    assert export_database_json(first) != export_database_json(create_graph_map(NAMES, 5, seed=8))
+
+
+def test_create_graph_map_workers():
+    # Arrange
+    single = create_graph_map(NAMES, 5, seed=7, chunk_size=8)
+    # Act
+    parallel = create_graph_map(NAMES, 5, seed=7, workers=2, chunk_size=8)
+    # Assert
+    assert export_database_json(single) == export_database_json(parallel)
+    assert [node["properties"]["name"] for node in export_database_json(parallel)["graph"]["nodes"]] == NAMES
+
+
+def test_create_graph_map_node_count():
+    # Arrange
+    names = ["a", "b"]
+    # Act
+    database = create_graph_map(names, 2, seed=1, node_count=5)
+    # Assert
+    assert [node["name"] for node in database.graph.nodes] == ["a", "b", "a_1", "b_1", "a_2"]
+
+
+def test_barabasi_albert_attaches_to_earlier_nodes():
+    # Arrange
+    node_count = 200
+    # Act
+    database = create_graph_map(NAMES, 4, seed=2, node_count=node_count, degree_model="barabasi-albert")
+    # Assert
+    indexes = {node.node_id: index for index, node in enumerate(database.graph.nodes)}
+    assert all(indexes[rel.node_b.node_id] < indexes[rel.node_a.node_id] for rel in database.graph.relationships)
+    assert len(database.graph.relationships) == 2 * (node_count - 1) - 1
+
+
+def test_iter_generated_relationships_matches_graph():
+    # Arrange
+    database = create_graph_map(NAMES, 5, seed=7, chunk_size=8, degree_model="power-law")
+    # Act
+    relationships = list(iter_generated_relationships(len(NAMES), 5, 7, "power-law", chunk_size=8))
+    # Assert
+    assert [(rel.node_a.node_id, rel.node_b.node_id) for rel in relationships] == \
+           [(rel.node_a.node_id, rel.node_b.node_id) for rel in database.graph.relationships]
+
+
+def test_streamed_generation_matches_graph():
+    # Arrange
+    database = create_graph_map(NAMES, 5, seed=7)
+    output = io.StringIO()
+    # Act
+    write_database_json(output, database.name, iter_generated_nodes(NAMES, len(NAMES), 7),
+                        iter_generated_relationships(len(NAMES), 5, 7))
+    # Assert
+    assert json.loads(output.getvalue()) == export_database_json(database)
+
+
+def test_streamed_binary_generation_matches_graph(tmp_path):
+    # Arrange
+    database = create_graph_map(NAMES, 5, seed=7)
+    path = tmp_path / "graph.bin"
+    # Act
+    with open(path, "wb") as output:
+        write_indexed_database_binary(output, database.name, iter_generated_nodes(NAMES, len(NAMES), 7),
+                                      iter_generated_relationship_rows(len(NAMES), 5, 7))
+    result = load_database_binary(path)
+    # Assert
+    assert export_database_json(result) == export_database_json(database)
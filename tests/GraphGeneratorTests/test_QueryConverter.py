@@ -47,3 +47,22 @@ def test_multi_label_node():
     result = node_query(test_node)
     # Assert
     assert result == expected
+
+
+def test_node_query_parameterized():
+    # Arrange
+    expected = ("(n:TestType {prop1: $n_0, node_id: $n_1})", {"n_0": "it's", "n_1": "1"})
+    test_node = Node("TestType", {"prop1": "it's"}, "1")
+    # Act
+    result = node_query(test_node, parameterized=True)
+    # Assert
+    assert result == expected
+
+
+def test_relationship_query_parameterized(test_relationship):
+    # Arrange
+    expected = ("(nodeA)-[r:Test {rel_prop: $r_0}]-(nodeB)", {"r_0": "value1"})
+    # Act
+    result = relationship_query(test_relationship, parameterized=True)
+    # Assert
+    assert result == expected
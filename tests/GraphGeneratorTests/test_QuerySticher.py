@@ -2,7 +2,9 @@ import pytest
 
 from GraphModeler.Models import Node, Relationship
 from GraphModeler.DbTranformations.QuerySticher import create_node_query, delete_node_query, create_relationship_query, \
-    delete_relationship_query
+    delete_relationship_query, create_nodes_batch_query, create_relationships_batch_query, \
+    create_node_id_constraint_query, update_nodes_batch_query, delete_relationships_batch_query, \
+    add_relationships_batch_query
 
 
 @pytest.fixture()
@@ -37,8 +39,8 @@ def test_delete_node_query_sanity(test_node):
 
 def test_create_relationship_query_sanity(test_relationship):
     # Arrange
-    expected = "MATCH (nodeA:TestTypeA {prop1: 'value1', node_id: '1'}), " \
-               "(nodeB:TestTypeB {prop2: 'value2', node_id: '2'}) " \
+    expected = "MATCH (nodeA:TestTypeA {node_id: '1'}), " \
+               "(nodeB:TestTypeB {node_id: '2'}) " \
                "MERGE (nodeA)-[r:Knows {rel_prop: 'value1'}]-(nodeB)"
     # Act
     result = create_relationship_query(test_relationship)
@@ -48,10 +50,82 @@ def test_create_relationship_query_sanity(test_relationship):
 
 def test_delete_relationship_query_sanity(test_relationship):
     # Arrange
-    expected = "MATCH ((a:TestTypeA {prop1: 'value1', node_id: '1'}))" \
+    expected = "MATCH (a:TestTypeA {node_id: '1'})" \
                "-[r:Knows {rel_prop: 'value1'}]-" \
-               "((b:TestTypeB {prop2: 'value2', node_id: '2'})) DELETE r"
+               "(b:TestTypeB {node_id: '2'}) DELETE r"
     # Act
     result = delete_relationship_query(test_relationship)
     # Assert
     assert result == expected
+
+
+def test_create_nodes_batch_query_sanity():
+    # Arrange
+    expected = "UNWIND $rows AS row MERGE (n:TestTypeA:TestTypeB {prop1: row.prop1, node_id: row.node_id})"
+    # Act
+    result = create_nodes_batch_query(["TestTypeA", "TestTypeB"], ["prop1", "node_id"])
+    # Assert
+    assert result == expected
+
+
+def test_create_relationships_batch_query_sanity():
+    # Arrange
+    expected = "UNWIND $rows AS row MATCH (nodeA:TestTypeA {node_id: row.node_a}), " \
+               "(nodeB:TestTypeB {node_id: row.node_b}) " \
+               "MERGE (nodeA)-[r:Knows {rel_prop: row.properties.rel_prop}]-(nodeB)"
+    # Act
+    result = create_relationships_batch_query(["TestTypeA"], "Knows", ["TestTypeB"], ["rel_prop"])
+    # Assert
+    assert result == expected
+
+
+def test_create_relationship_query_parameterized(test_relationship):
+    # Arrange
+    expected = ("MATCH (nodeA:TestTypeA {node_id: $nodeA_id}), (nodeB:TestTypeB {node_id: $nodeB_id}) "
+                "MERGE (nodeA)-[r:Knows {rel_prop: $r_0}]-(nodeB)",
+                {"nodeA_id": "1", "nodeB_id": "2", "r_0": "value1"})
+    # Act
+    result = create_relationship_query(test_relationship, parameterized=True)
+    # Assert
+    assert result == expected
+
+
+def test_create_node_id_constraint_query_sanity():
+    # Arrange
+    expected = "CREATE CONSTRAINT ON (n:TestType) ASSERT n.node_id IS UNIQUE"
+    # Act
+    result = create_node_id_constraint_query("TestType")
+    # Assert
+    assert result == expected
+
+
+def test_update_nodes_batch_query_sanity():
+    # Arrange
+    expected = "UNWIND $rows AS row MATCH (n:TestTypeA:TestTypeB {node_id: row.node_id}) " \
+               "REMOVE n:TestTypeA SET n:TestTypeC SET n = row.properties"
+    # Act
+    result = update_nodes_batch_query(["TestTypeA", "TestTypeB"], ["TestTypeB", "TestTypeC"])
+    # Assert
+    assert result == expected
+
+
+def test_delete_relationships_batch_query_sanity():
+    # Arrange
+    expected = "UNWIND $rows AS row CALL { WITH row MATCH (nodeA:TestTypeA {node_id: row.node_a})" \
+               "-[r:Knows]->(nodeB:TestTypeB {node_id: row.node_b}) WHERE properties(r) = row.properties " \
+               "RETURN collect(r)[..row.count] AS matched } UNWIND matched AS r DELETE r"
+    # Act
+    result = delete_relationships_batch_query(["TestTypeA"], "Knows", ["TestTypeB"])
+    # Assert
+    assert result == expected
+
+
+def test_add_relationships_batch_query_directed():
+    # Arrange
+    expected = "UNWIND $rows AS row MATCH (nodeA:TestTypeA {node_id: row.node_a}), " \
+               "(nodeB:TestTypeB {node_id: row.node_b}) " \
+               "CREATE (nodeA)-[r:Knows {rel_prop: row.properties.rel_prop}]->(nodeB)"
+    # Act
+    result = add_relationships_batch_query(["TestTypeA"], "Knows", ["TestTypeB"], ["rel_prop"])
+    # Assert
+    assert result == expected
@@ -0,0 +1,68 @@
+import pytest
+
+from GraphModeler.Diff import diff_columnar_graphs
+from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models.ColumnarGraph import ColumnarGraph
+from GraphModeler.Models.Graph import Graph
+
+
+@pytest.fixture
+def test_graph() -> Graph:
+    nodes = [Node("TypeA", {"name": "a"}, "1"), Node(["TypeA", "TypeB"], given_id="2"), Node("TypeC", given_id="3")]
+    return Graph(nodes, [Relationship(nodes[0], "Rel", nodes[1], {"since": 2000}),
+                         Relationship(nodes[0], "Rel", nodes[2]),
+                         Relationship(nodes[2], "Other", nodes[1])])
+
+
+def test_columnar_round_trip(test_graph):
+    # Arrange
+    columnar = ColumnarGraph.from_graph(test_graph)
+    # Act
+    result = columnar.to_graph()
+    # Assert
+    assert result == test_graph
+    assert [dict(rel.properties) for rel in result.relationships] == [{"since": 2000}, {}, {}]
+
+
+def test_columnar_degrees(test_graph):
+    # Arrange
+    columnar = ColumnarGraph.from_graph(test_graph)
+    # Act
+    out_degrees, in_degrees, degrees = columnar.out_degrees(), columnar.in_degrees(), columnar.degrees()
+    # Assert
+    assert list(out_degrees) == [2, 0, 1]
+    assert list(in_degrees) == [0, 2, 1]
+    assert list(degrees) == [2, 2, 2]
+
+
+def test_diff_columnar_graphs(test_graph):
+    # Arrange
+    source = ColumnarGraph.from_graph(test_graph)
+    target_graph = source.to_graph()
+    target_graph.nodes[0]["name"] = "changed"
+    target_graph.relationships[1]["since"] = 2020
+    target = ColumnarGraph.from_graph(Graph(target_graph.nodes, target_graph.relationships[:2]))
+    # Act
+    result = diff_columnar_graphs(source, target)
+    # Assert
+    assert [target_node["name"] for _, target_node in result.changed_nodes] == ["changed"]
+    assert [target_rel["since"] for _, target_rel in result.changed_relationships] == [2020]
+    assert [rel.relationship_type for rel in result.removed_relationships] == ["Other"]
+    assert not result.added_nodes and not result.removed_nodes and not result.added_relationships
+
+
+def test_diff_columnar_graphs_parallel_relationships():
+    # Arrange
+    nodes = [Node("TypeA", given_id="1"), Node("TypeA", given_id="2")]
+    source = ColumnarGraph.from_graph(Graph(nodes, [Relationship(nodes[0], "Rel", nodes[1], {"copy": 1}),
+                                                    Relationship(nodes[0], "Rel", nodes[1], {"copy": 2})]))
+    target = ColumnarGraph.from_graph(Graph(nodes, [Relationship(nodes[0], "Rel", nodes[1], {"copy": 1}),
+                                                    Relationship(nodes[0], "Rel", nodes[1], {"copy": 3}),
+                                                    Relationship(nodes[0], "Rel", nodes[1])]))
+    # Act
+    result = diff_columnar_graphs(source, target)
+    # Assert
+    assert [(source_rel["copy"], target_rel["copy"]) for source_rel, target_rel in result.changed_relationships] == \
+           [(2, 3)]
+    assert [dict(rel.properties) for rel in result.added_relationships] == [{}]
+    assert not result.removed_relationships and not result.changed_nodes
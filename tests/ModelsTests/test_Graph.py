@@ -0,0 +1,56 @@
+import pytest
+
+from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models.Graph import Graph
+
+
+@pytest.fixture(params=[True, False], ids=["indexed", "scan"])
+def test_graph(request) -> Graph:
+    nodes = [Node("TypeA", given_id=str(index)) for index in range(4)]
+    graph = Graph(nodes, [Relationship(nodes[0], "Rel", nodes[1]), Relationship(nodes[1], "Rel", nodes[2]),
+                          Relationship(nodes[2], "Rel", nodes[0]), Relationship(nodes[3], "Rel", nodes[3])])
+    if request.param:
+        graph.index_adjacency()
+    return graph
+
+
+def test_graph_neighbors(test_graph):
+    # Arrange
+    node = test_graph.nodes[0]
+    # Act
+    result = test_graph.neighbors(node)
+    # Assert
+    assert [neighbor.node_id for neighbor in result] == ["1", "2"]
+    assert test_graph.degree(node) == 2
+
+
+def test_graph_remove_node(test_graph):
+    # Arrange
+    node = test_graph.nodes[1]
+    # Act
+    detached = test_graph.remove_node(node)
+    # Assert
+    assert len(detached) == 2
+    assert sorted(n.node_id for n in test_graph.nodes) == ["0", "2", "3"]
+    assert [(rel.node_a.node_id, rel.node_b.node_id) for rel in test_graph.relationships] in \
+           ([("2", "0"), ("3", "3")], [("3", "3"), ("2", "0")])
+    assert test_graph.degree(test_graph.nodes[0]) == 1
+
+
+def test_graph_remove_self_loop_node(test_graph):
+    # Arrange
+    node = test_graph.nodes[3]
+    # Act
+    detached = test_graph.remove_node(node)
+    # Assert
+    assert len(detached) == 1
+    assert len(test_graph.relationships) == 3
+
+
+def test_graph_add_relationship(test_graph):
+    # Arrange
+    nodes = test_graph.nodes
+    # Act
+    test_graph.add_relationship(Relationship(nodes[3], "Rel", nodes[0]))
+    # Assert
+    assert [rel.node_a.node_id for rel in test_graph.incoming(nodes[0])] == ["2", "3"]
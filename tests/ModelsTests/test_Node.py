@@ -0,0 +1,76 @@
+from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models import Properties
+
+
+def test_node_properties_view():
+    # Arrange
+    node = Node("TestType", {"prop1": "value1"}, "1")
+    # Act
+    node.properties["prop2"] = "value2"
+    node["prop1"] = "changed"
+    # Assert
+    assert node.properties == {"prop1": "changed", "node_id": "1", "prop2": "value2"}
+    assert node.node_id == "1"
+
+
+def test_node_shares_keys_and_labels():
+    # Arrange
+    node_a = Node(["TypeA"], {"name": "a"})
+    # Act
+    node_b = Node("TypeA", {"name": "b"})
+    # Assert
+    assert node_a.labels is node_b.labels
+    assert node_a.node_types == ["TypeA"]
+    assert node_a._keys is node_b._keys
+
+
+def test_interning_stops_at_the_limit(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(Properties, "MAX_INTERNED", len(Properties._keys_table))
+    # Act
+    node_a = Node("TypeA", {"unique_key_a": 1, "unique_key_b": 2})
+    node_b = Node("TypeA", {"unique_key_a": 3, "unique_key_b": 4})
+    # Assert
+    assert node_a._keys == node_b._keys and node_a._keys is not node_b._keys
+    assert node_a.properties == {"unique_key_a": 1, "unique_key_b": 2, "node_id": node_a.node_id}
+
+
+def test_node_id_from_properties():
+    # Arrange
+    expected = "1"
+    # Act
+    node = Node("TestType", {"node_id": "1"}, "2")
+    # Assert
+    assert node.node_id == expected
+
+
+def test_relationship_default_properties():
+    # Arrange
+    relationship = Relationship(Node("TypeA", given_id="1"), "Rel", Node("TypeB", given_id="2"))
+    # Act
+    relationship["prop"] = "value"
+    # Assert
+    assert dict(relationship.properties) == {"prop": "value"}
+
+
+def test_node_hash_follows_identity_changes():
+    # Arrange
+    node = Node("TypeA", given_id="1")
+    original_hash = hash(node)
+    # Act
+    node.node_id = "2"
+    # Assert
+    assert hash(node) != original_hash
+    assert hash(node) == hash(Node("TypeA", given_id="2"))
+
+
+def test_relationship_equality_follows_node_changes():
+    # Arrange
+    node_a = Node("TypeA", given_id="1")
+    relationship = Relationship(node_a, "Rel", Node("TypeB", given_id="2"))
+    # Act
+    node_a.node_id = "9"
+    # Assert
+    same = Relationship(Node("TypeA", given_id="9"), "Rel", Node("TypeB", given_id="2"))
+    assert relationship == same and same == relationship
+    assert same in {relationship}
@@ -0,0 +1,75 @@
+import pytest
+
+from GraphModeler.Models import Node, Relationship
+from GraphModeler.Models.Graph import Graph
+from GraphModeler.Models.OverlayGraph import OverlayGraph
+
+
+@pytest.fixture()
+def base_graph() -> Graph:
+    nodes = [Node("TypeA", given_id=str(index)) for index in range(3)]
+    return Graph(nodes, [Relationship(nodes[0], "Rel", nodes[1]), Relationship(nodes[1], "Rel", nodes[2])])
+
+
+def test_overlay_keeps_base(base_graph):
+    # Arrange
+    overlay = OverlayGraph(base_graph)
+    nodes = list(base_graph.nodes)
+    # Act
+    overlay.add_relationship(Relationship(nodes[2], "Rel", nodes[0]))
+    detached = overlay.remove_node(nodes[1])
+    # Assert
+    assert len(detached) == 2
+    assert len(base_graph.nodes) == 3 and len(base_graph.relationships) == 2
+    assert [node.node_id for node in overlay.nodes] == ["0", "2"]
+    assert [(rel.node_a.node_id, rel.node_b.node_id) for rel in overlay.relationships] == [("2", "0")]
+    assert overlay.removed_nodes == [nodes[1]]
+
+
+def test_overlays_share_the_base_index(base_graph):
+    # Arrange
+    first = OverlayGraph(base_graph)
+    nodes = list(base_graph.nodes)
+    # Act
+    second = OverlayGraph(base_graph)
+    # Assert
+    assert first.base is second.base is base_graph
+    assert base_graph.indexed and list(base_graph.nodes) == nodes
+
+
+def test_overlay_remove_added_relationship(base_graph):
+    # Arrange
+    overlay = OverlayGraph(base_graph)
+    rel = Relationship(base_graph.nodes[0], "Rel", base_graph.nodes[2])
+    overlay.add_relationship(rel)
+    # Act
+    overlay.remove_relationship(rel)
+    # Assert
+    assert overlay.materialize() == base_graph
+    assert overlay.degree(base_graph.nodes[0]) == 1
+
+
+def test_overlay_random_node_skips_removed(base_graph):
+    # Arrange
+    overlay = OverlayGraph(base_graph)
+    overlay.remove_node(base_graph.nodes[0])
+    overlay.remove_node(base_graph.nodes[1])
+    # Act
+    result = {overlay.random_node().node_id for _ in range(20)}
+    # Assert
+    assert result == {"2"}
+
+
+def test_overlay_remove_added_parallel_relationship(base_graph):
+    # Arrange
+    overlay = OverlayGraph(base_graph)
+    nodes = base_graph.nodes
+    first = Relationship(nodes[0], "Rel", nodes[2], {"copy": 1})
+    second = Relationship(nodes[0], "Rel", nodes[2], {"copy": 2})
+    overlay.add_relationship(first)
+    overlay.add_relationship(second)
+    # Act
+    overlay.remove_relationship(second)
+    detached = overlay.remove_node(nodes[0])
+    # Assert
+    assert [rel.properties["copy"] for rel in detached if rel.properties] == [1]